@@ -6,7 +6,6 @@ import hashlib
 import json
 import os
 import sys
-import types
 import urllib.request
 from datetime import datetime, timezone
 from importlib import util as importlib_util
@@ -27,8 +26,9 @@ def _sha256(p: Path) -> str:
 
 
 def _load_converter(repo_root: Path):
-    mod_path = repo_root / "scripts" / "pciids_text_to_bin.py"
-    spec = importlib_util.spec_from_file_location("pciids_text_to_bin", str(mod_path))
+    # stdlib-only module, loaded by path: the package isn't importable here
+    mod_path = repo_root / "pciid" / "convert.py"
+    spec = importlib_util.spec_from_file_location("pciid_convert", str(mod_path))
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Cannot import converter at {mod_path}")
     mod = importlib_util.module_from_spec(spec)
@@ -44,7 +44,7 @@ class CustomBuildHook(BuildHookInterface):
       - write pciid/data/pci.ids from:
           1) /usr/share/hwdata/pci.ids, or
           2) download pci.ids.gz and decompress
-      - run scripts/pciids_text_to_bin.py -> pciid/data/pci.ids.bin
+      - run pciid/convert.py -> pciid/data/pci.ids.bin
       - write pciid/data/manifest.json
     Never runs at user install time; only while building artifacts.
     """
@@ -76,7 +76,7 @@ class CustomBuildHook(BuildHookInterface):
 
         # 2) convert text -> bin in the *source tree*
         converter = _load_converter(root)
-        args = types.SimpleNamespace(
+        args = converter.ProgramArgs(
             input_path=str(text_out), output_path=str(bin_out), no_compress=False
         )
         converter.build(args)
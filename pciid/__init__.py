@@ -3,9 +3,11 @@ pciid — PCI ID database readers (text/binary) + sysfs enumeration/topology hel
 
 Public API:
     - Protocol & factory:
-        PciDb, open_db
+        PciDb, DeviceNames, open_db
     - Concrete DBs (if callers want to force a backend):
-        PciDbText, PciDbBinary
+        PciDbText, PciDbTextLazy, PciDbBinary
+    - Memoizing wrapper for repetitive workloads:
+        CachedDb
     - Sysfs enumeration (Linux):
         SysfsEnumerator, PciAddress, PciDevice
 """
@@ -26,18 +28,23 @@ except (PackageNotFoundError, Exception):  # pragma: no cover
 
 # Public API re-exports
 from .api import PciDb, open_db
+from .types import DeviceNames
+from .cached import CachedDb
 from .backends.bindb import PciDbBinary
-from .backends.textdb import PciDbText
+from .backends.textdb import PciDbText, PciDbTextLazy
 from .sysfs import SysfsEnumerator, PciAddress, PciDevice
 
 __all__ = [
     "__version__",
     # DB protocol/factory
     "PciDb",
+    "DeviceNames",
     "open_db",
     # Concrete DBs
     "PciDbText",
+    "PciDbTextLazy",
     "PciDbBinary",
+    "CachedDb",
     # Sysfs
     "SysfsEnumerator",
     "PciAddress",
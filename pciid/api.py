@@ -1,7 +1,7 @@
 from __future__ import annotations
 from typing import Optional
 from .backends.bindb import PciDbBinary
-from .backends.textdb import PciDbText
+from .backends.textdb import PciDbText, PciDbTextLazy
 from .types import PciDb
 
 
@@ -11,4 +11,4 @@ def open_db(path: Optional[str] = None) -> PciDb:
     return discover_db(path)
 
 
-__all__ = ["PciDb", "PciDbBinary", "PciDbText", "open_db"]
+__all__ = ["PciDb", "PciDbBinary", "PciDbText", "PciDbTextLazy", "open_db"]
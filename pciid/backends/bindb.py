@@ -7,22 +7,263 @@
 # Licensed under the MIT license
 #
 
-import mmap, struct, zlib, bisect
-from typing import Dict, Optional, Tuple
+import mmap, os, struct, sys, threading, time, weakref, zlib, bisect
+from array import array
+from collections import OrderedDict
+from functools import cached_property
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..types import (
+    BatchKey,
+    ClassEntry,
+    ClassRecord,
+    DeviceNames,
+    SearchHit,
+    class_records,
+)
+from .. import search as _search
+from ..search import PackedSearchIndex, SearchHdr, SearchIndex
 
 MAGIC = 0x42494350
 HEADER_FMT = "<IHH" + "I" * 26
+# v2 adds a dense vendor slot table: 65536 u16 entries, row index + 1 (0 = absent)
+VENDOR_SLOTS = 0x10000
+VendorSlot = struct.Struct("<H")
 VendorRow = struct.Struct("<H I I I")
 DeviceRow = struct.Struct("<H I I I")
 SubsysRow = struct.Struct("<H H I")
 SubclassRow = struct.Struct("<H I I I")
 ProgIfRow = struct.Struct("<B I")
 
+# String block records: u16 kind (1 = full, 2 = delta), [u16 prefix_len,] u32 len, utf-8
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_DeltaHdr = struct.Struct("<HI")
+
+# Header flags
+FLAG_COLUMNAR = 0x0001  # row sections stored as struct-of-arrays (see _load_columns)
+FLAG_PLAIN_STRINGS = 0x0002  # strings are an offset table + raw UTF-8 arena, no blocks
+FLAG_ZDICT = 0x0004  # string blocks use the zlib preset dictionary in the zdict section
+KNOWN_FLAGS = FLAG_COLUMNAR | FLAG_PLAIN_STRINGS | FLAG_ZDICT
+
+# Columnar sections: u32 row count, then one little-endian column per field.
+# The count and every column start on a COLUMN_ALIGN boundary of the file.
+COLUMN_ALIGN = 8
+# Element codes (struct/array/memoryview) a column can have
+ColumnFormat = Literal["B", "H", "I"]
+Columns = Tuple[ColumnFormat, ...]
+VendorCols: Columns = ("H", "I", "I", "I")  # vendor_id, name_id, dev_start, dev_count
+DeviceCols: Columns = ("H", "I", "I", "I")  # device_id, name_id, sub_start, sub_count
+SubsysCols: Columns = ("H", "H", "I")  # subvendor_id, subdevice_id, name_id
+SubclassCols: Columns = ("H", "I", "I", "I")  # key=(base<<8|sub), name_id, start, count
+ProgIfCols: Columns = ("B", "I")  # prog_if, name_id
+
+# Columns are exposed as zero-copy casts when the host byte order matches the file.
+_NATIVE_LE = sys.byteorder == "little"
+
+# Subsystem Bloom filter section: u32 log2(bits) (<= 32), u32 probes (always 2),
+# then the bit array. The key (vendor<<48 | device<<32 | subvendor<<16 | subdevice)
+# is Fibonacci-hashed once; the top two log2(bits)-wide fields are the probes.
+# Kept this cheap on purpose: a miss through the columns costs only ~1.5 µs.
+BloomHdr = struct.Struct("<II")
+BLOOM_PROBES = 2
+_FIB64 = 0x9E3779B97F4A7C15
+_M64 = 0xFFFFFFFFFFFFFFFF
+
+
+# Strings per block in files whose directory predates the stored stride
+DEFAULT_BLOCK_STRIDE = 32
+
+# Decoded string blocks kept resident (~3 KiB each); PCIID_CACHE_BLOCKS overrides
+DEFAULT_CACHE_BLOCKS = 512
+# iter_*() resolve names this many rows at a time, in ID order
+ITER_CHUNK = 1024
+
+
+# PciDbBinary(access=...) -> madvise() advice for the whole mapping
+ACCESS_HINTS = {
+    "normal": "MADV_NORMAL",
+    "random": "MADV_RANDOM",
+    "sequential": "MADV_SEQUENTIAL",
+    "willneed": "MADV_WILLNEED",
+}
+
+# prefetch(sections=...) names -> header fields (each an _off/_len pair)
+SECTIONS = {
+    "vendors": ("vendors", "vendor_slot"),
+    "devices": ("devices",),
+    "subsystems": ("subsys", "subsys_bloom"),
+    "classes": ("class_base", "subclass", "prog_if"),
+    "strings": ("str_dir", "zdict", "str_blk"),
+}
+
 
 def _clamp(x: int, low: int, high: int) -> int:
     return max(low, min(x, high))
 
 
+def _align(n: int) -> int:
+    return (n + COLUMN_ALIGN - 1) & ~(COLUMN_ALIGN - 1)
+
+
+def _cache_blocks_from_env() -> int:
+    try:
+        return int(os.environ.get("PCIID_CACHE_BLOCKS", DEFAULT_CACHE_BLOCKS))
+    except ValueError:
+        return DEFAULT_CACHE_BLOCKS
+
+
+class BlockCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    blocks: int
+    max_blocks: int
+    bytes: int
+
+
+def _sizeof_block(strings: Tuple[str, ...]) -> int:
+    return sys.getsizeof(strings) + sum(sys.getsizeof(s) for s in strings)
+
+
+class BlockCache:
+    """
+    Bounded LRU of decoded string blocks (one tuple of str per block).
+    max_blocks <= 0 disables caching; `bytes` is the approximate heap footprint.
+
+    Thread-safe: every operation holds a private lock for a few dict operations.
+    Callers decode outside the lock, so two threads missing the same block may
+    both decode it; put() keeps the first and drops the duplicate.
+    """
+
+    def __init__(self, max_blocks: int) -> None:
+        self.max_blocks = max_blocks
+        self._data: OrderedDict[int, Tuple[str, ...]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.bytes = 0
+
+    def get(self, block_idx: int) -> Optional[Tuple[str, ...]]:
+        with self._lock:
+            strings = self._data.get(block_idx)
+            if strings is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(block_idx)
+            self.hits += 1
+            return strings
+
+    def put(self, block_idx: int, strings: Tuple[str, ...]) -> None:
+        if self.max_blocks <= 0:
+            return
+        size = _sizeof_block(strings)
+        with self._lock:
+            if block_idx in self._data:
+                return
+            self._data[block_idx] = strings
+            self.bytes += size
+            while len(self._data) > self.max_blocks:
+                _, old = self._data.popitem(last=False)
+                self.bytes -= _sizeof_block(old)
+                self.evictions += 1
+
+    def __contains__(self, block_idx: int) -> bool:
+        return block_idx in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.bytes = 0
+
+    def info(self) -> BlockCacheInfo:
+        with self._lock:
+            return BlockCacheInfo(
+                self.hits,
+                self.misses,
+                self.evictions,
+                len(self._data),
+                self.max_blocks,
+                self.bytes,
+            )
+
+
+class WarmProgress:
+    """
+    Live progress of PciDbBinary.warm(): `done` of `total` blocks decoded into
+    the cache so far, over `seconds` (final once `finished`).
+    """
+
+    def __init__(self, total: int) -> None:
+        self.total = total
+        self.done = 0
+        self._t0 = time.perf_counter()
+        self._t1: Optional[float] = None
+        self._finished = threading.Event()
+        self._cancelled = False
+
+    @property
+    def finished(self) -> bool:
+        return self._finished.is_set()
+
+    @property
+    def seconds(self) -> float:
+        return (self._t1 if self._t1 is not None else time.perf_counter()) - self._t0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until warming stops; False if `timeout` expired first."""
+        return self._finished.wait(timeout)
+
+    def cancel(self) -> None:
+        self._cancelled = True
+
+    def _finish(self) -> None:
+        self._t1 = time.perf_counter()
+        self._finished.set()
+
+    def __repr__(self) -> str:
+        state = "finished" if self.finished else "running"
+        return f"<WarmProgress {self.done}/{self.total} blocks, {self.seconds:.3f}s, {state}>"
+
+
+class _Lease:
+    """Held by every lookup in flight; the mapping is torn down once the last goes."""
+
+    __slots__ = ("__weakref__",)
+
+
+# Live handles, so a forked child can swap in fresh block caches
+_live_dbs: "weakref.WeakSet[PciDbBinary]" = weakref.WeakSet()
+
+
+def _reset_caches_after_fork() -> None:
+    # Replace rather than clear(): another parent thread may have been mid-update
+    for db in list(_live_dbs):
+        db._block_cache = BlockCache(db._block_cache.max_blocks)
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_caches_after_fork)
+
+
 class PciDbBinary:
     str_dir_off: int
     str_dir_len: int
@@ -40,43 +281,266 @@ class PciDbBinary:
     subclass_len: int
     prog_if_off: int
     prog_if_len: int
-    misc_off: int
-    misc_len: int
-    r1_off: int
-    r1_len: int
-    r2_off: int
-    r2_len: int
-    r3_off: int
-    r3_len: int
-    r4_off: int
-    r4_len: int
-
-    def __init__(self, path: str):
-        self.f = open(path, "rb")
-        self.mm = mmap.mmap(self.f.fileno(), 0, access=mmap.ACCESS_READ)
+    zdict_off: int
+    zdict_len: int
+    vendor_slot_off: int
+    vendor_slot_len: int
+    subsys_bloom_off: int
+    subsys_bloom_len: int
+    search_off: int
+    search_len: int
+    subvendor_off: int
+    subvendor_len: int
+
+    def __init__(
+        self, path: str, cache_blocks: Optional[int] = None, access: Optional[str] = None
+    ):
+        """
+        `access` is a kernel access-pattern hint for the mapping: "random"
+        (disable readahead; good for sparse lookups), "sequential" (full dumps),
+        "willneed" (start reading the whole file in now) or "normal".
+        """
+        if access is not None and access not in ACCESS_HINTS:
+            raise ValueError(f"unknown access hint {access!r}")
+        self.path: Optional[str] = path
+        self.access = access
+        self.f: Optional[BinaryIO] = open(path, "rb")
+        try:
+            self.mm: Union[mmap.mmap, memoryview] = mmap.mmap(
+                self.f.fileno(), 0, access=mmap.ACCESS_READ
+            )
+        except BaseException:
+            self.f.close()
+            raise
+        if access is not None:
+            self._madvise(ACCESS_HINTS[access], 0, len(self.mm))
+        self._open(cache_blocks)
+
+    @classmethod
+    def from_buffer(cls, buffer: Any, cache_blocks: Optional[int] = None) -> "PciDbBinary":
+        """
+        Open a database held in memory: bytes, bytearray, memoryview, mmap,
+        shared_memory.buf or any other contiguous buffer. Zero-copy; the buffer
+        must stay alive and unmodified until close().
+        """
+        self = cls.__new__(cls)
+        self.path = None
+        self.access = None
+        self.f = None
+        self.mm = memoryview(buffer).cast("B")
+        try:
+            self._open(cache_blocks)
+        except BaseException:
+            self.mm.release()
+            raise
+        return self
+
+    @classmethod
+    def from_bytes(cls, data: bytes, cache_blocks: Optional[int] = None) -> "PciDbBinary":
+        """Open a database from an in-memory copy of a pci.ids.bin file."""
+        return cls.from_buffer(bytes(data), cache_blocks)
+
+    def _open(self, cache_blocks: Optional[int]) -> None:
+        self._mv = memoryview(self.mm)
+        self._views: List[memoryview] = []
         self._parse_header()
+        self._columnar = bool(self.flags & FLAG_COLUMNAR)
+        self._plain_strings = bool(self.flags & FLAG_PLAIN_STRINGS)
         self._load_vendor_index()
         self._load_device_index()
         self._load_subsys_index()
         self._load_class_indexes()
-        # Strings
-        self.block_count = struct.unpack_from("<I", self.mm, self.str_dir_off)[0]
-        self.block_offsets = list(
-            struct.unpack_from(
-                "<" + "I" * self.block_count, self.mm, self.str_dir_off + 4
-            )
+        # Strings: u32 count, then block offsets and u32 stride (older files: no
+        # stride, always 32), or count + 1 arena offsets in plain mode.
+        count = struct.unpack_from("<I", self.mm, self.str_dir_off)[0]
+        self.block_stride = DEFAULT_BLOCK_STRIDE
+        if self._plain_strings:
+            self.block_count = 0
+            self.block_offsets = self._column(self.str_dir_off + 4, "I", 0)
+            self._string_offsets = self._column(self.str_dir_off + 4, "I", count + 1)
+        else:
+            self.block_count = count
+            self.block_offsets = self._column(self.str_dir_off + 4, "I", count)
+            if self.str_dir_len >= 8 + 4 * count:
+                stride_off = self.str_dir_off + 4 + 4 * count
+                self.block_stride = struct.unpack_from("<I", self.mm, stride_off)[0]
+            if self.block_stride == 0:
+                raise ValueError("bad string block stride")
+        self._raw_block_sig = struct.pack("<HH", self.block_stride & 0xFFFF, 1)
+        self._load_subsys_bloom()
+        self._load_search_section()
+        self._load_subvendor_section()
+        self._zdict: Optional[memoryview] = None
+        if self.flags & FLAG_ZDICT:
+            self._zdict = self._mv[self.zdict_off : self.zdict_off + self.zdict_len]
+            self._views.append(self._zdict)
+        if cache_blocks is None:
+            cache_blocks = _cache_blocks_from_env()
+        self._block_cache = BlockCache(cache_blocks)
+        self._class_tables: Optional[Tuple[Dict[int, ClassEntry], List[ClassEntry]]] = None
+        self._memory_search: Optional[SearchIndex] = None
+        self._lease: Optional[_Lease] = _Lease()
+        self._close_lock = threading.Lock()
+        _live_dbs.add(self)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Pickle by reference: the child re-mmaps the same file. Buffer-backed
+        # handles have no path, so they ship their bytes.
+        cache_blocks = self._block_cache.max_blocks
+        if self.path is not None:
+            return (type(self), (self.path, cache_blocks, self.access))
+        return (type(self).from_bytes, (bytes(self.mm), cache_blocks))
+
+    # ----- page cache hints -----
+    def _madvise(self, advice: str, start: int, length: int) -> bool:
+        """madvise() a byte range (widened to pages); False where unsupported."""
+        flag = getattr(mmap, advice, None)
+        if flag is None or not isinstance(self.mm, mmap.mmap):
+            return False
+        pad = start & (mmap.PAGESIZE - 1)
+        start -= pad
+        length = min(length + pad, len(self.mm) - start)
+        try:
+            self.mm.madvise(flag, start, length)
+        except (AttributeError, OSError):  # pragma: no cover - no madvise() here
+            return False
+        return True
+
+    def prefetch(self, sections: Optional[Iterable[str]] = None) -> int:
+        """
+        Ask the kernel to read sections in ahead of the first lookups, so they
+        don't stall on page faults. `sections` are names from SECTIONS; None
+        means the whole file. Without madvise() the pages are touched instead.
+        Returns the number of bytes requested.
+        """
+        lease = self._checked_lease()  # pins the mapping until the del below
+        if sections is None:
+            spans = [(0, len(self.mm))]
+        else:
+            spans = [(0, struct.calcsize(HEADER_FMT))]
+            for name in sections:
+                if name not in SECTIONS:
+                    raise ValueError(f"unknown section {name!r}")
+                for field in SECTIONS[name]:
+                    spans.append((getattr(self, field + "_off"), getattr(self, field + "_len")))
+        total = 0
+        for off, length in spans:
+            if length <= 0:
+                continue
+            total += length
+            if not self._madvise("MADV_WILLNEED", off, length) and isinstance(
+                self.mm, mmap.mmap
+            ):
+                sum(self._mv[off : off + length : mmap.PAGESIZE])  # pragma: no cover
+        del lease  # done with the mapping: close() may unmap it now
+        return total
+
+    # ----- warm-up -----
+    def _hot_block_indexes(self) -> List[int]:
+        # Profile-built files lead with their hot blocks, stored uncompressed
+        lead = 0
+        while lead < self.block_count and self._block_is_raw(lead):
+            lead += 1
+        if 0 < lead < self.block_count:
+            return list(range(lead))
+        # Otherwise: the blocks holding vendor names, which every device line needs
+        stride = self.block_stride
+        return sorted(
+            {self._vendor_row_at(i)[1] // stride for i in range(self._vendor_count)}
         )
-        self._block_cache: Dict[int, bytes] = {}
+
+    def _block_is_raw(self, block_idx: int) -> bool:
+        off = self.block_offsets[block_idx]
+        return self.mm[off : off + 4] == self._raw_block_sig
+
+    def warm(self, blocks: str = "all", background: bool = True) -> WarmProgress:
+        """
+        Decode string blocks into the block cache ahead of the lookups that need
+        them: "all" blocks, or just the "hot" ones (a --profile file's leading
+        hot blocks, else the vendor-name blocks). Stops at the cache capacity.
+
+        With background=True a daemon thread does the work and this returns at
+        once; lookups for blocks it hasn't reached yet decode them themselves.
+        Poll or wait() on the returned progress.
+        """
+        if blocks not in ("all", "hot"):
+            raise ValueError(f"unknown block set {blocks!r}")
+        lease = self._checked_lease()  # pins the mapping until the del below
+        if self._plain_strings:
+            todo: List[int] = []  # nothing to inflate
+        elif blocks == "hot":
+            todo = self._hot_block_indexes()
+        else:
+            todo = list(range(self.block_count))
+        todo = todo[: max(0, self._block_cache.max_blocks)]
+        progress = WarmProgress(len(todo))
+        if background and todo:
+            threading.Thread(
+                target=self._warm_blocks,
+                args=(todo, progress),
+                name="pciid-warm",
+                daemon=True,
+            ).start()
+        else:
+            self._warm_blocks(todo, progress)
+        del lease  # a background warmer re-checks the lease per block instead
+        return progress
+
+    def _warm_blocks(self, todo: List[int], progress: WarmProgress) -> None:
+        try:
+            cache = self._block_cache
+            for block_idx in todo:
+                lease = self._lease  # re-checked per block: close() stops the warmer
+                if lease is None or progress._cancelled:
+                    break
+                if block_idx not in cache:
+                    cache.put(block_idx, self._decode_block(self._load_block_payload(block_idx)))
+                progress.done += 1
+                del lease
+        finally:
+            progress._finish()
+
+    def cache_info(self) -> BlockCacheInfo:
+        """Hit/miss/eviction counters and residency of the string block cache."""
+        return self._block_cache.info()
+
+    def cache_clear(self) -> None:
+        self._block_cache.clear()
 
     def close(self) -> None:
-        self.mm.close()
-        self.f.close()
+        """
+        Idempotent and safe while other threads are mid-lookup: lookups started
+        afterwards raise ValueError, lookups in flight finish normally, and the
+        mapping is released as soon as the last of them returns (immediately if
+        none are running).
+        """
+        with self._close_lock:
+            lease, self._lease = self._lease, None
+        if lease is not None:
+            weakref.finalize(lease, self._release_mapping)
+
+    def _release_mapping(self) -> None:
+        # Views over the mmap must be released before it can be closed
+        for view in self._views:
+            view.release()
+        self._views.clear()
+        self._mv.release()
+        if isinstance(self.mm, memoryview):
+            self.mm.release()
+        else:
+            self.mm.close()
+        if self.f is not None:
+            self.f.close()
 
     # ----- header/indices -----
     def _parse_header(self) -> None:
         tup = struct.unpack_from(HEADER_FMT, self.mm, 0)
         if tup[0] != MAGIC:
             raise ValueError("bad magic")
+        self.version = tup[1]
+        self.flags = tup[2]
+        if self.flags & ~KNOWN_FLAGS:
+            raise ValueError(f"unsupported flags 0x{self.flags:04x}")
         fields = tup[3:]
         names = [
             "str_dir_off",
@@ -95,42 +559,162 @@ class PciDbBinary:
             "subclass_len",
             "prog_if_off",
             "prog_if_len",
-            "misc_off",
-            "misc_len",
-            "r1_off",
-            "r1_len",
-            "r2_off",
-            "r2_len",
-            "r3_off",
-            "r3_len",
-            "r4_off",
-            "r4_len",
+            "zdict_off",
+            "zdict_len",
+            "vendor_slot_off",
+            "vendor_slot_len",
+            "subsys_bloom_off",
+            "subsys_bloom_len",
+            "search_off",
+            "search_len",
+            "subvendor_off",
+            "subvendor_len",
         ]
         for i, n in enumerate(names):
             setattr(self, n, fields[i])
 
+    def _column(self, off: int, fmt: ColumnFormat, n: int) -> Sequence[int]:
+        size = struct.calcsize(fmt) * n
+        if _NATIVE_LE:
+            view = self._mv[off : off + size].cast(fmt)
+            self._views.append(view)
+            return view
+        col = array(fmt, bytes(self.mm[off : off + size]))  # pragma: no cover
+        col.byteswap()  # pragma: no cover
+        return col  # pragma: no cover
+
+    def _load_columns(
+        self, off: int, fmts: Columns
+    ) -> Tuple[int, List[Sequence[int]]]:
+        """Map a columnar section: u32 count, then one aligned column per field."""
+        n = struct.unpack_from("<I", self.mm, off)[0]
+        p = off + COLUMN_ALIGN
+        cols: List[Sequence[int]] = []
+        for fmt in fmts:
+            cols.append(self._column(p, fmt, n))
+            p += _align(struct.calcsize(fmt) * n)
+        return n, cols
+
     def _load_vendor_index(self) -> None:
-        n = self.vendors_len // VendorRow.size
         self._vendor_rows_off = self.vendors_off
-        self._vendor_count = n
-        self.vendor_ids = [
+        if self._columnar:
+            self._vendor_count, self._vendor_cols = self._load_columns(
+                self.vendors_off, VendorCols
+            )
+        else:
+            self._vendor_count = self.vendors_len // VendorRow.size
+        # v2+: O(1) slot table, nothing to build at open. v1: bisect vendor_ids.
+        self._has_vendor_slots = (
+            self.version >= 2
+            and self.vendor_slot_len == VENDOR_SLOTS * VendorSlot.size
+        )
+        if self._has_vendor_slots:
+            self._vendor_slots = self._column(self.vendor_slot_off, "H", VENDOR_SLOTS)
+
+    @cached_property
+    def vendor_ids(self) -> Sequence[int]:
+        if self._columnar:
+            return self._vendor_cols[0]
+        return [
             VendorRow.unpack_from(self.mm, self._vendor_rows_off + i * VendorRow.size)[
                 0
             ]
-            for i in range(n)
+            for i in range(self._vendor_count)
         ]
 
     def _load_device_index(self) -> None:
         self._device_rows_off = self.devices_off
-        self._device_count = self.devices_len // DeviceRow.size
+        if self._columnar:
+            self._device_count, self._device_cols = self._load_columns(
+                self.devices_off, DeviceCols
+            )
+        else:
+            self._device_count = self.devices_len // DeviceRow.size
 
     def _load_subsys_index(self) -> None:
         self._subsys_off = self.subsys_off
-        self._subsys_count = self.subsys_len // SubsysRow.size
+        if self._columnar:
+            self._subsys_count, self._subsys_cols = self._load_columns(
+                self.subsys_off, SubsysCols
+            )
+        else:
+            self._subsys_count = self.subsys_len // SubsysRow.size
+
+    def _load_subsys_bloom(self) -> None:
+        self._bloom: Optional[Sequence[int]] = None
+        if self.subsys_bloom_len <= BloomHdr.size:
+            return
+        log2m, probes = BloomHdr.unpack_from(self.mm, self.subsys_bloom_off)
+        if probes != BLOOM_PROBES or not (3 <= log2m <= 32):
+            return  # unknown filter shape: just skip it
+        self._bloom_shift = 64 - log2m
+        self._bloom_shift2 = 64 - 2 * log2m
+        self._bloom_mask = (1 << log2m) - 1
+        self._bloom = self._column(
+            self.subsys_bloom_off + BloomHdr.size, "B", (1 << log2m) // 8
+        )
+
+    def _subsys_maybe_present(
+        self, vendor_id: int, device_id: int, subvendor_id: int, subdevice_id: int
+    ) -> bool:
+        """False only if the subsystem is definitely absent (Bloom filter miss)."""
+        bits = self._bloom
+        if bits is None:
+            return True
+        key = (vendor_id << 48) | (device_id << 32) | (subvendor_id << 16) | subdevice_id
+        z = (key * _FIB64) & _M64
+        p1 = z >> self._bloom_shift
+        p2 = (z >> self._bloom_shift2) & self._bloom_mask
+        return bool(
+            bits[p1 >> 3] & (1 << (p1 & 7)) and bits[p2 >> 3] & (1 << (p2 & 7))
+        )
+
+    def _load_search_section(self) -> None:
+        self._packed_search: Optional[PackedSearchIndex] = None
+        if self.search_len < SearchHdr.size:
+            return  # no packed index: search() builds one in memory
+        ntok, npost = SearchHdr.unpack_from(self.mm, self.search_off)
+        arena_off = self.search_off + SearchHdr.size + 4 * (2 * (ntok + 1) + npost)
+        if arena_off > self.search_off + self.search_len:
+            raise ValueError("search index section truncated")
+        p = self.search_off + SearchHdr.size
+        tok_offs = self._column(p, "I", ntok + 1)
+        starts = self._column(p + 4 * (ntok + 1), "I", ntok + 1)
+        postings = self._column(p + 8 * (ntok + 1), "I", npost)
+        arena = self._mv[arena_off : self.search_off + self.search_len]
+        self._views.append(arena)
+        self._packed_search = PackedSearchIndex(tok_offs, arena, starts, postings)
+
+    def _load_subvendor_section(self) -> None:
+        # u32 count, then every subsystem row index sorted by (subvendor, row)
+        self._subvendor_rows: Optional[Sequence[int]] = None
+        if self.subvendor_len < 4:
+            return  # older file: iter_by_subvendor() builds the index in memory
+        n = struct.unpack_from("<I", self.mm, self.subvendor_off)[0]
+        if n != self._subsys_count or self.subvendor_len < 4 + 4 * n:
+            raise ValueError("subvendor index does not match the subsystem table")
+        self._subvendor_rows = self._column(self.subvendor_off + 4, "I", n)
+
+    @cached_property
+    def _vendor_bitmap(self) -> bytearray:
+        # v1 files only: presence bitmap so vendor misses skip the bisect
+        bitmap = bytearray(VENDOR_SLOTS // 8)
+        for vid in self.vendor_ids:
+            bitmap[vid >> 3] |= 1 << (vid & 7)
+        return bitmap
 
     def _load_class_indexes(self) -> None:
         self._class_base_off = self.class_base_off
         self._subclass_off = self.subclass_off
+        self._prog_if_off = self.prog_if_off
+        self._subclass_keys: Sequence[int]
+        if self._columnar:
+            self._subclass_count, self._subclass_cols = self._load_columns(
+                self.subclass_off, SubclassCols
+            )
+            _, self._prog_if_cols = self._load_columns(self.prog_if_off, ProgIfCols)
+            self._subclass_keys = self._subclass_cols[0]
+            return
         self._subclass_count = self.subclass_len // SubclassRow.size
         self._subclass_keys = [
             SubclassRow.unpack_from(self.mm, self._subclass_off + i * SubclassRow.size)[
@@ -138,12 +722,9 @@ class PciDbBinary:
             ]
             for i in range(self._subclass_count)
         ]
-        self._prog_if_off = self.prog_if_off
 
     # ----- string decoding -----
     def _load_block_payload(self, block_idx: int) -> bytes:
-        if block_idx in self._block_cache:
-            return self._block_cache[block_idx]
         off = self.block_offsets[block_idx]
         end = (
             self.block_offsets[block_idx + 1]
@@ -151,75 +732,134 @@ class PciDbBinary:
             else self.str_blk_off + self.str_blk_len
         )
         raw = bytes(self.mm[off:end])
+        # Uncompressed (hot or --no-compress) blocks start with stride + a full record
+        if raw[:4] == self._raw_block_sig:
+            return raw
         try:
-            payload = zlib.decompress(raw)
+            if self._zdict is not None:
+                return zlib.decompressobj(zdict=self._zdict).decompress(raw)
+            return zlib.decompress(raw)
         except zlib.error:
-            payload = raw
-        self._block_cache[block_idx] = payload
-        return payload
-
-    def _decode_string_in_block(self, payload: bytes, index_in_block: int) -> str:
-        p = 0
-        stride = struct.unpack_from("<H", payload, p)[0]
-        p += 2
-        base: Optional[str] = None
-        for i in range(index_in_block + 1):
-            kind = struct.unpack_from("<H", payload, p)[0]
-            p += 2
+            return raw
+
+    @staticmethod
+    def _decode_block(payload: bytes) -> Tuple[str, ...]:
+        """Decode every front-coded string of a block payload in one walk."""
+        out: List[str] = []
+        p = 2  # skip stride
+        end = len(payload)
+        base = ""
+        while p < end:
+            kind = _U16.unpack_from(payload, p)[0]
             if kind == 1:
-                slen = struct.unpack_from("<I", payload, p)[0]
-                p += 4
-                s = payload[p : p + slen].decode("utf-8")
-                p += slen
-                base = s
+                slen = _U32.unpack_from(payload, p + 2)[0]
+                p += 6
+                base = payload[p : p + slen].decode("utf-8")
+                out.append(base)
             else:
-                pref = struct.unpack_from("<H", payload, p)[0]
-                p += 2
-                slen = struct.unpack_from("<I", payload, p)[0]
-                p += 4
-                suf = payload[p : p + slen].decode("utf-8")
-                p += slen
-                assert base is not None
-                s = base[:pref] + suf
-            if i == index_in_block:
-                return s
-        raise IndexError
+                pref, slen = _DeltaHdr.unpack_from(payload, p + 2)
+                p += 8
+                out.append(base[:pref] + payload[p : p + slen].decode("utf-8"))
+            p += slen
+        return tuple(out)
+
+    def _load_block(self, block_idx: int) -> Tuple[str, ...]:
+        strings = self._block_cache.get(block_idx)
+        if strings is None:
+            strings = self._decode_block(self._load_block_payload(block_idx))
+            self._block_cache.put(block_idx, strings)
+        return strings
 
     def get_string(self, string_id: int) -> str:
-        stride = 32  # must match builder
-        block_idx = string_id // stride
-        idx = string_id % stride
-        payload = self._load_block_payload(block_idx)
-        return self._decode_string_in_block(payload, idx)
+        return self._get_string(self._checked_lease(), string_id)
+
+    def get_strings(self, string_ids: Iterable[int]) -> Dict[int, str]:
+        """Resolve many string IDs, decoding each touched block only once."""
+        return self._get_strings(self._checked_lease(), string_ids)
+
+    # Internal string fetches take the caller's lease instead of checking again,
+    # so a lookup that started before close() still finishes.
+    def _get_string(self, lease: _Lease, string_id: int) -> str:
+        if self._plain_strings:
+            # Decode straight out of the mmap; no zlib, no block walk, no copy
+            offs = self._string_offsets
+            start = self.str_blk_off + offs[string_id]
+            end = self.str_blk_off + offs[string_id + 1]
+            return str(self._mv[start:end], "utf-8")
+        stride = self.block_stride
+        return self._load_block(string_id // stride)[string_id % stride]
+
+    def _get_strings(self, lease: _Lease, string_ids: Iterable[int]) -> Dict[int, str]:
+        if self._plain_strings:
+            return {sid: self._get_string(lease, sid) for sid in set(string_ids)}
+        stride = self.block_stride
+        out: Dict[int, str] = {}
+        block_idx = -1
+        strings: Tuple[str, ...] = ()
+        for sid in sorted(set(string_ids)):
+            if sid // stride != block_idx:
+                block_idx = sid // stride
+                strings = self._load_block(block_idx)
+            out[sid] = strings[sid % stride]
+        return out
 
     # ----- helpers to read rows -----
     def _vendor_row_at(self, idx: int) -> Tuple[int, int, int, int]:
+        if self._columnar:
+            ids, names, starts, counts = self._vendor_cols
+            return ids[idx], names[idx], starts[idx], counts[idx]
         return VendorRow.unpack_from(
             self.mm, self._vendor_rows_off + idx * VendorRow.size
         )
 
     def _device_row_at(self, idx: int) -> Tuple[int, int, int, int]:
+        if self._columnar:
+            ids, names, starts, counts = self._device_cols
+            return ids[idx], names[idx], starts[idx], counts[idx]
         return DeviceRow.unpack_from(
             self.mm, self._device_rows_off + idx * DeviceRow.size
         )
 
     def _subsys_row_at(self, idx: int) -> Tuple[int, int, int]:
+        if self._columnar:
+            svs, sds, names = self._subsys_cols
+            return svs[idx], sds[idx], names[idx]
         return SubsysRow.unpack_from(self.mm, self._subsys_off + idx * SubsysRow.size)
 
-    # ----- lookups -----
-    def get_vendor_name(self, vendor_id: int) -> Optional[str]:
-        i = bisect.bisect_left(self.vendor_ids, vendor_id)
-        if i == self._vendor_count or self.vendor_ids[i] != vendor_id:
-            return None
-        _, sid, _, _ = self._vendor_row_at(i)
-        return self.get_string(sid)
+    def _subclass_row_at(self, idx: int) -> Tuple[int, int, int, int]:
+        if self._columnar:
+            keys, names, starts, counts = self._subclass_cols
+            return keys[idx], names[idx], starts[idx], counts[idx]
+        return SubclassRow.unpack_from(
+            self.mm, self._subclass_off + idx * SubclassRow.size
+        )
 
-    def get_device_name(self, vendor_id: int, device_id: int) -> Optional[str]:
-        i = bisect.bisect_left(self.vendor_ids, vendor_id)
+    def _prog_if_row_at(self, idx: int) -> Tuple[int, int]:
+        if self._columnar:
+            vals, names = self._prog_if_cols
+            return vals[idx], names[idx]
+        return ProgIfRow.unpack_from(self.mm, self._prog_if_off + idx * ProgIfRow.size)
+
+    def _vendor_index(self, vendor_id: int, lo: int = 0) -> int:
+        if self._has_vendor_slots:
+            if not (0 <= vendor_id < VENDOR_SLOTS):
+                return -1
+            return self._vendor_slots[vendor_id] - 1
+        if not (0 <= vendor_id < VENDOR_SLOTS) or not (
+            self._vendor_bitmap[vendor_id >> 3] & (1 << (vendor_id & 7))
+        ):
+            return -1
+        i = bisect.bisect_left(self.vendor_ids, vendor_id, lo)
         if i == self._vendor_count or self.vendor_ids[i] != vendor_id:
-            return None
-        _, _, start, count = self._vendor_row_at(i)
-        lo, hi = start, start + count
+            return -1
+        return i
+
+    def _find_device(self, lo: int, hi: int, device_id: int) -> int:
+        end = hi
+        if self._columnar:
+            ids = self._device_cols[0]
+            i = bisect.bisect_left(ids, device_id, lo, hi)
+            return i if i < end and ids[i] == device_id else -1
         while lo < hi:
             mid = (lo + hi) // 2
             did, _, _, _ = self._device_row_at(mid)
@@ -227,122 +867,501 @@ class PciDbBinary:
                 lo = mid + 1
             else:
                 hi = mid
-        if lo >= start + count:
+        if lo >= end or self._device_row_at(lo)[0] != device_id:
+            return -1
+        return lo
+
+    def _find_subsys(self, lo: int, hi: int, subvendor_id: int, subdevice_id: int) -> int:
+        end = hi
+        key = (subvendor_id, subdevice_id)
+        if self._columnar:
+            svs, sds, _ = self._subsys_cols
+            lo = bisect.bisect_left(svs, subvendor_id, lo, hi)
+            hi = bisect.bisect_right(svs, subvendor_id, lo, hi)
+            i = bisect.bisect_left(sds, subdevice_id, lo, hi)
+            return i if i < hi and sds[i] == subdevice_id else -1
+        while lo < hi:
+            mid = (lo + hi) // 2
+            sv, sd, _ = self._subsys_row_at(mid)
+            if (sv, sd) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo >= end or self._subsys_row_at(lo)[:2] != key:
+            return -1
+        return lo
+
+    # ----- lookups -----
+    def get_vendor_name(self, vendor_id: int) -> Optional[str]:
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        i = self._vendor_index(vendor_id)
+        if i < 0:
             return None
-        did, sid, _, _ = self._device_row_at(lo)
-        return self.get_string(sid) if did == device_id else None
+        _, sid, _, _ = self._vendor_row_at(i)
+        return self._get_string(lease, sid)
+
+    def get_device_name(self, vendor_id: int, device_id: int) -> Optional[str]:
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        i = self._vendor_index(vendor_id)
+        if i < 0:
+            return None
+        _, _, start, count = self._vendor_row_at(i)
+        di = self._find_device(start, start + count, device_id)
+        if di < 0:
+            return None
+        _, sid, _, _ = self._device_row_at(di)
+        return self._get_string(lease, sid)
 
     def get_subsystem_name(
         self, vendor_id: int, device_id: int, subvendor_id: int, subdevice_id: int
     ) -> Optional[str]:
-        i = bisect.bisect_left(self.vendor_ids, vendor_id)
-        if i == self._vendor_count or self.vendor_ids[i] != vendor_id:
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        if not self._subsys_maybe_present(vendor_id, device_id, subvendor_id, subdevice_id):
+            return None
+        i = self._vendor_index(vendor_id)
+        if i < 0:
             return None
         _, _, start, count = self._vendor_row_at(i)
-        # device
-        lo, hi = start, start + count
-        while lo < hi:
-            mid = (lo + hi) // 2
-            did, _, sub_start, sub_count = self._device_row_at(mid)
-            if did < device_id:
-                lo = mid + 1
-            else:
-                hi = mid
-        if lo >= start + count:
+        di = self._find_device(start, start + count, device_id)
+        if di < 0:
             return None
-        did, _, sub_start, sub_count = self._device_row_at(lo)
-        if did != device_id:
+        _, _, sub_start, sub_count = self._device_row_at(di)
+        si = self._find_subsys(sub_start, sub_start + sub_count, subvendor_id, subdevice_id)
+        if si < 0:
             return None
-        # subsystem
-        lo2, hi2 = sub_start, sub_start + sub_count
-        while lo2 < hi2:
-            mid = (lo2 + hi2) // 2
-            sv, sd, _ = self._subsys_row_at(mid)
-            if (sv, sd) < (subvendor_id, subdevice_id):
-                lo2 = mid + 1
+        _, _, sid = self._subsys_row_at(si)
+        return self._get_string(lease, sid)
+
+    # ----- batch lookups -----
+    def _batch_sids(self, keys: Sequence[BatchKey]) -> List[Tuple[int, int, int]]:
+        """
+        Resolve (vendor, device, subvendor, subdevice) keys to string IDs.
+
+        Keys are visited in sorted order so the vendor and device searches only
+        ever move forward; -1 marks a miss. Results are in input order.
+        """
+        out: List[Tuple[int, int, int]] = [(-1, -1, -1)] * len(keys)
+        order = sorted(
+            range(len(keys)),
+            key=lambda k: (keys[k][0], -1 if keys[k][1] is None else keys[k][1]),
+        )
+        cur_v: Optional[int] = None
+        cur_d: Optional[int] = None
+        v_lo = 0
+        v_sid = -1
+        d_lo = d_hi = 0
+        d_sid = -1
+        sub_start = sub_count = 0
+        for k in order:
+            vendor_id, device_id, subvendor_id, subdevice_id = keys[k]
+            if vendor_id != cur_v:
+                cur_v, cur_d = vendor_id, None
+                v_sid = d_sid = -1
+                vi = self._vendor_index(vendor_id, v_lo)
+                if vi >= 0:
+                    v_lo = vi
+                    _, v_sid, d_lo, count = self._vendor_row_at(vi)
+                    d_hi = d_lo + count
+            if v_sid < 0 or device_id is None:
+                out[k] = (v_sid, -1, -1)
+                continue
+            if device_id != cur_d:
+                cur_d = device_id
+                d_sid = -1
+                di = self._find_device(d_lo, d_hi, device_id)
+                if di >= 0:
+                    d_lo = di
+                    _, d_sid, sub_start, sub_count = self._device_row_at(di)
+            s_sid = -1
+            if (
+                d_sid >= 0
+                and sub_count
+                and subvendor_id is not None
+                and subdevice_id is not None
+                and self._subsys_maybe_present(
+                    vendor_id, device_id, subvendor_id, subdevice_id
+                )
+            ):
+                si = self._find_subsys(
+                    sub_start, sub_start + sub_count, subvendor_id, subdevice_id
+                )
+                if si >= 0:
+                    s_sid = self._subsys_row_at(si)[2]
+            out[k] = (v_sid, d_sid, s_sid)
+        return out
+
+    def _batch_names(
+        self, keys: Sequence[BatchKey]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        sids = self._batch_sids(keys)
+        strings = self._get_strings(lease, (sid for row in sids for sid in row if sid >= 0))
+        return [
+            (
+                strings[v] if v >= 0 else None,
+                strings[d] if d >= 0 else None,
+                strings[s] if s >= 0 else None,
+            )
+            for v, d, s in sids
+        ]
+
+    def get_vendor_names(self, vendor_ids: Iterable[int]) -> List[Optional[str]]:
+        keys: List[BatchKey] = [(v, None, None, None) for v in vendor_ids]
+        return [vn for vn, _, _ in self._batch_names(keys)]
+
+    def get_device_names(
+        self, pairs: Iterable[Tuple[int, int]]
+    ) -> List[Optional[str]]:
+        keys: List[BatchKey] = [(v, d, None, None) for v, d in pairs]
+        return [dn for _, dn, _ in self._batch_names(keys)]
+
+    def get_subsystem_names(
+        self, quads: Iterable[Tuple[int, int, int, int]]
+    ) -> List[Optional[str]]:
+        keys: List[BatchKey] = list(quads)
+        return [sn for _, _, sn in self._batch_names(keys)]
+
+    def resolve_many(
+        self, quads: Iterable[BatchKey]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        return self._batch_names(list(quads))
+
+    def resolve(
+        self,
+        vendor_id: int,
+        device_id: int,
+        subvendor_id: Optional[int] = None,
+        subdevice_id: Optional[int] = None,
+        class24: Optional[int] = None,
+    ) -> DeviceNames:
+        """All names for one device: one vendor and one device search, one string fetch."""
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        v_sid = d_sid = s_sid = sv_sid = -1
+        vi = self._vendor_index(vendor_id)
+        if vi >= 0:
+            _, v_sid, start, count = self._vendor_row_at(vi)
+            di = self._find_device(start, start + count, device_id)
+            if di >= 0:
+                _, d_sid, sub_start, sub_count = self._device_row_at(di)
+                if (
+                    sub_count
+                    and subvendor_id is not None
+                    and subdevice_id is not None
+                    and self._subsys_maybe_present(
+                        vendor_id, device_id, subvendor_id, subdevice_id
+                    )
+                ):
+                    si = self._find_subsys(
+                        sub_start, sub_start + sub_count, subvendor_id, subdevice_id
+                    )
+                    if si >= 0:
+                        s_sid = self._subsys_row_at(si)[2]
+        if subvendor_id is not None:
+            if subvendor_id == vendor_id:
+                sv_sid = v_sid
             else:
-                hi2 = mid
-        if lo2 >= sub_start + sub_count:
-            return None
-        sv, sd, sid = self._subsys_row_at(lo2)
-        return (
-            self.get_string(sid) if (sv, sd) == (subvendor_id, subdevice_id) else None
+                svi = self._vendor_index(subvendor_id)
+                sv_sid = self._vendor_row_at(svi)[1] if svi >= 0 else -1
+        sids = (v_sid, d_sid, sv_sid, s_sid)
+        names = self._get_strings(lease, (sid for sid in sids if sid >= 0))
+        v, d, sv, sub = (names[sid] if sid >= 0 else None for sid in sids)
+        b = c = pi = None
+        if class24 is not None:
+            table, bases = self._class_table(lease)
+            b, c, progs = table.get((class24 >> 8) & 0xFFFF) or bases[(class24 >> 16) & 0xFF]
+            pi = progs.get(class24 & 0xFF) if progs else None
+        return DeviceNames(
+            vendor_id,
+            device_id,
+            subvendor_id,
+            subdevice_id,
+            class24,
+            vendor=v,
+            device=d,
+            subvendor=sv,
+            subsystem=sub,
+            base_class=b,
+            subclass=c,
+            prog_if=pi,
+        )
+
+    def _class_table(self, lease: _Lease) -> Tuple[Dict[int, ClassEntry], List[ClassEntry]]:
+        """
+        Every listed class, decoded once on first use: (base << 8 | subclass)
+        -> (base name, subclass name, {prog_if: name}), plus one entry per base
+        for unlisted subclasses. A few hundred entries; one probe per lookup.
+        Racing first calls may both build it; either result is the same.
+        """
+        if self._class_tables is None:
+            self._class_tables = self._build_class_table(lease)
+        return self._class_tables
+
+    def _build_class_table(
+        self, lease: _Lease
+    ) -> Tuple[Dict[int, ClassEntry], List[ClassEntry]]:
+        base_sids = [
+            struct.unpack_from("<I", self.mm, self._class_base_off + b * 4)[0]
+            for b in range(256)
+        ]
+        rows = [self._subclass_row_at(i) for i in range(self._subclass_count)]
+        prog_ifs = [
+            [self._prog_if_row_at(j) for j in range(start, start + count)]
+            for _, _, start, count in rows
+        ]
+        names = self._get_strings(
+            lease,
+            [sid for sid in base_sids if sid]
+            + [sid for _, sid, _, _ in rows]
+            + [sid for pis in prog_ifs for _, sid in pis]
         )
+        bases: List[ClassEntry] = [
+            (names[sid] if sid else None, None, None) for sid in base_sids
+        ]
+        table: Dict[int, ClassEntry] = {}
+        for (key, sid, _, _), pis in zip(rows, prog_ifs):
+            progs = {pi: names[p_sid] for pi, p_sid in pis}
+            table[key] = (bases[key >> 8][0], names[sid], progs or None)
+        return table, bases
 
     def get_class_name(
         self, base: int, subclass: Optional[int] = None, prog_if: Optional[int] = None
     ) -> Optional[str]:
+        lease = self._checked_lease()  # keeps the mapping alive until we return
         if not (0 <= base < 256):
             return None
+        table, bases = self._class_table(lease)
         if subclass is None:
-            sid = struct.unpack_from("<I", self.mm, self._class_base_off + base * 4)[0]
-            return None if sid == 0 else self.get_string(sid)
-        key = ((base & 0xFF) << 8) | (subclass & 0xFF)
-        i = bisect.bisect_left(self._subclass_keys, key)
-        if i == self._subclass_count or self._subclass_keys[i] != key:
-            # subclass unknown → fall back to base
-            return self.get_class_name(base, None, None)
-        _, sname_id, start, count = SubclassRow.unpack_from(
-            self.mm, self._subclass_off + i * SubclassRow.size
-        )
-        if prog_if is None:
-            return self.get_string(sname_id)
-        lo, hi = start, start + count
-        while lo < hi:
-            mid = (lo + hi) // 2
-            pi, _ = ProgIfRow.unpack_from(
-                self.mm, self._prog_if_off + mid * ProgIfRow.size
-            )
-            if pi < prog_if:
-                lo = mid + 1
-            else:
-                hi = mid
-        if lo >= start + count:
-            return self.get_string(sname_id)  # fall back to subclass name
-        pi, sid = ProgIfRow.unpack_from(
-            self.mm, self._prog_if_off + lo * ProgIfRow.size
-        )
-        return self.get_string(sid) if pi == prog_if else self.get_string(sname_id)
+            return bases[base][0]
+        bname, sname, progs = table.get((base << 8) | (subclass & 0xFF)) or bases[base]
+        if sname is None:
+            return bname  # subclass unknown → fall back to base
+        if prog_if is not None and progs:
+            name = progs.get(prog_if)
+            if name is not None:
+                return name
+        return sname
 
     # Convenience: decode 24-bit class code like 0x030000 -> (03,00,00)
     def get_class_name_from_code(
         self, class_code_24bit: int, depth: int = 3
     ) -> Optional[str]:
-        base = (class_code_24bit >> 16) & 0xFF
-        sub = (class_code_24bit >> 8) & 0xFF
-        pi = (class_code_24bit) & 0xFF
+        lease = self._checked_lease()  # keeps the mapping alive until we return
         depth = _clamp(depth, 0, 3)
+        table, bases = self._class_table(lease)
+        bname, sname, progs = (
+            table.get((class_code_24bit >> 8) & 0xFFFF)
+            or bases[(class_code_24bit >> 16) & 0xFF]
+        )
         # Prefer the most specific that exists
-        if depth > 2:
-            name = self.get_class_name(base, sub, pi)
-            if name is not None:
-                return name
-        if depth > 1:
-            name = self.get_class_name(base, sub, None)
+        if depth > 2 and progs:
+            name = progs.get(class_code_24bit & 0xFF)
             if name is not None:
                 return name
-        return self.get_class_name(base, None, None)
+        if depth > 1 and sname is not None:
+            return sname
+        return bname
+
+    # ----- streaming iteration, in table (ID) order -----
+    def _iter_rows(
+        self,
+        lease: _Lease,
+        idxs: Sequence[int],
+        row_at: Callable[[int], Tuple[int, ...]],
+        sid_col: int,
+    ) -> Iterator[Tuple[int, Tuple[int, ...], str]]:
+        # `lease` keeps the mapping alive while the generator is suspended, so an
+        # iterator started before close() runs to the end. Each chunk resolves
+        # its names in one pass, inflating a block at most once per chunk; rows
+        # follow ID order, not string order, so with lex-ordered strings later
+        # chunks (and nested walks) come back to the same blocks, and only the
+        # block cache saves those inflates.
+        for start in range(0, len(idxs), ITER_CHUNK):
+            chunk = idxs[start : start + ITER_CHUNK]
+            rows = [row_at(i) for i in chunk]
+            names = self._get_strings(lease, (row[sid_col] for row in rows))
+            for i, row in zip(chunk, rows):
+                yield i, row, names[row[sid_col]]
+
+    def _checked_lease(self) -> _Lease:
+        lease = self._lease
+        if lease is None:
+            raise ValueError("PciDbBinary is closed")
+        return lease
+
+    def iter_vendors(self) -> Iterator[Tuple[int, str]]:
+        """(vendor_id, name) for every vendor; names are decoded chunk by chunk."""
+        rows = self._iter_rows(
+            self._checked_lease(), range(self._vendor_count), self._vendor_row_at, 1
+        )
+        return ((row[0], name) for _, row, name in rows)
+
+    def iter_devices(self, vendor_id: int) -> Iterator[Tuple[int, str]]:
+        """(device_id, name) for every device of a vendor; nothing if unknown."""
+        lease = self._checked_lease()
+        vi = self._vendor_index(vendor_id)
+        if vi < 0:
+            return iter(())
+        _, _, start, count = self._vendor_row_at(vi)
+        rows = self._iter_rows(
+            lease, range(start, start + count), self._device_row_at, 1
+        )
+        return ((row[0], name) for _, row, name in rows)
+
+    def iter_subsystems(
+        self, vendor_id: int, device_id: int
+    ) -> Iterator[Tuple[int, int, str]]:
+        """(subvendor_id, subdevice_id, name) for every subsystem of a device."""
+        lease = self._checked_lease()
+        vi = self._vendor_index(vendor_id)
+        if vi < 0:
+            return iter(())
+        _, _, start, count = self._vendor_row_at(vi)
+        di = self._find_device(start, start + count, device_id)
+        if di < 0:
+            return iter(())
+        _, _, start, count = self._device_row_at(di)
+        rows = self._iter_rows(
+            lease, range(start, start + count), self._subsys_row_at, 2
+        )
+        return ((row[0], row[1], name) for _, row, name in rows)
+
+    def iter_classes(self) -> Iterator[ClassRecord]:
+        """
+        Class lines in pci.ids order: each named base class, then its subclasses,
+        each followed by its programming interfaces.
+        """
+        lease = self._checked_lease()
+        return class_records(*self._class_table(lease))
+
+    # ----- reverse subsystem-vendor index -----
+    def _subsys_subvendor(self, si: int) -> int:
+        if self._columnar:
+            return self._subsys_cols[0][si]
+        return int(SubsysRow.unpack_from(self.mm, self._subsys_off + si * SubsysRow.size)[0])
+
+    @cached_property
+    def _subvendor_index(self) -> Dict[int, List[int]]:
+        # only for files without the section: subvendor -> ascending subsystem rows
+        index: Dict[int, List[int]] = {}
+        for si in range(self._subsys_count):
+            index.setdefault(self._subsys_subvendor(si), []).append(si)
+        return index
+
+    def iter_by_subvendor(
+        self, subvendor_id: int
+    ) -> Iterator[Tuple[int, int, int, int, str]]:
+        """
+        (vendor_id, device_id, subvendor_id, subdevice_id, name) for every
+        subsystem entry listed under `subvendor_id` (e.g. every Dell-branded
+        board), in table order. Costs a bisect plus the size of the result with
+        the file's subvendor section (--subvendor-index); without it the first
+        call scans every subsystem row once to build the index in memory.
+        """
+        lease = self._checked_lease()
+        rows = self._subvendor_rows
+        if rows is None:
+            found: Sequence[int] = self._subvendor_index.get(subvendor_id, [])
+        else:
+            key = self._subsys_subvendor
+            lo = bisect.bisect_left(rows, subvendor_id, key=key)
+            hi = bisect.bisect_right(rows, subvendor_id, lo, key=key)
+            # copied out: a slice of the mapped column would pin the mmap past close()
+            found = list(rows[lo:hi])
+        return self._iter_subvendor_rows(lease, found)
+
+    def _iter_subvendor_rows(
+        self, lease: _Lease, found: Sequence[int]
+    ) -> Iterator[Tuple[int, int, int, int, str]]:
+        for si, (sv, sd, _), name in self._iter_rows(
+            lease, found, self._subsys_row_at, 2
+        ):
+            di = self._subsys_owner(si)
+            did = self._device_row_at(di)[0]
+            vid = self._vendor_row_at(self._device_owner(di))[0]
+            yield vid, did, sv, sd, name
+
+    # ----- name search -----
+    def _search_index(self, lease: _Lease) -> Union[PackedSearchIndex, SearchIndex]:
+        if self._packed_search is not None:
+            return self._packed_search
+        if self._memory_search is None:  # racing first searches may both build it
+            self._memory_search = self._build_search_index(lease)
+        return self._memory_search
+
+    def _build_search_index(self, lease: _Lease) -> SearchIndex:
+        # no section (older converter, or built without --search-index): decode
+        # every name once and index it in memory
+        rows: List[Tuple[int, int]] = []
+        kinds = (
+            (_search.KIND_VENDOR, self._vendor_count, self._vendor_row_at, 1),
+            (_search.KIND_DEVICE, self._device_count, self._device_row_at, 1),
+            (_search.KIND_SUBSYSTEM, self._subsys_count, self._subsys_row_at, 2),
+        )
+        for kind, count, row_at, sid_col in kinds:
+            rows.extend(
+                (_search.entry_code(kind, i), row_at(i)[sid_col]) for i in range(count)
+            )
+        names = self._get_strings(lease, (sid for _, sid in rows))
+        return SearchIndex.build((code, names[sid]) for code, sid in rows)
+
+    @cached_property
+    def _child_starts(self) -> Tuple[Sequence[int], Sequence[int]]:
+        """dev_start per vendor row and sub_start per device row, for owner bisects."""
+        if self._columnar:
+            return self._vendor_cols[2], self._device_cols[2]
+        return (
+            [self._vendor_row_at(i)[2] for i in range(self._vendor_count)],
+            [self._device_row_at(i)[2] for i in range(self._device_count)],
+        )
+
+    def _device_owner(self, di: int) -> int:
+        # the last vendor whose device range starts at or before the row
+        return bisect.bisect_right(self._child_starts[0], di) - 1
+
+    def _subsys_owner(self, si: int) -> int:
+        return bisect.bisect_right(self._child_starts[1], si) - 1
+
+    def _search_hit(
+        self, code: int
+    ) -> Tuple[int, Optional[int], Optional[int], Optional[int], int]:
+        """(vendor, device, subvendor, subdevice, name string id) for a code."""
+        kind, row = code >> _search.KIND_SHIFT, code & _search.ROW_MASK
+        if kind == _search.KIND_VENDOR:
+            vid, sid, _, _ = self._vendor_row_at(row)
+            return vid, None, None, None, sid
+        di = self._subsys_owner(row) if kind == _search.KIND_SUBSYSTEM else row
+        vid = self._vendor_row_at(self._device_owner(di))[0]
+        did, sid, _, _ = self._device_row_at(di)
+        if kind == _search.KIND_DEVICE:
+            return vid, did, None, None, sid
+        sv, sd, sid = self._subsys_row_at(row)
+        return vid, did, sv, sd, sid
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        limit: Optional[int] = _search.DEFAULT_LIMIT,
+    ) -> List[SearchHit]:
+        """
+        Vendors, devices and subsystems whose names contain every word of
+        `query` as a word prefix, case-insensitively ("geforce rtx" matches
+        "GeForce RTX 3080"). `kind` is "vendor", "device", "subsystem" or None
+        for all; hits come vendors first, then devices, then subsystems, each
+        in ID order. Uses the file's search section when the converter wrote
+        one (--search-index), else an in-memory index built on the first call.
+        """
+        lease = self._checked_lease()  # keeps the mapping alive until we return
+        codes = _search.match(self._search_index(lease), query, kind, limit)
+        hits = [self._search_hit(code) for code in codes]
+        names = self._get_strings(lease, (hit[-1] for hit in hits))
+        return [
+            SearchHit(vendor=vid, device=did, subvendor=sv, subdevice=sd, name=names[sid])
+            for vid, did, sv, sd, sid in hits
+        ]
 
     # Best-effort formatter for unknown devices
     def describe_device_best_effort(
         self, vendor_id: int, device_id: int, class_code_24bit: Optional[int]
     ) -> str:
-        vn: Optional[str]
-        dn: Optional[str]
-        cn: Optional[str]
-
-        # If exact vendor+device known, return "Vendor Device"
-        dn = self.get_device_name(vendor_id, device_id)
-        if dn:
-            vn = self.get_vendor_name(vendor_id) or f"0x{vendor_id:04x}"
-            return f"{vn} {dn}"
-
-        vn = self.get_vendor_name(vendor_id)
-        cn = (
-            self.get_class_name_from_code(class_code_24bit, depth=2)
-            if class_code_24bit is not None
-            else None
-        )
-        vendor_part = vn if vn else f"0x{vendor_id:04x}"
-        class_part = cn if cn else "PCI device"
-        return f"Unknown {vendor_part} {class_part} (0x{device_id:04x})"
+        return self.resolve(vendor_id, device_id, class24=class_code_24bit).describe()
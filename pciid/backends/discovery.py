@@ -1,13 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
 import os
-import weakref
 from pathlib import Path
 from typing import Callable, Iterable, List, Optional, Tuple
 from importlib import resources
 from ..types import PciDb
 from .bindb import PciDbBinary
 from .textdb import PciDbText
+from .textcache import open_text
 from ..data import (
     bin_resource,
     text_resource,
@@ -57,7 +57,7 @@ def _resolve_candidates(
         p = explicit_path
 
         def open_path() -> PciDb:
-            return PciDbBinary(p) if _is_bin_path(p) else PciDbText(p)
+            return PciDbBinary(p) if _is_bin_path(p) else open_text(p)
 
         cands.append(Candidate("path-auto", p, open_path))
         return cands
@@ -81,7 +81,7 @@ def _resolve_candidates(
                 raise ValueError("Path cannot be None")
             if not Path(p).exists():
                 raise FileNotFoundError(f"PCIID_TEXT not found: {p}")
-            return PciDbText(p)
+            return open_text(p)
 
         cands.append(Candidate("env-text", env_text, open_env_text))
 
@@ -94,47 +94,20 @@ def _resolve_candidates(
     def open_sys_text(p: str = system_text) -> PciDb:
         if not Path(p).exists():
             raise FileNotFoundError(p)
-        return PciDbText(p)
+        return open_text(p)
 
-    # Bundled resources: wrap importlib.resources.as_file with lifetime tied to DB.close()
+    # Bundled bin is read straight into memory: no as_file() temp extraction when
+    # the package is zipped. The text DB still needs a real path.
     def open_bundled_bin() -> PciDb:
-        res = bin_resource()
-        cm = resources.as_file(res)
-        p = cm.__enter__()
-        db = PciDbBinary(str(p))
-
-        # ensure resource is released on .close() and at GC
-        _orig_close = db.close
-
-        def _close_and_release() -> None:
-            try:
-                _orig_close()
-            finally:
-                cm.__exit__(None, None, None)
-
-        db.close = _close_and_release  # type: ignore[method-assign]
-
-        weakref.finalize(db, cm.__exit__, None, None, None)
-        return db
+        return PciDbBinary.from_bytes(bin_resource().read_bytes())
 
+    # Bundled text is fully parsed in the constructor, so the as_file() path only
+    # needs to live that long; no close() wrapper (which would defeat pickling).
+    # Not routed through the compiled cache: the bundled bin comes first, and
+    # as_file() paths may be fresh temp files.
     def open_bundled_text() -> PciDb:
-        res = text_resource()
-        cm = resources.as_file(res)
-        p = cm.__enter__()
-        db = PciDbText(str(p))
-
-        _orig_close = db.close
-
-        def _close_and_release() -> None:
-            try:
-                _orig_close()
-            finally:
-                cm.__exit__(None, None, None)
-
-        db.close = _close_and_release  # type: ignore[method-assign]
-
-        weakref.finalize(db, cm.__exit__, None, None, None)
-        return db
+        with resources.as_file(text_resource()) as p:
+            return PciDbText(str(p))
 
     # Preferred order (bin > text regardless of source)
     if allow_system:
@@ -0,0 +1,182 @@
+#!/usr/bin/python
+#
+# Python pciid library
+# Compiled binary cache for plaintext pci.ids databases
+#
+# (c) 2025 Steven Noonan
+# Licensed under the MIT license
+#
+
+from __future__ import annotations
+import contextlib, hashlib, os, struct, tempfile, time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from ..types import PciDb
+from .bindb import HEADER_FMT, PciDbBinary
+from .textdb import PciDbText
+
+# Part of every cache key: bump when the converter's output format or the
+# options used below change, so old entries stop matching.
+CACHE_FORMAT = 2
+
+DEFAULT_MAX_BYTES = 64 << 20  # a compiled full pci.ids is ~1.8 MiB
+STALE_TMP_SECONDS = 3600  # temp files older than this belong to crashed compiles
+
+
+def cache_dir() -> Path:
+    """$XDG_CACHE_HOME/pciid; ~/.cache/pciid if unset or relative (per the XDG spec)."""
+    base = os.environ.get("XDG_CACHE_HOME", "")
+    if not os.path.isabs(base):
+        base = os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "pciid"
+
+
+def cache_key(text_path: str) -> str:
+    """
+    Entry name for a text DB: a hash over its resolved path and the file's
+    device, inode, size and mtime, so opening a cached DB costs one stat().
+    Edits, files renamed over the path and format bumps all get a fresh
+    entry; like make, an edit that keeps both size and mtime goes unseen.
+    """
+    real = os.path.realpath(text_path)
+    st = os.stat(real)
+    parts = (CACHE_FORMAT, real, st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    key = "\0".join(str(p) for p in parts).encode("utf-8", "surrogateescape")
+    return hashlib.sha256(key).hexdigest()[:32]
+
+
+def _compile(text_path: str, directory: Path, entry: Path) -> None:
+    from .. import convert  # only loaded when something needs compiling
+
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=entry.stem + ".", suffix=".tmp", dir=directory)
+    os.close(fd)
+    try:
+        convert.build(
+            # only this reader maps cache entries, so the smaller zdict layout is safe
+            convert.ProgramArgs(
+                input_path=text_path, output_path=tmp, no_compress=False, zdict=True
+            )
+        )
+        check = PciDbBinary(tmp)
+        try:  # the converter takes anything; PciDbText's emptiness check
+            empty = next(check.iter_vendors(), None) is None
+            empty = empty or next(check.iter_classes(), None) is None
+        finally:
+            check.close()
+        if empty:
+            raise ValueError("Corrupt or empty text database")
+        # Atomic publish: readers see no entry or a whole one. Concurrent first
+        # openers each compile to their own temp file and the last rename wins;
+        # the bytes are the same. The fsync keeps a crash from leaving the new
+        # name on unwritten data; open_compiled() still checks sizes.
+        with open(tmp, "rb") as f:
+            os.fsync(f.fileno())
+        os.replace(tmp, entry)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp)
+        raise
+
+
+def open_compiled(
+    text_path: str,
+    directory: Optional[Path] = None,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> PciDbBinary:
+    """
+    Map the compiled binary of a plaintext pci.ids from `directory` (default
+    cache_dir()), compiling it there first if needed; writing a new entry
+    prunes the cache back to `max_bytes`. Raises OSError when the cache can't
+    be written and ValueError when the text doesn't parse.
+    """
+    directory = directory or cache_dir()
+    entry = directory / f"{cache_key(text_path)}.bin"
+    try:
+        db = PciDbBinary(str(entry))
+    except FileNotFoundError:
+        pass
+    except (ValueError, struct.error):
+        pass  # torn or foreign file under our name: compile over it
+    else:
+        if _sections_fit(db):
+            # mtime doubles as "last used" for prune(); a read-only cache still works
+            with contextlib.suppress(OSError):
+                os.utime(entry)
+            return db
+        db.close()  # cut short after a header that parses: compile over it
+    _compile(text_path, directory, entry)
+    prune(directory, max_bytes, keep=entry.name)
+    return PciDbBinary(str(entry))
+
+
+def _sections_fit(db: PciDbBinary) -> bool:
+    # Every header (offset, length) pair must end inside the file; the
+    # converter writes its last section right up to the end.
+    fields: Tuple[int, ...] = struct.unpack_from(HEADER_FMT, db.mm, 0)[3:]
+    ends = (off + n for off, n in zip(fields[::2], fields[1::2], strict=True))
+    return bool(max(ends) <= len(db.mm))
+
+
+def open_text(text_path: str) -> PciDb:
+    """
+    A plaintext pci.ids the fast way: through the compiled cache unless
+    PCIID_NO_TEXT_CACHE=1, else (or when the cache is unusable) parsed by
+    PciDbText.
+    """
+    if os.getenv("PCIID_NO_TEXT_CACHE") != "1":
+        try:
+            return open_compiled(text_path)
+        except Exception:
+            # read-only home, full disk, text the converter chokes on (it can
+            # fail with more than ValueError): PciDbText decides
+            pass
+    return PciDbText(text_path)
+
+
+def prune(
+    directory: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES, keep: str = ""
+) -> int:
+    """
+    Delete least recently used entries until the rest fit in `max_bytes`, and
+    temp files left by crashed compiles. The entry named `keep` is spared.
+    Handles that already mapped a deleted entry keep working. Returns the
+    number of bytes freed.
+    """
+    directory = directory or cache_dir()
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    now = time.time()
+    entries: List[Tuple[float, int, str]] = []
+    freed = total = 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue  # another process pruned it first
+        if name.endswith(".tmp"):
+            if now - st.st_mtime > STALE_TMP_SECONDS:
+                freed += _unlink(path, st.st_size)
+        elif name.endswith(".bin"):
+            total += st.st_size
+            if name != keep:
+                entries.append((st.st_mtime, st.st_size, path))
+    entries.sort()  # oldest first
+    for _, size, path in entries:
+        if total <= max_bytes:
+            break
+        total -= size
+        freed += _unlink(path, size)
+    return freed
+
+
+def _unlink(path: str, size: int) -> int:
+    try:
+        os.unlink(path)
+    except OSError:
+        return 0
+    return size
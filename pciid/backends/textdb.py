@@ -7,9 +7,20 @@
 # Licensed under the MIT license
 #
 
-from typing import Optional, Dict, List, Tuple
+from typing import Any, Callable, Iterable, Iterator, Optional, Dict, List, Tuple
 from array import array
-import bisect
+from functools import cached_property
+import bisect, io, itertools, re
+
+from ..types import (
+    BatchKey,
+    ClassEntry,
+    ClassRecord,
+    DeviceNames,
+    SearchHit,
+    class_records,
+)
+from .. import search as _search
 
 Subvendor = Tuple[int, int, str]
 Device = Tuple[int, str, List[Subvendor]]
@@ -43,95 +54,172 @@ class _StringPool:
 
 
 # ---------- Parser for plaintext pci.ids ----------
+def _parse_class_lines(lines: Iterable[str]) -> ClassDict:
+    """The class section: everything from the first "C " line to the end."""
+    classes: ClassDict = {}
+    cur_base: Optional[int] = None
+    cur_sub: Optional[int] = None
+    for raw in lines:
+        line = raw.rstrip("\n")
+        if not line or line.startswith("#"):
+            continue
+
+        if line.startswith("C "):
+            parts = line.split(None, 2)  # ['C','02','Network controller']
+            if len(parts) >= 3:
+                base = int(parts[1], 16)
+                name = parts[2]
+                classes[base] = (name, {})
+                cur_base = base
+                cur_sub = None
+            continue
+
+        # Classes / subclasses / prog-if
+        if line.startswith("\t\t"):
+            s = line.strip()
+            tok = s.split(None, 1)
+            pi = int(tok[0], 16)
+            name = tok[1] if len(tok) > 1 else ""
+            assert cur_base is not None
+            assert cur_sub is not None
+            classes[cur_base][1][cur_sub][1][pi] = name
+            continue
+
+        s = line.strip()
+        tok = s.split(None, 1)
+        sub = int(tok[0], 16)
+        name = tok[1] if len(tok) > 1 else ""
+        assert cur_base is not None
+        classes[cur_base][1][sub] = (name, {})
+        cur_sub = sub
+    return classes
+
+
 def _parse_pci_ids(path: str) -> Tuple[VendorDict, ClassDict]:
     """
     Returns:
       vendors: dict[vendor_id] = (vendor_name, list[(dev_id, dev_name, list[(subven, subdev, subname)])])
       classes: dict[base] = (base_name, dict[sub] = (sub_name, dict[prog_if] = prog_if_name))
     """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return _parse_pci_lines(f)
+
+
+def _parse_pci_lines(f: Iterator[str]) -> Tuple[VendorDict, ClassDict]:
+    """_parse_pci_ids() over lines already split with universal newlines."""
     vendors: VendorDict = {}
     classes: ClassDict = {}
-
-    in_classes = False
     cur_vendor: Optional[int] = None
-    cur_device: Optional[int] = None
-    cur_base: Optional[int] = None
-    cur_sub: Optional[int] = None
-
-    with open(path, "r", encoding="utf-8", errors="replace") as f:
-        for raw in f:
-            line = raw.rstrip("\n")
-            if not line or line.startswith("#"):
-                continue
-
-            if line.startswith("C "):
-                in_classes = True
-                parts = line.split(None, 2)  # ['C','02','Network controller']
-                if len(parts) >= 3:
-                    base = int(parts[1], 16)
-                    name = parts[2]
-                    classes[base] = (name, {})
-                    cur_base = base
-                    cur_sub = None
-                continue
 
-            if not in_classes:
-                # Vendors / devices / subsystems
-                if line[0] != "\t":
-                    tok = line.split(None, 1)
-                    if len(tok) >= 1 and len(tok[0]) == 4:  # vendor id
-                        ven = int(tok[0], 16)
-                        name = tok[1] if len(tok) > 1 else ""
-                        vendors[ven] = (name, [])
-                        cur_vendor, cur_device = ven, None
-                    continue
+    for raw in f:
+        line = raw.rstrip("\n")
+        if not line or line.startswith("#"):
+            continue
 
-                if line.startswith("\t\t"):
-                    s = line.strip()
-                    # "ssss vvvv  name"
-                    tok = s.split(None, 2)
-                    if len(tok) >= 2:
-                        subven = int(tok[0], 16)
-                        subdev = int(tok[1], 16)
-                        name = tok[2] if len(tok) > 2 else ""
-                        assert cur_vendor is not None
-                        vendors[cur_vendor][1][-1][2].append((subven, subdev, name))
-                    continue
+        if line.startswith("C "):
+            classes = _parse_class_lines(itertools.chain([line], f))
+            break
 
-                # We already know the line starts with at least one \t
-                s = line.strip()
-                tok = s.split(None, 1)
-                dev = int(tok[0], 16)
+        # Vendors / devices / subsystems
+        if line[0] != "\t":
+            tok = line.split(None, 1)
+            if len(tok) >= 1 and len(tok[0]) == 4:  # vendor id
+                ven = int(tok[0], 16)
                 name = tok[1] if len(tok) > 1 else ""
+                vendors[ven] = (name, [])
+                cur_vendor = ven
+            continue
+
+        if line.startswith("\t\t"):
+            s = line.strip()
+            # "ssss vvvv  name"
+            tok = s.split(None, 2)
+            if len(tok) >= 2:
+                subven = int(tok[0], 16)
+                subdev = int(tok[1], 16)
+                name = tok[2] if len(tok) > 2 else ""
                 assert cur_vendor is not None
-                vendors[cur_vendor][1].append((dev, name, []))
-                cur_device = dev
-                continue
-            else:
-                # Classes / subclasses / prog-if
-                if line.startswith("\t\t"):
-                    s = line.strip()
-                    tok = s.split(None, 1)
-                    pi = int(tok[0], 16)
-                    name = tok[1] if len(tok) > 1 else ""
-                    assert cur_base is not None
-                    assert cur_sub is not None
-                    classes[cur_base][1][cur_sub][1][pi] = name
-                    continue
+                vendors[cur_vendor][1][-1][2].append((subven, subdev, name))
+            continue
 
-                # We already know the line starts with at least one \t
-                s = line.strip()
-                tok = s.split(None, 1)
-                sub = int(tok[0], 16)
-                name = tok[1] if len(tok) > 1 else ""
-                assert cur_base is not None
-                classes[cur_base][1][sub] = (name, {})
-                cur_sub = sub
-                continue
+        # We already know the line starts with at least one \t
+        s = line.strip()
+        tok = s.split(None, 1)
+        dev = int(tok[0], 16)
+        name = tok[1] if len(tok) > 1 else ""
+        assert cur_vendor is not None
+        vendors[cur_vendor][1].append((dev, name, []))
 
     return vendors, classes
 
 
+# Lazy loader scan: a vendor line (four hex digits, then the name) or the first
+# class line, each right after a line break; the file's first line is matched
+# separately. Group 1 is None for the class line.
+_SCAN_LINE = rb"(?:C |([0-9A-Fa-f]{4})(?:[ \t]+([^\r\n]*))?\r?(?=\n|\Z))"
+_SCAN_FIRST = re.compile(_SCAN_LINE)
+_SCAN_NEXT = re.compile(rb"\n" + _SCAN_LINE)
+
+# One vendor's devices, parsed on demand:
+# device_id -> (name, {subvendor << 16 | subdevice: name})
+DeviceBlock = Dict[int, Tuple[str, Dict[int, str]]]
+
+
+def _parse_device_block(block: bytes) -> DeviceBlock:
+    """
+    The device and subsystem lines under one vendor line. Lines are split
+    decoded, like the dict parser splits them: blocks are small, and this
+    copes with Unicode whitespace between fields.
+    """
+    devices: DeviceBlock = {}
+    subs: Optional[Dict[int, str]] = None
+    for raw in block.splitlines():
+        line = raw.decode("utf-8", "replace")
+        if not line.startswith("\t"):  # blank or "#" comment
+            continue
+        if line.startswith("\t\t"):  # subsystem
+            tok = line.split(None, 2)
+            if subs is None or len(tok) < 2:
+                continue
+            key = ((int(tok[0], 16) & 0xFFFF) << 16) | (int(tok[1], 16) & 0xFFFF)
+            subs.setdefault(key, tok[2].strip() if len(tok) > 2 else "")
+            continue
+        tok = line.split(None, 1)
+        if not tok:
+            continue
+        entry: Tuple[str, Dict[int, str]] = (tok[1].strip() if len(tok) > 1 else "", {})
+        # the first of duplicate IDs wins, as with the sorted arrays
+        devices.setdefault(int(tok[0], 16) & 0xFFFF, entry)
+        subs = entry[1]
+    return devices
+
+
+def _class_table_from_dict(
+    classes: ClassDict,
+) -> Tuple[Dict[int, ClassEntry], List[ClassEntry]]:
+    """PciDbText._class_table, straight from the parsed class section."""
+    bases: List[ClassEntry] = [(None, None, None)] * 256
+    for base, (bname, _) in classes.items():
+        bases[base & 0xFF] = (bname, None, None)
+    table: Dict[int, ClassEntry] = {}
+    for base in sorted(classes):
+        for sub, (sname, pifs) in sorted(classes[base][1].items()):
+            progs = {pi & 0xFF: pifs[pi] for pi in sorted(pifs)}
+            key = ((base & 0xFF) << 8) | (sub & 0xFF)
+            table[key] = (bases[key >> 8][0], sname, progs or None)
+    return table, bases
+
+
+class _Unsorted(Exception):
+    """pci.ids is not in upstream (sorted) order; take the sorting loader."""
+
+
+def _counts(starts: "array[int]", total: int) -> "array[int]":
+    ends = starts[1:]
+    ends.append(total)
+    return array("I", [end - start for start, end in zip(starts, ends)])
+
+
 # ---------- Loader building compact arrays ----------
 class PciDbText:
     # Row layouts (kept implicit via parallel arrays):
@@ -143,30 +231,44 @@ class PciDbText:
     #          prog_if_vals[B], prog_if_name_sid[I]
 
     def __init__(self, pci_ids_path: str):
-        vendors: VendorDict
-        classes: ClassDict
-
-        # Parse to high-level
-        vendors, classes = _parse_pci_ids(pci_ids_path)
-        if not vendors or not classes:
+        with open(pci_ids_path, "rb") as f:
+            self._load(f, lambda: _parse_pci_ids(pci_ids_path))
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PciDbText":
+        """Parse pci.ids text already in memory (e.g. for PciDbTextLazy)."""
+        self = cls.__new__(cls)
+        self._load(
+            io.BytesIO(data),
+            lambda: _parse_pci_lines(
+                io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="replace")
+            ),
+        )
+        return self
+
+    def _load(
+        self,
+        raw_lines: Iterable[bytes],
+        parse_dicts: Callable[[], Tuple[VendorDict, ClassDict]],
+    ) -> None:
+        sp = _StringPool()
+        try:
+            classes = self._load_vendors_sorted(raw_lines, sp)
+        except (_Unsorted, ValueError):
+            # not in upstream order, or odd: the dict parser sorts (or raises)
+            sp = _StringPool()
+            vendors, classes = parse_dicts()
+            self._load_vendor_tree(vendors, sp)
+        if not self.vendor_ids or not classes:
             raise ValueError("Corrupt or empty text database")
+        self._load_classes(classes, sp)
 
-        # Build string pool
-        sp = _StringPool()
-        for ven, (vname, devs) in vendors.items():
-            sp.intern(vname)
-            for did, dname, sublist in devs:
-                sp.intern(dname)
-                for sv, sd, sname in sublist:
-                    sp.intern(sname)
-        for base, (bname, subs) in classes.items():
-            sp.intern(bname)
-            for sub, (sname, pifs) in subs.items():
-                sp.intern(sname)
-                for pi, piname in pifs.items():
-                    sp.intern(piname)
+        # Keep vendor_ids as a Python list for bisect speed (array works too, but list is fine)
+        self._vendor_ids_list = list(self.vendor_ids)
 
-        # Vendors/devices/subsystems → compact arrays
+        self._sp = sp
+
+    def _init_vendor_arrays(self) -> None:
         self.vendor_ids = array("H")
         self.vendor_name_sid = array("I")
         self.vendor_dev_start = array("I")
@@ -181,6 +283,99 @@ class PciDbText:
         self.subdevice_ids = array("H")
         self.subsys_name_sid = array("I")
 
+    def _load_vendors_sorted(self, lines: Iterable[bytes], sp: _StringPool) -> ClassDict:
+        """
+        Single pass over the raw lines, appending rows straight into the arrays.
+        Upstream pci.ids lists vendors, devices and subsystems in ID order, so
+        nothing needs sorting: other orders, and CR line breaks, raise _Unsorted.
+        IDs that the bytes split can't parse raise ValueError. Names are stripped
+        like the dict parser strips them. Returns the small class section,
+        parsed the dict way.
+        """
+        self._init_vendor_arrays()
+        add_vendor, add_vendor_sid = self.vendor_ids.append, self.vendor_name_sid.append
+        add_dev_start = self.vendor_dev_start.append
+        add_device, add_device_sid = self.device_ids.append, self.device_name_sid.append
+        add_sub_start = self.dev_sub_start.append
+        add_subven, add_subdev = self.subvendor_ids.append, self.subdevice_ids.append
+        add_subsys_sid = self.subsys_name_sid.append
+        intern = sp.intern
+
+        no_device = 1 << 32  # last_sub before a vendor's first device: rejects all
+        last_ven, last_dev, last_sub = -1, -1, no_device  # previous IDs per level
+        n_devices = n_subsys = 0
+        classes: ClassDict = {}
+        it = iter(lines)
+        for line in it:
+            line = line.rstrip(b"\n")
+            # before the comment skip: a CR-only file is one "line" starting "#"
+            if b"\r" in line:
+                raise _Unsorted  # CRLF or CR-only file: text mode handles newlines
+            if not line or line[0] == 0x23:  # "#"
+                continue
+            if line[0] != 0x09:  # vendor (or the class section)
+                if line.startswith(b"C "):
+                    rest = itertools.chain([line], it)
+                    classes = _parse_class_lines(
+                        raw.decode("utf-8", "replace") for raw in rest
+                    )
+                    break
+                tok = line.split(None, 1)
+                if not tok or len(tok[0]) != 4:
+                    continue
+                ven = int(tok[0], 16)
+                if ven <= last_ven:
+                    raise _Unsorted
+                last_ven, last_dev, last_sub = ven, -1, no_device
+                add_vendor(ven)
+                name = tok[1] if len(tok) > 1 else b""
+                add_vendor_sid(intern(name.decode("utf-8", "replace").lstrip()))
+                add_dev_start(n_devices)
+            elif line[1:2] == b"\t":  # subsystem
+                tok = line.split(None, 2)
+                if len(tok) < 2:
+                    continue
+                sv, sd = int(tok[0], 16), int(tok[1], 16)
+                key = (sv << 16) | sd
+                if key < last_sub or sv > 0xFFFF or sd > 0xFFFF:
+                    raise _Unsorted  # also: no device yet, or IDs wider than 16 bits
+                last_sub = key
+                add_subven(sv)
+                add_subdev(sd)
+                name = tok[2] if len(tok) > 2 else b""
+                add_subsys_sid(intern(name.decode("utf-8", "replace").strip()))
+                n_subsys += 1
+            else:  # device
+                tok = line.split(None, 1)
+                if last_ven < 0 or not tok:
+                    raise _Unsorted
+                dev = int(tok[0], 16)
+                if dev < last_dev or dev > 0xFFFF:
+                    raise _Unsorted
+                last_dev, last_sub = dev, -1
+                add_device(dev)
+                name = tok[1] if len(tok) > 1 else b""
+                add_device_sid(intern(name.decode("utf-8", "replace").strip()))
+                add_sub_start(n_subsys)
+                n_devices += 1
+
+        # counts from consecutive starts
+        self.vendor_dev_count = _counts(self.vendor_dev_start, n_devices)
+        self.dev_sub_count = _counts(self.dev_sub_start, n_subsys)
+        return classes
+
+    def _load_vendor_tree(self, vendors: VendorDict, sp: _StringPool) -> None:
+        """Sort the dict parser's vendor tree into the arrays."""
+        for ven, (vname, devs) in vendors.items():
+            sp.intern(vname)
+            for did, dname, sublist in devs:
+                sp.intern(dname)
+                for sv, sd, sname in sublist:
+                    sp.intern(sname)
+
+        # Vendors/devices/subsystems → compact arrays
+        self._init_vendor_arrays()
+
         # Sorted vendors
         for ven_id in sorted(vendors.keys()):
             vname, devs = vendors[ven_id]
@@ -204,7 +399,14 @@ class PciDbText:
             self.vendor_dev_start.append(dev_start)
             self.vendor_dev_count.append(len(self.device_ids) - dev_start)
 
-        # Classes
+    def _load_classes(self, classes: ClassDict, sp: _StringPool) -> None:
+        for base, (bname, subs) in classes.items():
+            sp.intern(bname)
+            for sub, (sname, pifs) in subs.items():
+                sp.intern(sname)
+                for pi, piname in pifs.items():
+                    sp.intern(piname)
+
         self.class_base_sid = array("I", [0] * 256)
         for base, (bname, _) in classes.items():
             self.class_base_sid[base & 0xFF] = sp.intern(bname)
@@ -232,12 +434,6 @@ class PciDbText:
                 self.subclass_pi_start.append(start)
                 self.subclass_pi_count.append(count)
 
-        # Keep vendor_ids as a Python list for bisect speed (array works too, but list is fine)
-        self._vendor_ids_list = list(self.vendor_ids)
-        self._subclass_keys_list = list(self.subclass_keys)
-
-        self._sp = sp
-
     # ----- lookup helpers -----
     def _vendor_index(self, vendor_id: int) -> int:
         i = bisect.bisect_left(self._vendor_ids_list, vendor_id & 0xFFFF)
@@ -285,13 +481,6 @@ class PciDbText:
             return -1
         return lo
 
-    def _subclass_index(self, base: int, sub: int) -> int:
-        key = ((base & 0xFF) << 8) | (sub & 0xFF)
-        i = bisect.bisect_left(self._subclass_keys_list, key)
-        if i >= len(self._subclass_keys_list) or self._subclass_keys_list[i] != key:
-            return -1
-        return i
-
     # ----- public API -----
     def get_vendor_name(self, vendor_id: int) -> Optional[str]:
         i = self._vendor_index(vendor_id)
@@ -325,75 +514,495 @@ class PciDbText:
         sid = self.subsys_name_sid[si]
         return self._sp.get(sid)
 
+    # ----- batch lookups -----
+    def _resolve_one(
+        self, key: BatchKey
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        vendor_id, device_id, subvendor_id, subdevice_id = key
+        vi = self._vendor_index(vendor_id)
+        if vi < 0:
+            return None, None, None
+        vn = self._sp.get(self.vendor_name_sid[vi])
+        if device_id is None:
+            return vn, None, None
+        di = self._find_device_in_vendor(vi, device_id)
+        if di < 0:
+            return vn, None, None
+        dn = self._sp.get(self.device_name_sid[di])
+        if subvendor_id is None or subdevice_id is None:
+            return vn, dn, None
+        si = self._find_subsystem_in_device(di, subvendor_id, subdevice_id)
+        sn = self._sp.get(self.subsys_name_sid[si]) if si >= 0 else None
+        return vn, dn, sn
+
+    def get_vendor_names(self, vendor_ids: Iterable[int]) -> List[Optional[str]]:
+        return [self.get_vendor_name(v) for v in vendor_ids]
+
+    def get_device_names(
+        self, pairs: Iterable[Tuple[int, int]]
+    ) -> List[Optional[str]]:
+        return [self.get_device_name(v, d) for v, d in pairs]
+
+    def get_subsystem_names(
+        self, quads: Iterable[Tuple[int, int, int, int]]
+    ) -> List[Optional[str]]:
+        return [self.get_subsystem_name(v, d, sv, sd) for v, d, sv, sd in quads]
+
+    def resolve_many(
+        self, quads: Iterable[BatchKey]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        return [self._resolve_one(q) for q in quads]
+
+    def resolve(
+        self,
+        vendor_id: int,
+        device_id: int,
+        subvendor_id: Optional[int] = None,
+        subdevice_id: Optional[int] = None,
+        class24: Optional[int] = None,
+    ) -> DeviceNames:
+        """All names for one device, with one vendor and one device search."""
+        get = self._sp.get
+        vn = dn = sn = svn = None
+        vi = self._vendor_index(vendor_id)
+        if vi >= 0:
+            vn = get(self.vendor_name_sid[vi])
+            di = self._find_device_in_vendor(vi, device_id)
+            if di >= 0:
+                dn = get(self.device_name_sid[di])
+                if subvendor_id is not None and subdevice_id is not None:
+                    si = self._find_subsystem_in_device(di, subvendor_id, subdevice_id)
+                    sn = get(self.subsys_name_sid[si]) if si >= 0 else None
+        if subvendor_id is not None:
+            svn = vn if subvendor_id == vendor_id else self.get_vendor_name(subvendor_id)
+        bn = cn = pn = None
+        if class24 is not None:
+            table, bases = self._class_table
+            bn, cn, progs = table.get((class24 >> 8) & 0xFFFF) or bases[(class24 >> 16) & 0xFF]
+            pn = progs.get(class24 & 0xFF) if progs else None
+        return DeviceNames(
+            vendor_id,
+            device_id,
+            subvendor_id,
+            subdevice_id,
+            class24,
+            vendor=vn,
+            device=dn,
+            subvendor=svn,
+            subsystem=sn,
+            base_class=bn,
+            subclass=cn,
+            prog_if=pn,
+        )
+
+    @cached_property
+    def _class_table(self) -> Tuple[Dict[int, ClassEntry], List[ClassEntry]]:
+        """
+        (base << 8 | subclass) -> (base name, subclass name, {prog_if: name}),
+        plus one entry per base for unlisted subclasses; built on first use.
+        """
+        get = self._sp.get
+        bases: List[ClassEntry] = [
+            (get(sid) if sid != 0 else None, None, None) for sid in self.class_base_sid
+        ]
+        table: Dict[int, ClassEntry] = {}
+        for i, key in enumerate(self.subclass_keys):
+            start = self.subclass_pi_start[i]
+            end = start + self.subclass_pi_count[i]
+            progs = {
+                self.prog_if_vals[j]: get(self.prog_if_name_sid[j]) for j in range(start, end)
+            }
+            table[key] = (bases[key >> 8][0], get(self.subclass_name_sid[i]), progs or None)
+        return table, bases
+
     def get_class_name(
         self, base: int, subclass: Optional[int] = None, prog_if: Optional[int] = None
     ) -> Optional[str]:
         base &= 0xFF
+        table, bases = self._class_table
         if subclass is None:
-            sid = self.class_base_sid[base]
-            return None if sid == 0 else self._sp.get(sid)
-
-        sub = subclass & 0xFF
-        i = self._subclass_index(base, sub)
-        if i < 0:
-            # unknown subclass → fall back to base only
-            sid = self.class_base_sid[base]
-            return None if sid == 0 else self._sp.get(sid)
-
-        if prog_if is None:
-            return self._sp.get(self.subclass_name_sid[i])
-
-        start = self.subclass_pi_start[i]
-        count = self.subclass_pi_count[i]
-        lo, hi = start, start + count
-        piv = prog_if & 0xFF
-        # prog_if arrays are parallel
-        arr = self.prog_if_vals
-        while lo < hi:
-            mid = (lo + hi) // 2
-            if arr[mid] < piv:
-                lo = mid + 1
-            else:
-                hi = mid
-        if lo >= start + count or arr[lo] != piv:
-            # fall back to subclass name if specific prog-if not found
-            return self._sp.get(self.subclass_name_sid[i])
-        return self._sp.get(self.prog_if_name_sid[lo])
+            return bases[base][0]
+        bname, sname, progs = table.get((base << 8) | (subclass & 0xFF)) or bases[base]
+        if sname is None:
+            return bname  # unknown subclass → fall back to base only
+        if prog_if is not None and progs:
+            name = progs.get(prog_if & 0xFF)
+            if name is not None:
+                return name
+        return sname
 
     def get_class_name_from_code(
         self, class_code_24bit: int, depth: int = 3
     ) -> Optional[str]:
-        base = (class_code_24bit >> 16) & 0xFF
-        sub = (class_code_24bit >> 8) & 0xFF
-        pi = class_code_24bit & 0xFF
         depth = _clamp(depth, 0, 3)
-        if depth > 2:
-            name = self.get_class_name(base, sub, pi)
-            if name is not None:
-                return name
-        if depth > 1:
-            name = self.get_class_name(base, sub, None)
+        table, bases = self._class_table
+        bname, sname, progs = (
+            table.get((class_code_24bit >> 8) & 0xFFFF)
+            or bases[(class_code_24bit >> 16) & 0xFF]
+        )
+        if depth > 2 and progs:
+            name = progs.get(class_code_24bit & 0xFF)
             if name is not None:
                 return name
-        return self.get_class_name(base, None, None)
+        if depth > 1 and sname is not None:
+            return sname
+        return bname
 
     def describe_device_best_effort(
         self, vendor_id: int, device_id: int, class_code_24bit: Optional[int]
     ) -> str:
-        dn: Optional[str]
-        vn: Optional[str]
-        cn: Optional[str]
-
-        dn = self.get_device_name(vendor_id, device_id)
-        if dn:
-            vn = self.get_vendor_name(vendor_id) or f"0x{vendor_id:04x}"
-            return f"{vn} {dn}"
+        # None means "class unknown", as in PciDbBinary, not class 0x00
+        names = self.resolve(vendor_id, device_id, class24=class_code_24bit)
+        return names.describe()
+
+    # ----- streaming iteration, in table (ID) order -----
+    def iter_vendors(self) -> Iterator[Tuple[int, str]]:
+        """(vendor_id, name) for every vendor."""
+        get = self._sp.get
+        for vid, sid in zip(self.vendor_ids, self.vendor_name_sid):
+            yield vid, get(sid)
+
+    def iter_devices(self, vendor_id: int) -> Iterator[Tuple[int, str]]:
+        """(device_id, name) for every device of a vendor; nothing if unknown."""
+        vi = self._vendor_index(vendor_id)
+        if vi < 0:
+            return
+        get = self._sp.get
+        start = self.vendor_dev_start[vi]
+        for di in range(start, start + self.vendor_dev_count[vi]):
+            yield self.device_ids[di], get(self.device_name_sid[di])
+
+    def iter_subsystems(
+        self, vendor_id: int, device_id: int
+    ) -> Iterator[Tuple[int, int, str]]:
+        """(subvendor_id, subdevice_id, name) for every subsystem of a device."""
+        vi = self._vendor_index(vendor_id)
+        di = self._find_device_in_vendor(vi, device_id) if vi >= 0 else -1
+        if di < 0:
+            return
+        get = self._sp.get
+        start = self.dev_sub_start[di]
+        for si in range(start, start + self.dev_sub_count[di]):
+            yield self.subvendor_ids[si], self.subdevice_ids[si], get(
+                self.subsys_name_sid[si]
+            )
+
+    def iter_classes(self) -> Iterator[ClassRecord]:
+        """
+        Class lines in pci.ids order: each named base class, then its subclasses,
+        each followed by its programming interfaces.
+        """
+        return class_records(*self._class_table)
+
+    def _device_owner(self, di: int) -> int:
+        # the last vendor whose device range starts at or before the row
+        return bisect.bisect_right(self.vendor_dev_start, di) - 1
+
+    def _subsys_owner(self, si: int) -> int:
+        return bisect.bisect_right(self.dev_sub_start, si) - 1
+
+    # ----- reverse subsystem-vendor index -----
+    @cached_property
+    def _subvendor_index(self) -> Dict[int, "array[int]"]:
+        # subvendor -> ascending subsystem rows; built on first use
+        index: Dict[int, "array[int]"] = {}
+        for si, sv in enumerate(self.subvendor_ids):
+            rows = index.get(sv)
+            if rows is None:
+                rows = index[sv] = array("I")
+            rows.append(si)
+        return index
+
+    def iter_by_subvendor(
+        self, subvendor_id: int
+    ) -> Iterator[Tuple[int, int, int, int, str]]:
+        """
+        (vendor_id, device_id, subvendor_id, subdevice_id, name) for every
+        subsystem entry listed under `subvendor_id` (e.g. every Dell-branded
+        board), in table order. Costs one dict probe plus the size of the result.
+        """
+        get = self._sp.get
+        for si in self._subvendor_index.get(subvendor_id, ()):
+            di = self._subsys_owner(si)
+            vid = self.vendor_ids[self._device_owner(di)]
+            name = get(self.subsys_name_sid[si])
+            yield vid, self.device_ids[di], subvendor_id, self.subdevice_ids[si], name
+
+    # ----- name search -----
+    @cached_property
+    def _search_index(self) -> _search.SearchIndex:
+        # every vendor, device and subsystem name, tokenized once on first search
+        names = self._sp.vec
+
+        def entries() -> Iterable[Tuple[int, str]]:
+            for kind, sids in (
+                (_search.KIND_VENDOR, self.vendor_name_sid),
+                (_search.KIND_DEVICE, self.device_name_sid),
+                (_search.KIND_SUBSYSTEM, self.subsys_name_sid),
+            ):
+                for row, sid in enumerate(sids):
+                    yield _search.entry_code(kind, row), names[sid]
+
+        return _search.SearchIndex.build(entries())
+
+    def _search_hit(self, code: int) -> SearchHit:
+        kind, row = code >> _search.KIND_SHIFT, code & _search.ROW_MASK
+        if kind == _search.KIND_VENDOR:
+            name = self._sp.get(self.vendor_name_sid[row])
+            return SearchHit(self.vendor_ids[row], None, None, None, name)
+        di = self._subsys_owner(row) if kind == _search.KIND_SUBSYSTEM else row
+        vi = self._device_owner(di)
+        if kind == _search.KIND_DEVICE:
+            name = self._sp.get(self.device_name_sid[di])
+            return SearchHit(self.vendor_ids[vi], self.device_ids[di], None, None, name)
+        return SearchHit(
+            self.vendor_ids[vi],
+            self.device_ids[di],
+            self.subvendor_ids[row],
+            self.subdevice_ids[row],
+            self._sp.get(self.subsys_name_sid[row]),
+        )
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        limit: Optional[int] = _search.DEFAULT_LIMIT,
+    ) -> List[SearchHit]:
+        """
+        Vendors, devices and subsystems whose names contain every word of
+        `query` as a word prefix, case-insensitively ("geforce rtx" matches
+        "GeForce RTX 3080"). `kind` is "vendor", "device", "subsystem" or None
+        for all; hits come vendors first, then devices, then subsystems, each
+        in ID order. The index is built on the first call.
+        """
+        codes = _search.match(self._search_index, query, kind, limit)
+        return [self._search_hit(code) for code in codes]
+
+    def close(self) -> None:
+        # nothing to release
+        pass
+
+    # ----- pickling: ship the arrays and one joined string; rebuild the rest -----
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        for derived in (
+            "_sp",
+            "_vendor_ids_list",
+            "_class_table",
+            "_search_index",
+            "_subvendor_index",
+        ):
+            state.pop(derived, None)
+        # names come from single pci.ids lines, so "\n" never occurs inside one
+        state["_strings"] = "\n".join(self._sp.vec)
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        strings = state.pop("_strings")
+        self.__dict__.update(state)
+        sp = _StringPool()
+        sp.vec = strings.split("\n")
+        sp._id_of = {s: i for i, s in enumerate(sp.vec)}
+        self._sp = sp
+        self._vendor_ids_list = list(self.vendor_ids)
+
+
+class PciDbTextLazy:
+    """
+    pci.ids text parsed on demand. Opening reads the file and scans it once
+    for vendor lines and the start of the class section; a vendor's device
+    and subsystem lines are parsed on its first lookup, the class section on
+    the first class lookup. search() and iter_by_subvendor() need every row,
+    so their first call parses the whole file into a PciDbText.
+
+    Suits short-lived processes that name a few devices. Line breaks may be
+    LF, CRLF or CR; malformed IDs surface as ValueError from the lookup that
+    reaches them rather than from the constructor.
+    """
+
+    def __init__(self, pci_ids_path: str):
+        with open(pci_ids_path, "rb") as f:
+            self._scan(f.read())
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "PciDbTextLazy":
+        self = cls.__new__(cls)
+        self._scan(bytes(data))
+        return self
+
+    def _scan(self, data: bytes) -> None:
+        if b"\n" not in data:
+            data = data.replace(b"\r", b"\n")  # CR-only (old Mac) line breaks
+        first = _SCAN_FIRST.match(data)
+        lines = itertools.chain([first] if first else [], _SCAN_NEXT.finditer(data))
+        # vendor_id -> (name, block start, block end); a repeated vendor's last
+        # block wins, as in the dict parser
+        vendors: Dict[int, Tuple[str, int, int]] = {}
+        ven, name, start = -1, b"", 0
+        class_off = -1
+        for m in lines:
+            if ven >= 0:
+                vendors[ven] = (name.decode("utf-8", "replace").lstrip(), start, m.start())
+            if m[1] is None:
+                class_off = m.start()
+                break
+            ven, name, start = int(m[1], 16), m[2] or b"", m.end()
+        if not vendors or class_off < 0:
+            raise ValueError("Corrupt or empty text database")
+        self._data = data
+        self._vendors = vendors
+        self._class_off = class_off
+        self._devices: Dict[int, DeviceBlock] = {}
+
+    # ----- lookup helpers -----
+    def _vendor_devices(self, vendor_id: int) -> Optional[DeviceBlock]:
+        vid = vendor_id & 0xFFFF
+        devices = self._devices.get(vid)
+        if devices is None:
+            entry = self._vendors.get(vid)
+            if entry is None:
+                return None
+            _, start, end = entry
+            try:
+                devices = _parse_device_block(self._data[start:end])
+            except ValueError as e:
+                raise ValueError(f"Corrupt text database under vendor {vid:04x}") from e
+            # racing first lookups may both parse; either result is the same
+            self._devices[vid] = devices
+        return devices
+
+    def _device(self, vendor_id: int, device_id: int) -> Optional[Tuple[str, Dict[int, str]]]:
+        devices = self._vendor_devices(vendor_id)
+        return devices.get(device_id & 0xFFFF) if devices else None
+
+    # ----- public API -----
+    def get_vendor_name(self, vendor_id: int) -> Optional[str]:
+        entry = self._vendors.get(vendor_id & 0xFFFF)
+        return entry[0] if entry else None
+
+    def get_device_name(self, vendor_id: int, device_id: int) -> Optional[str]:
+        dev = self._device(vendor_id, device_id)
+        return dev[0] if dev else None
+
+    def get_subsystem_name(
+        self, vendor_id: int, device_id: int, subvendor_id: int, subdevice_id: int
+    ) -> Optional[str]:
+        dev = self._device(vendor_id, device_id)
+        if not dev:
+            return None
+        return dev[1].get(((subvendor_id & 0xFFFF) << 16) | (subdevice_id & 0xFFFF))
+
+    def _resolve_one(
+        self, key: BatchKey
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        vendor_id, device_id, subvendor_id, subdevice_id = key
         vn = self.get_vendor_name(vendor_id)
-        cn = self.get_class_name_from_code(class_code_24bit or 0, depth=2)
-        vendor_part = vn if vn else f"0x{vendor_id:04x}"
-        class_part = cn if cn else "PCI device"
-        return f"Unknown {vendor_part} {class_part} (0x{device_id:04x})"
+        if vn is None or device_id is None:
+            return vn, None, None
+        dev = self._device(vendor_id, device_id)
+        if not dev:
+            return vn, None, None
+        if subvendor_id is None or subdevice_id is None:
+            return vn, dev[0], None
+        sn = dev[1].get(((subvendor_id & 0xFFFF) << 16) | (subdevice_id & 0xFFFF))
+        return vn, dev[0], sn
+
+    def resolve(
+        self,
+        vendor_id: int,
+        device_id: int,
+        subvendor_id: Optional[int] = None,
+        subdevice_id: Optional[int] = None,
+        class24: Optional[int] = None,
+    ) -> DeviceNames:
+        """All names for one device, parsing its vendor's block if not yet done."""
+        vn, dn, sn = self._resolve_one((vendor_id, device_id, subvendor_id, subdevice_id))
+        svn = None
+        if subvendor_id is not None:
+            svn = vn if subvendor_id == vendor_id else self.get_vendor_name(subvendor_id)
+        bn = cn = pn = None
+        if class24 is not None:
+            table, bases = self._class_table
+            bn, cn, progs = table.get((class24 >> 8) & 0xFFFF) or bases[(class24 >> 16) & 0xFF]
+            pn = progs.get(class24 & 0xFF) if progs else None
+        return DeviceNames(
+            vendor_id,
+            device_id,
+            subvendor_id,
+            subdevice_id,
+            class24,
+            vendor=vn,
+            device=dn,
+            subvendor=svn,
+            subsystem=sn,
+            base_class=bn,
+            subclass=cn,
+            prog_if=pn,
+        )
+
+    @cached_property
+    def _class_table(self) -> Tuple[Dict[int, ClassEntry], List[ClassEntry]]:
+        lines = self._data[self._class_off :].splitlines()
+        classes = _parse_class_lines(raw.decode("utf-8", "replace") for raw in lines)
+        return _class_table_from_dict(classes)
+
+    # The rest only goes through the lookups above and _class_table
+    get_vendor_names = PciDbText.get_vendor_names
+    get_device_names = PciDbText.get_device_names
+    get_subsystem_names = PciDbText.get_subsystem_names
+    resolve_many = PciDbText.resolve_many
+    get_class_name = PciDbText.get_class_name
+    get_class_name_from_code = PciDbText.get_class_name_from_code
+    describe_device_best_effort = PciDbText.describe_device_best_effort
+    iter_classes = PciDbText.iter_classes
+
+    # ----- streaming iteration, in ID order -----
+    def iter_vendors(self) -> Iterator[Tuple[int, str]]:
+        """(vendor_id, name) for every vendor; parses no device blocks."""
+        vendors = self._vendors
+        for vid in sorted(vendors):
+            yield vid, vendors[vid][0]
+
+    def iter_devices(self, vendor_id: int) -> Iterator[Tuple[int, str]]:
+        """(device_id, name) for every device of a vendor; nothing if unknown."""
+        devices = self._vendor_devices(vendor_id)
+        for did in sorted(devices or ()):
+            yield did, devices[did][0]  # type: ignore[index]
+
+    def iter_subsystems(
+        self, vendor_id: int, device_id: int
+    ) -> Iterator[Tuple[int, int, str]]:
+        """(subvendor_id, subdevice_id, name) for every subsystem of a device."""
+        dev = self._device(vendor_id, device_id)
+        subs = dev[1] if dev else {}
+        for key in sorted(subs):
+            yield key >> 16, key & 0xFFFF, subs[key]
+
+    # ----- whole-table queries: parse everything once -----
+    @cached_property
+    def _full(self) -> PciDbText:
+        return PciDbText.from_bytes(self._data)
+
+    def iter_by_subvendor(
+        self, subvendor_id: int
+    ) -> Iterator[Tuple[int, int, int, int, str]]:
+        """PciDbText.iter_by_subvendor(); the first call parses the whole file."""
+        return self._full.iter_by_subvendor(subvendor_id)
+
+    def search(
+        self,
+        query: str,
+        kind: Optional[str] = None,
+        limit: Optional[int] = _search.DEFAULT_LIMIT,
+    ) -> List[SearchHit]:
+        """PciDbText.search(); the first call parses the whole file."""
+        return self._full.search(query, kind, limit)
 
     def close(self) -> None:
         # nothing to release
         pass
+
+    # ----- pickling: ship the text; blocks are parsed again on demand -----
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self).from_bytes, (self._data,))
@@ -0,0 +1,173 @@
+#!/usr/bin/python
+#
+# Python pciid library
+# Memoizing PciDb wrapper
+#
+# (c) 2025 Steven Noonan
+# Licensed under the MIT license
+#
+
+from __future__ import annotations
+from functools import lru_cache
+from typing import Any, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .search import DEFAULT_LIMIT
+from .types import BatchKey, ClassRecord, DeviceNames, PciDb, SearchHit
+
+DEFAULT_MAXSIZE = 4096
+
+
+class CachedDbInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int  # per memoized method
+    currsize: int
+
+
+class CachedDb:
+    """
+    PciDb wrapper that memoizes names, resolve() records and best-effort
+    descriptions in bounded LRU caches (one per method, `maxsize` entries
+    each). There are eight of them, so memory is bounded by roughly
+    8 * `maxsize` entries, not `maxsize`. Meant for workloads where the same
+    few hundred devices repeat many times. Thread-safe; close() closes the
+    wrapped DB.
+    """
+
+    def __init__(self, db: PciDb, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.db = db
+        self.maxsize = maxsize
+        memo = lru_cache(maxsize=maxsize)
+        self._vendor_name = memo(db.get_vendor_name)
+        self._device_name = memo(db.get_device_name)
+        self._subsystem_name = memo(db.get_subsystem_name)
+        self._resolve = memo(db.resolve)
+        self._resolve_key = memo(self._resolve_one)
+        self._class_name = memo(db.get_class_name)
+        self._class_name_from_code = memo(db.get_class_name_from_code)
+        self._describe = memo(db.describe_device_best_effort)
+        self._memos = (
+            self._vendor_name,
+            self._device_name,
+            self._subsystem_name,
+            self._resolve,
+            self._resolve_key,
+            self._class_name,
+            self._class_name_from_code,
+            self._describe,
+        )
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (type(self), (self.db, self.maxsize))
+
+    def __repr__(self) -> str:
+        return f"CachedDb({self.db!r}, maxsize={self.maxsize})"
+
+    # ----- lookups -----
+    def get_vendor_name(self, vendor_id: int) -> Optional[str]:
+        return self._vendor_name(vendor_id)
+
+    def get_device_name(self, vendor_id: int, device_id: int) -> Optional[str]:
+        return self._device_name(vendor_id, device_id)
+
+    def get_subsystem_name(
+        self, vendor_id: int, device_id: int, subvendor_id: int, subdevice_id: int
+    ) -> Optional[str]:
+        return self._subsystem_name(vendor_id, device_id, subvendor_id, subdevice_id)
+
+    def resolve(
+        self,
+        vendor_id: int,
+        device_id: int,
+        subvendor_id: Optional[int] = None,
+        subdevice_id: Optional[int] = None,
+        class24: Optional[int] = None,
+    ) -> DeviceNames:
+        return self._resolve(vendor_id, device_id, subvendor_id, subdevice_id, class24)
+
+    def get_class_name(
+        self, base: int, subclass: Optional[int] = None, prog_if: Optional[int] = None
+    ) -> Optional[str]:
+        return self._class_name(base, subclass, prog_if)
+
+    def get_class_name_from_code(
+        self, class_code_24bit: int, depth: int = 3
+    ) -> Optional[str]:
+        return self._class_name_from_code(class_code_24bit, depth)
+
+    def describe_device_best_effort(
+        self, vendor_id: int, device_id: int, class_code_24bit: Optional[int]
+    ) -> str:
+        return self._describe(vendor_id, device_id, class_code_24bit)
+
+    # ----- batch lookups: memoized one key at a time -----
+    def _resolve_one(
+        self, key: BatchKey
+    ) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+        return self.db.resolve_many([key])[0]
+
+    def get_vendor_names(self, vendor_ids: Iterable[int]) -> List[Optional[str]]:
+        get = self._vendor_name
+        return [get(v) for v in vendor_ids]
+
+    def get_device_names(
+        self, pairs: Iterable[Tuple[int, int]]
+    ) -> List[Optional[str]]:
+        get = self._device_name
+        return [get(v, d) for v, d in pairs]
+
+    def get_subsystem_names(
+        self, quads: Iterable[Tuple[int, int, int, int]]
+    ) -> List[Optional[str]]:
+        get = self._subsystem_name
+        return [get(v, d, sv, sd) for v, d, sv, sd in quads]
+
+    def resolve_many(
+        self, quads: Iterable[BatchKey]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]:
+        get = self._resolve_key
+        return [get(tuple(q)) for q in quads]
+
+    # ----- iteration and search: passed through -----
+    def iter_vendors(self) -> Iterator[Tuple[int, str]]:
+        return self.db.iter_vendors()
+
+    def iter_devices(self, vendor_id: int) -> Iterator[Tuple[int, str]]:
+        return self.db.iter_devices(vendor_id)
+
+    def iter_subsystems(
+        self, vendor_id: int, device_id: int
+    ) -> Iterator[Tuple[int, int, str]]:
+        return self.db.iter_subsystems(vendor_id, device_id)
+
+    def iter_classes(self) -> Iterator[ClassRecord]:
+        return self.db.iter_classes()
+
+    def iter_by_subvendor(
+        self, subvendor_id: int
+    ) -> Iterator[Tuple[int, int, int, int, str]]:
+        return self.db.iter_by_subvendor(subvendor_id)
+
+    def search(
+        self, query: str, kind: Optional[str] = None, limit: Optional[int] = DEFAULT_LIMIT
+    ) -> List[SearchHit]:
+        return self.db.search(query, kind, limit)  # not memoized: already indexed
+
+    # ----- cache control -----
+    def cache_info(self) -> CachedDbInfo:
+        """Hits, misses and entries summed over every memoized method."""
+        infos = [fn.cache_info() for fn in self._memos]
+        return CachedDbInfo(
+            sum(i.hits for i in infos),
+            sum(i.misses for i in infos),
+            self.maxsize,
+            sum(i.currsize for i in infos),
+        )
+
+    def cache_clear(self) -> None:
+        for fn in self._memos:
+            fn.cache_clear()
+
+    def close(self) -> None:
+        self.cache_clear()
+        self.db.close()
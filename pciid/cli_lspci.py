@@ -17,17 +17,11 @@ class ProgramArgs:
 def format_line(
     pci: pciid.PciDb, sbdf: pciid.PciAddress, class16: int, ven: int, dev: int, rev: int
 ) -> str:
-    base = (class16 >> 8) & 0xFF
-    sub = (class16 >> 0) & 0xFF
-
-    cname = (
-        pci.get_class_name(base, sub, None)
-        or pci.get_class_name(base, None, None)
-        or f"Class {class16:04x}"
-    )
-
-    vname = pci.get_vendor_name(ven)
-    dname = pci.get_device_name(ven, dev)
+    # class16 carries base and subclass only; prog-if 0 is looked up and ignored
+    names = pci.resolve(ven, dev, class24=class16 << 8)
+    cname = names.class_name or f"Class {class16:04x}"
+    vname = names.vendor
+    dname = names.device
 
     if vname and dname:
         rdesc = f"{vname} {dname}"
@@ -0,0 +1,771 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Python pciid library
+# pci.ids text -> pci.ids.bin converter
+#
+# Stdlib only and free of package-relative imports: hatch_build.py loads this
+# file by path, and backends/textcache.py imports it to compile text DBs on first use.
+# CLI: python -m pciid.convert (or scripts/pciids_text_to_bin.py)
+#
+import sys, struct, zlib, argparse, re
+from dataclasses import dataclass
+from typing import BinaryIO, Dict, List, Optional, Sequence, Set, Tuple
+from collections import defaultdict
+
+Subvendor = Tuple[int, int, str]
+Device = Tuple[int, str, List[Subvendor]]
+VendorDict = Dict[int, Tuple[str, List[Device]]]
+ClassDict = Dict[int, Tuple[str, Dict[int, Tuple[str, Dict[int, str]]]]]
+
+MAGIC = 0x42494350  # 'PCIB'
+# v2: dense vendor slot table, which v1 readers ignore. Readers that predate a
+# header flag misread files that set it, so every flagged layout is opt-in and
+# default output stays readable by v1 readers.
+VERSION = 2
+# Always written (128 KiB): vendor lookups become one read, and opening a v2
+# file builds no vendor list
+VENDOR_SLOTS = 0x10000
+
+# Header flags
+FLAG_COLUMNAR = 0x0001  # row sections written as aligned struct-of-arrays
+FLAG_PLAIN_STRINGS = 0x0002  # strings as offset table + UTF-8 arena (no blocks)
+FLAG_ZDICT = 0x0004  # string blocks compressed against a shared preset dictionary
+
+STRING_ORDERS = ("lex", "vendor")
+
+ZDICT_SIZE = 4 * 1024  # larger dictionaries barely shrink ~1 KiB blocks but slow inflate
+
+
+@dataclass
+class ProgramArgs:
+    input_path: str
+    output_path: str
+    no_compress: bool
+    columnar: bool = False
+    plain_strings: bool = False
+    zdict: bool = False
+    block_stride: int = 32
+    string_order: str = "lex"
+    profile: Optional[str] = None
+    bloom_bits: int = 0
+    search_index: bool = False
+    subvendor_index: bool = False
+
+
+# ------------ String pool (two-phase: collect -> finalize -> write) ------------
+class StringPool:
+    """
+    Dedup strings, assign IDs at finalize(), then emit block-front-coded blocks.
+    IDs are stable after finalize(); we DO NOT reorder after that.
+    """
+
+    def __init__(
+        self, block_stride: int = 32, compress_level: Optional[int] = 6
+    ) -> None:
+        self._seen: Set[str] = set()
+        self._strings: List[str] = []  # temporary (unique strings, insertion order)
+        self._final = False
+        self.block_stride = block_stride
+        self.compress_level = compress_level
+        self.id_of: Dict[str, int] = {}  # str -> id (after finalize)
+        self.vec: List[str] = []  # id -> str (after finalize)
+        self.zdict: Optional[bytes] = None  # zlib preset dictionary, if trained
+        self.hot_blocks = 0  # leading blocks stored uncompressed (after finalize)
+
+    def add(self, s: str) -> None:
+        if s not in self._seen:
+            self._seen.add(s)
+            self._strings.append(s)
+
+    def finalize(self, sort: str = "lex", hot: Sequence[str] = ()) -> None:
+        """
+        sort="lex": global lexicographic order (best prefix sharing / compression).
+        sort="vendor": keep add() order, which build() makes vendor-clustered so a
+        vendor's name, device names and their subsystem names share blocks.
+        hot: strings placed first, in the given order, in uncompressed blocks.
+        """
+        assert not self._final
+        hot_vec = list(dict.fromkeys(h for h in hot if h in self._seen))
+        hot_set = set(hot_vec)
+        rest = [s for s in self._strings if s not in hot_set]
+        if sort == "lex":
+            rest.sort()
+        self.vec = hot_vec + rest
+        self.hot_blocks = (len(hot_vec) + self.block_stride - 1) // self.block_stride
+        for i, s in enumerate(self.vec):
+            self.id_of[s] = i
+        self._final = True
+
+    def _emit_block(self, items: List[str], compress: bool = True) -> bytes:
+        # Block front-coding; first in block is full, others are prefix-delta vs block base
+        payload = bytes()
+        payload += struct.pack("<H", self.block_stride)
+        base = None
+        for i, s in enumerate(items):
+            if (i % self.block_stride) == 0 or base is None:
+                bs = s.encode("utf-8")
+                payload += struct.pack("<H", 1)  # kind=full
+                payload += struct.pack("<I", len(bs))
+                payload += bs
+                base = s
+            else:
+                # compute common prefix against block base
+                pref = 0
+                maxp = min(len(base), len(s))
+                while pref < maxp and base[pref] == s[pref]:
+                    pref += 1
+                suf = s[pref:].encode("utf-8")
+                payload += struct.pack("<H", 2)  # kind=delta
+                payload += struct.pack("<H", pref)
+                payload += struct.pack("<I", len(suf))
+                payload += suf
+        if self.compress_level is not None and compress:
+            if self.zdict:
+                c = zlib.compressobj(self.compress_level, zdict=self.zdict)
+                payload = c.compress(bytes(payload)) + c.flush()
+            else:
+                payload = zlib.compress(bytes(payload), self.compress_level)
+        return payload
+
+    def write(
+        self, f: BinaryIO, base_offset: int
+    ) -> Tuple[int, int, int, int, int, int]:
+        assert self._final
+        # Build blocks
+        block_offsets = []
+        blocks_buf = bytearray()
+        stride = self.block_stride
+        # Directory will be written first; we need its size to compute offsets → so we compute offsets
+        # assuming directory is: 4 (count) + 4*block_count + 4 (stride; absent in old files)
+        block_count = (len(self.vec) + stride - 1) // stride
+        dir_size = 4 + 4 * block_count + 4
+        dir_off = base_offset
+        blocks_off = dir_off + dir_size
+
+        # Emit blocks
+        off = blocks_off
+        for i in range(0, len(self.vec), stride):
+            block = self.vec[i : i + stride]
+            blob = self._emit_block(block, compress=(i // stride) >= self.hot_blocks)
+            block_offsets.append(off)
+            blocks_buf += blob
+            off += len(blob)
+
+        # Write directory then blocks
+        f.seek(dir_off)
+        f.write(struct.pack("<I", block_count))
+        for boff in block_offsets:
+            f.write(struct.pack("<I", boff))
+        f.write(struct.pack("<I", stride))
+        f.write(blocks_buf)
+
+        return (
+            dir_off,
+            dir_size,
+            blocks_off,
+            len(blocks_buf),
+            block_count,
+            stride,
+        )
+
+    def write_plain(
+        self, f: BinaryIO, base_offset: int
+    ) -> Tuple[int, int, int, int, int, int]:
+        """
+        Zero-copy layout: directory is u32 count + (count + 1) u32 offsets
+        relative to the arena; the arena is the concatenated UTF-8 strings.
+        """
+        assert self._final
+        encoded = [s.encode("utf-8") for s in self.vec]
+        offsets = [0]
+        for bs in encoded:
+            offsets.append(offsets[-1] + len(bs))
+        dir_off = base_offset
+        f.seek(dir_off)
+        f.write(struct.pack("<I", len(encoded)))
+        f.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        arena_off = f.tell()
+        f.write(b"".join(encoded))
+        return (
+            dir_off,
+            arena_off - dir_off,
+            arena_off,
+            offsets[-1],
+            0,
+            0,
+        )
+
+
+def train_zdict(strings: List[str], size: int = ZDICT_SIZE) -> bytes:
+    """
+    Pick the word n-grams (1-3 words) that save the most bytes across all strings.
+    zlib matches nearer the end of the dictionary more cheaply, so the best go last.
+    """
+    counts: Dict[str, int] = defaultdict(int)
+    for s in strings:
+        words = s.split()
+        grams = set()
+        for n in (1, 2, 3):
+            for i in range(len(words) - n + 1):
+                grams.add(" ".join(words[i : i + n]))
+        for g in grams:
+            counts[g] += 1
+    scored = sorted(
+        ((c * len(g), g) for g, c in counts.items() if c > 1 and len(g) > 3),
+        reverse=True,
+    )
+    picked: List[str] = []
+    total = 0
+    for _, g in scored:
+        glen = len(g.encode("utf-8")) + 1
+        if total + glen > size:
+            continue
+        picked.append(g)
+        total += glen
+    return " ".join(reversed(picked)).encode("utf-8")
+
+
+def parse_profile(path: str) -> List[Tuple[Tuple[int, ...], int]]:
+    """
+    Parse a lookup frequency profile: one `vvvv:dddd[:ssss:ssss] count` per line
+    (hex IDs, decimal count; blank lines and `#` comments ignored).
+    Returns [(ids, count)] sorted by descending count.
+    """
+    entries: List[Tuple[Tuple[int, ...], int]] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for lineno, raw in enumerate(f, 1):
+            line = raw.split("#", 1)[0].strip()
+            if not line:
+                continue
+            tok = line.split()
+            try:
+                ids = tuple(int(x, 16) for x in tok[0].split(":"))
+                count = int(tok[1]) if len(tok) > 1 else 1
+            except ValueError:
+                raise ValueError(
+                    f"{path}:{lineno}: bad hex ID or decimal count in {line!r}"
+                ) from None
+            if len(ids) not in (2, 4) or len(tok) > 2:
+                raise ValueError(f"{path}:{lineno}: expected vvvv:dddd[:ssss:ssss] count")
+            entries.append((ids, count))
+    entries.sort(key=lambda e: -e[1])
+    return entries
+
+
+def hot_strings(
+    vendors: VendorDict, profile: List[Tuple[Tuple[int, ...], int]]
+) -> List[str]:
+    """Names each profiled line needs, hottest first (vendor, device, subsys, subvendor)."""
+    out: List[str] = []
+    for ids, _ in profile:
+        ven = vendors.get(ids[0])
+        if ven is None:
+            continue
+        out.append(ven[0])
+        dev = next((d for d in ven[1] if d[0] == ids[1]), None)
+        if dev is None:
+            continue
+        out.append(dev[1])
+        if len(ids) == 4:
+            sub = next((x for x in dev[2] if (x[0], x[1]) == ids[2:]), None)
+            if sub is not None:
+                out.append(sub[2])
+            if ids[2] in vendors:
+                out.append(vendors[ids[2]][0])
+    return out
+
+
+# ------------ Subsystem Bloom filter (must match pciid.backends.bindb) ------------
+BLOOM_PROBES = 2
+_FIB64 = 0x9E3779B97F4A7C15
+_M64 = 0xFFFFFFFFFFFFFFFF
+
+
+def build_bloom(keys: List[Tuple[int, int, int, int]], bits_per_key: int) -> bytes:
+    """
+    Section: u32 log2(bits), u32 probes, bit array (bit i = byte i>>3, bit i&7).
+
+    One Fibonacci hash per key; probe 1 is the top log2(bits) bits of the product,
+    probe 2 the next log2(bits). Two probes keep the reader's check cheaper than
+    the columnar miss path it short-circuits.
+    """
+    if not keys or bits_per_key <= 0:
+        return b""
+    log2m = min(32, max(6, (len(keys) * bits_per_key - 1).bit_length()))
+    mask = (1 << log2m) - 1
+    bits = bytearray((1 << log2m) // 8)
+    for v, d, sv, sd in keys:
+        z = (((v << 48) | (d << 32) | (sv << 16) | sd) * _FIB64) & _M64
+        for pos in (z >> (64 - log2m), (z >> (64 - 2 * log2m)) & mask):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return struct.pack("<II", log2m, BLOOM_PROBES) + bytes(bits)
+
+
+# ------------ Name search index (must match pciid.search) ------------
+SEARCH_KIND_SHIFT = 30  # entry code = kind << 30 | row; 0 vendor, 1 device, 2 subsystem
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def build_search_index(entries: List[Tuple[int, str]]) -> bytes:
+    """
+    Inverted index over (entry code, name) pairs given in ascending code order.
+
+    Section: u32 token count, u32 posting count, u32 token arena offsets
+    [count + 1], u32 posting starts [count + 1], u32 postings (ascending codes
+    per token), then the sorted, case-folded UTF-8 tokens.
+    """
+    by_token: Dict[str, List[int]] = defaultdict(list)
+    for code, name in entries:
+        for tok in dict.fromkeys(_TOKEN_RE.findall(name.casefold())):
+            by_token[tok].append(code)
+    tokens = sorted(by_token)
+    arena = bytearray()
+    tok_offs = [0]
+    starts = [0]
+    postings: List[int] = []
+    for tok in tokens:
+        arena += tok.encode("utf-8")
+        tok_offs.append(len(arena))
+        postings.extend(by_token[tok])
+        starts.append(len(postings))
+    n = len(tokens) + 1
+    return (
+        struct.pack("<II", len(tokens), len(postings))
+        + struct.pack(f"<{n}I", *tok_offs)
+        + struct.pack(f"<{n}I", *starts)
+        + struct.pack(f"<{len(postings)}I", *postings)
+        + bytes(arena)
+    )
+
+
+# ------------ Robust pci.ids parser (vendors/devices/subsystems + classes) ------------
+def parse_pci_ids(path: str) -> Tuple[VendorDict, ClassDict]:
+    """
+    Returns:
+      vendors: dict[vendor_id] = (vendor_name: str, devices: list[(dev_id, dev_name, subs: list[(subven, subdev, name)])])
+      classes: dict[base] = (base_name: str, subclasses: dict[sub] = (sub_name: str, progifs: dict[pi] = name))
+    """
+    vendors: VendorDict = {}
+    classes: ClassDict = {}
+    in_classes = False
+
+    cur_vendor = None
+    cur_device = None
+    cur_base = None
+    cur_sub = None
+
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for raw in f:
+            line = raw.rstrip("\n")
+            if not line or line.startswith("#"):
+                continue
+
+            # Class section starts with lines like: "C 02  Network controller"
+            if line.startswith("C "):
+                in_classes = True
+                parts = line.split(None, 2)  # ['C', '02', 'Network controller']
+                if len(parts) >= 3 and len(parts[1]) <= 2:
+                    base = int(parts[1], 16)
+                    name = parts[2]
+                    classes[base] = (name, {})
+                    cur_base = base
+                    cur_sub = None
+                continue
+
+            if not in_classes:
+                # Vendors/devices/subsystems section
+                if line[0] != "\t":
+                    # Vendor line: "vvvv  Vendor Name"
+                    tok = line.split(None, 1)
+                    if len(tok[0]) == 4:
+                        ven = int(tok[0], 16)
+                        name = tok[1] if len(tok) > 1 else ""
+                        vendors[ven] = (name, [])
+                        cur_vendor, cur_device = ven, None
+                        continue
+
+                if line.startswith("\t") and not line.startswith("\t\t"):
+                    # Device line under current vendor: "\tdddd  Device Name"
+                    s = line.strip()
+                    tok = s.split(None, 1)
+                    dev = int(tok[0], 16)
+                    name = tok[1] if len(tok) > 1 else ""
+                    assert cur_vendor is not None
+                    vendors[cur_vendor][1].append((dev, name, []))
+                    cur_device = dev
+                    continue
+
+                if line.startswith("\t\t"):
+                    # Subsystem line under current device: "\t\tssss vvvv  Name" (subvendor, subdevice)
+                    s = line.strip()
+                    # It is "ssss vvvv  name" → two hex tokens, then the rest
+                    tok = s.split(None, 2)
+                    if len(tok) >= 2:
+                        subven = int(tok[0], 16)
+                        subdev = int(tok[1], 16)
+                        name = tok[2] if len(tok) > 2 else ""
+                        assert cur_vendor is not None
+                        vendors[cur_vendor][1][-1][2].append((subven, subdev, name))
+                    continue
+
+            else:
+                # Class/subclass/prog-if section
+                if line[0] != "\t":
+                    # Another base line without 'C ' (rare), handle defensively if present like "02  Network controller"
+                    tok = line.split(None, 1)
+                    if len(tok) >= 2 and len(tok[0]) <= 2:
+                        base = int(tok[0], 16)
+                        name = tok[1]
+                        classes[base] = (name, {})
+                        cur_base = base
+                        cur_sub = None
+                    continue
+
+                if line.startswith("\t") and not line.startswith("\t\t"):
+                    # Subclass: "\tss  Subclass Name"
+                    s = line.strip()
+                    tok = s.split(None, 1)
+                    sub = int(tok[0], 16)
+                    name = tok[1] if len(tok) > 1 else ""
+                    assert cur_base is not None
+                    classes[cur_base][1][sub] = (name, {})
+                    cur_sub = sub
+                    continue
+
+                if line.startswith("\t\t"):
+                    # Programming interface under current (base, sub): "\t\tpp  Prog-If Name"
+                    s = line.strip()
+                    tok = s.split(None, 1)
+                    pi = int(tok[0], 16)
+                    name = tok[1] if len(tok) > 1 else ""
+                    assert cur_base is not None
+                    assert cur_sub is not None
+                    classes[cur_base][1][cur_sub][1][pi] = name
+                    continue
+
+    return vendors, classes
+
+
+# ------------ Binary layout ------------
+HEADER_FMT = "<IHH" + "I" * 26  # magic,u16 ver,u16 flags + 26 u32s
+
+VendorRow = struct.Struct("<H I I I")  # vendor_id, vendor_name_id, dev_start, dev_count
+DeviceRow = struct.Struct("<H I I I")  # device_id, device_name_id, sub_start, sub_count
+SubsysRow = struct.Struct("<H H I")  # subvendor_id, subdevice_id, name_id
+SubclassRow = struct.Struct(
+    "<H I I I"
+)  # key=(base<<8|sub), subclass_name_id, start, count
+ProgIfRow = struct.Struct("<B I")  # prog_if, name_id
+
+# Columnar layout: u32 count, then each column little-endian, all 8-byte aligned
+COLUMN_ALIGN = 8
+
+
+def _pad(f: BinaryIO) -> None:
+    f.write(b"\x00" * (-f.tell() % COLUMN_ALIGN))
+
+
+def write_rows(
+    f: BinaryIO, rows: List[Tuple[int, ...]], row: struct.Struct, columnar: bool
+) -> Tuple[int, int]:
+    """Write one row section (row-of-structs or columnar); returns (off, len)."""
+    if not columnar:
+        off = f.tell()
+        f.write(b"".join(row.pack(*r) for r in rows))
+        return off, f.tell() - off
+    _pad(f)
+    off = f.tell()
+    f.write(struct.pack("<I", len(rows)))
+    _pad(f)
+    fmts = row.format.lstrip("<").replace(" ", "")
+    for i, fmt in enumerate(fmts):
+        f.write(struct.pack(f"<{len(rows)}{fmt}", *(r[i] for r in rows)))
+        _pad(f)
+    return off, f.tell() - off
+
+
+def build(args: ProgramArgs) -> None:
+    vendors, classes = parse_pci_ids(args.input_path)
+
+    # Collect all strings first (two-phase)
+    stride = args.block_stride
+    if not (1 <= stride <= 0xFFFF):
+        raise ValueError(f"block stride must be in 1..65535, got {stride}")
+    sp = StringPool(
+        block_stride=stride, compress_level=(None if args.no_compress else 6)
+    )
+
+    def add_all_strings() -> None:
+        # Row order (vendor, then each device followed by its subsystems), so the
+        # "vendor" string order clusters everything one lookup line needs.
+        for ven_id in sorted(vendors.keys()):
+            vname, devs = vendors[ven_id]
+            sp.add(vname)
+            for dev_id, dname, sublist in sorted(devs, key=lambda d: d[0]):
+                sp.add(dname)
+                for sv, sd, sname in sorted(sublist, key=lambda x: (x[0], x[1])):
+                    sp.add(sname)
+        for base, (bname, subs) in classes.items():
+            sp.add(bname)
+            for sub, (sname, pifs) in subs.items():
+                sp.add(sname)
+                for pi, piname in pifs.items():
+                    sp.add(piname)
+
+    add_all_strings()
+    # lexicographic improves prefix sharing; "vendor" improves lookup locality
+    string_order = args.string_order
+    if string_order not in STRING_ORDERS:
+        raise ValueError(f"unknown string order {string_order!r}")
+    profile_path = args.profile
+    hot = hot_strings(vendors, parse_profile(profile_path)) if profile_path else []
+    sp.finalize(sort=string_order, hot=hot)
+    use_zdict = args.zdict and not (args.no_compress or args.plain_strings)
+    if use_zdict:
+        sp.zdict = train_zdict(sp.vec)
+
+    # Flatten structures → pack with finalized string IDs
+    vendor_slots = [0] * VENDOR_SLOTS  # vendor_id -> row index + 1 (0 = absent)
+    vendor_rows: List[Tuple[int, ...]] = []
+    device_rows: List[Tuple[int, ...]] = []
+    subsys_rows: List[Tuple[int, ...]] = []
+    subsys_keys: List[Tuple[int, int, int, int]] = []
+    search_entries: List[Tuple[int, str]] = []
+
+    for ven_id in sorted(vendors.keys()):
+        vname, devs = vendors[ven_id]
+        devs.sort(key=lambda d: d[0])
+        dev_start = len(device_rows)
+        for dev_id, dname, sublist in devs:
+            sublist.sort(key=lambda x: (x[0], x[1]))
+            sub_start = len(subsys_rows)
+            for sv, sd, sname in sublist:
+                search_entries.append((2 << SEARCH_KIND_SHIFT | len(subsys_rows), sname))
+                subsys_rows.append((sv, sd, sp.id_of[sname]))
+                subsys_keys.append((ven_id, dev_id, sv, sd))
+            search_entries.append((1 << SEARCH_KIND_SHIFT | len(device_rows), dname))
+            device_rows.append(
+                (dev_id, sp.id_of[dname], sub_start, len(subsys_rows) - sub_start)
+            )
+        vendor_slots[ven_id] = len(vendor_rows) + 1
+        search_entries.append((len(vendor_rows), vname))
+        vendor_rows.append(
+            (ven_id, sp.id_of[vname], dev_start, len(device_rows) - dev_start)
+        )
+    assert len(vendor_rows) < VENDOR_SLOTS, "vendor slot table holds u16 indexes"
+
+    # Classes
+    class_base = [0] * 256  # dense base-class table
+    for base, (bname, _) in classes.items():
+        class_base[base] = sp.id_of[bname]
+
+    subclass_rows: List[Tuple[int, ...]] = []
+    prog_if_rows: List[Tuple[int, ...]] = []
+    for base in sorted(classes.keys()):
+        _, subs = classes[base]
+        for sub in sorted(subs.keys()):
+            sname, pifs = subs[sub]
+            start = len(prog_if_rows)
+            for pi in sorted(pifs.keys()):
+                prog_if_rows.append((pi, sp.id_of[pifs[pi]]))
+            count = len(prog_if_rows) - start
+            key = ((base & 0xFF) << 8) | (sub & 0xFF)
+            subclass_rows.append((key, sp.id_of[sname], start, count))
+
+    columnar = args.columnar
+    plain_strings = args.plain_strings
+    with open(args.output_path, "wb") as f:
+        # Header placeholder
+        f.write(b"\x00" * struct.calcsize(HEADER_FMT))
+
+        # Strings
+        str_dir_off = f.tell()
+        write_strings = sp.write_plain if plain_strings else sp.write
+        (str_dir_off, str_dir_len, str_blk_off, str_blk_len, block_count, stride) = (
+            write_strings(f, str_dir_off)
+        )
+
+        # Vendors/devices/subsystems
+        vendors_off, vendors_len = write_rows(f, vendor_rows, VendorRow, columnar)
+        devices_off, devices_len = write_rows(f, device_rows, DeviceRow, columnar)
+        subsys_off, subsys_len = write_rows(f, subsys_rows, SubsysRow, columnar)
+
+        # Classes
+        if columnar:
+            _pad(f)
+        class_base_off = f.tell()
+        f.write(struct.pack("<" + "I" * 256, *class_base))
+        class_base_len = f.tell() - class_base_off
+
+        subclass_off, subclass_len = write_rows(
+            f, subclass_rows, SubclassRow, columnar
+        )
+        prog_if_off, prog_if_len = write_rows(f, prog_if_rows, ProgIfRow, columnar)
+
+        # Vendor slot table (v2)
+        if columnar:
+            _pad(f)
+        vendor_slot_off = f.tell()
+        f.write(struct.pack("<" + "H" * VENDOR_SLOTS, *vendor_slots))
+        vendor_slot_len = f.tell() - vendor_slot_off
+
+        # Subsystem Bloom filter: fast negative get_subsystem_name
+        if columnar:
+            _pad(f)
+        subsys_bloom_off = f.tell()
+        f.write(build_bloom(subsys_keys, args.bloom_bits))
+        subsys_bloom_len = f.tell() - subsys_bloom_off
+
+        # Reverse subsystem-vendor index: u32 count, subsystem rows by (subvendor, row)
+        if columnar:
+            _pad(f)
+        subvendor_off = f.tell()
+        if args.subvendor_index:
+            by_subvendor = sorted(
+                range(len(subsys_rows)), key=lambda i: (subsys_rows[i][0], i)
+            )
+            n = len(by_subvendor)
+            f.write(struct.pack(f"<I{n}I", n, *by_subvendor))
+        subvendor_len = f.tell() - subvendor_off
+
+        # Optional name search index (db.search() builds one in memory without it)
+        if columnar:
+            _pad(f)
+        search_off = f.tell()
+        if args.search_index:
+            search_entries.sort()
+            f.write(build_search_index(search_entries))
+        search_len = f.tell() - search_off
+
+        # zlib preset dictionary for string blocks
+        zdict_off = f.tell()
+        f.write(sp.zdict or b"")
+        zdict_len = f.tell() - zdict_off
+
+        # Header
+        flags = (
+            (FLAG_COLUMNAR if columnar else 0)
+            | (FLAG_PLAIN_STRINGS if plain_strings else 0)
+            | (FLAG_ZDICT if sp.zdict else 0)
+        )
+        fields = [
+            str_dir_off,
+            str_dir_len,
+            str_blk_off,
+            str_blk_len,
+            vendors_off,
+            vendors_len,
+            devices_off,
+            devices_len,
+            subsys_off,
+            subsys_len,
+            class_base_off,
+            class_base_len,
+            subclass_off,
+            subclass_len,
+            prog_if_off,
+            prog_if_len,
+            zdict_off,
+            zdict_len,
+            vendor_slot_off,
+            vendor_slot_len,
+            subsys_bloom_off,
+            subsys_bloom_len,
+            search_off,
+            search_len,
+            subvendor_off,
+            subvendor_len,
+        ]
+        hdr = struct.pack("<IHH", MAGIC, VERSION, flags) + struct.pack(
+            "<" + "I" * len(fields), *fields
+        )
+        f.seek(0)
+        f.write(hdr)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument(
+        "-i", "--input", dest="input_path", help="pci.ids text path", required=True
+    )
+    ap.add_argument(
+        "-o",
+        "--output",
+        dest="output_path",
+        help="pci.ids binary output path",
+        required=True,
+    )
+    ap.add_argument(
+        "--no-compress",
+        dest="no_compress",
+        action="store_true",
+        help="disable zlib compression of string blocks",
+    )
+    ap.add_argument(
+        "--columnar",
+        dest="columnar",
+        action="store_true",
+        help="store row sections as aligned columns (zero-parse open, mmap views)",
+    )
+    ap.add_argument(
+        "--plain-strings",
+        dest="plain_strings",
+        action="store_true",
+        help="store strings uncompressed as offset table + UTF-8 arena (fastest, larger)",
+    )
+    ap.add_argument(
+        "--zdict",
+        dest="zdict",
+        action="store_true",
+        help="compress string blocks against a shared zlib preset dictionary "
+        "(~27%% smaller strings; needs a reader that knows the flag)",
+    )
+    ap.add_argument(
+        "--string-order",
+        dest="string_order",
+        choices=STRING_ORDERS,
+        default="lex",
+        help="string layout: lex (smallest file) or vendor (fewest blocks per lookup)",
+    )
+    ap.add_argument(
+        "--profile",
+        dest="profile",
+        default=None,
+        help="lookup frequency profile (vvvv:dddd[:ssss:ssss] count per line); "
+        "its names go first, in uncompressed hot blocks",
+    )
+    ap.add_argument(
+        "--bloom-bits",
+        dest="bloom_bits",
+        type=int,
+        default=0,
+        help="subsystem Bloom filter bits per entry (default 0: no filter; 16 ≈ 1.5%% "
+        "false positives, 64 KiB, pays off when most lookups miss)",
+    )
+    ap.add_argument(
+        "--search-index",
+        dest="search_index",
+        action="store_true",
+        help="embed a name search index for db.search() (roughly doubles the file)",
+    )
+    ap.add_argument(
+        "--subvendor-index",
+        dest="subvendor_index",
+        action="store_true",
+        help="embed the subvendor -> subsystem rows index behind db.iter_by_subvendor() "
+        "(4 bytes per subsystem; without it the first call builds one in memory)",
+    )
+    ap.add_argument(
+        "--block-stride",
+        dest="block_stride",
+        type=int,
+        default=32,
+        help="strings per front-coded block (smaller: faster lookups, larger file)",
+    )
+    args = ProgramArgs(**vars(ap.parse_args()))
+    build(args)
+
+
+if __name__ == "__main__":
+    main()
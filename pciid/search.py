@@ -0,0 +1,153 @@
+#!/usr/bin/python
+#
+# Python pciid library
+# Name search: tokenizer and inverted indexes shared by both backends
+#
+# (c) 2025 Steven Noonan
+# Licensed under the MIT license
+#
+
+from __future__ import annotations
+import bisect, re, struct
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+# Index entries are u32 codes: kind in the top two bits, table row below. Sorting
+# codes therefore orders hits vendors → devices → subsystems, each in ID order.
+KIND_VENDOR = 0
+KIND_DEVICE = 1
+KIND_SUBSYSTEM = 2
+KINDS = {"vendor": KIND_VENDOR, "device": KIND_DEVICE, "subsystem": KIND_SUBSYSTEM}
+KIND_SHIFT = 30
+ROW_MASK = (1 << KIND_SHIFT) - 1
+
+DEFAULT_LIMIT = 100
+
+# Word tokens, case-folded; pciid/convert.py must tokenize the same way
+_TOKEN_RE = re.compile(r"\w+")
+
+# Packed index section: u32 token count, u32 posting count, then u32 token arena
+# offsets [count + 1], u32 posting starts [count + 1], u32 postings, UTF-8 arena.
+SearchHdr = struct.Struct("<II")
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.casefold())
+
+
+def entry_code(kind: int, row: int) -> int:
+    return (kind << KIND_SHIFT) | row
+
+
+class SearchIndex:
+    """
+    In-memory inverted index: sorted tokens and, per token, the ascending codes
+    of every entry whose name contains it. Built lazily by backends that have
+    no packed index section.
+    """
+
+    def __init__(self, tokens: List[str], postings: List[Sequence[int]]) -> None:
+        self.tokens = tokens
+        self._postings = postings
+
+    @classmethod
+    def build(cls, entries: Iterable[Tuple[int, str]]) -> "SearchIndex":
+        """`entries` are (code, name) pairs in ascending code order."""
+        by_token: Dict[str, List[int]] = {}
+        seen: Dict[str, List[str]] = {}  # names repeat a lot across subsystems
+        for code, name in entries:
+            toks = seen.get(name)
+            if toks is None:
+                toks = seen[name] = list(dict.fromkeys(tokenize(name)))
+            for tok in toks:
+                codes = by_token.get(tok)
+                if codes is None:
+                    by_token[tok] = [code]
+                else:
+                    codes.append(code)
+        tokens = sorted(by_token)
+        return cls(tokens, [by_token[t] for t in tokens])
+
+    def token_range(self, prefix: str) -> Tuple[int, int]:
+        lo = bisect.bisect_left(self.tokens, prefix)
+        hi = bisect.bisect_left(self.tokens, prefix + "\U0010ffff", lo)
+        return lo, hi
+
+    def postings(self, i: int) -> Sequence[int]:
+        return self._postings[i]
+
+
+class PackedSearchIndex:
+    """SearchIndex over a packed section (zero-copy views into the mapping)."""
+
+    def __init__(
+        self,
+        token_offsets: Sequence[int],
+        arena: memoryview,
+        posting_starts: Sequence[int],
+        postings: Sequence[int],
+    ) -> None:
+        self._token_offsets = token_offsets
+        self._arena = arena
+        self._posting_starts = posting_starts
+        self._postings = postings
+        self._count = len(token_offsets) - 1
+
+    def _token(self, i: int) -> bytes:
+        offs = self._token_offsets
+        return bytes(self._arena[offs[i] : offs[i + 1]])
+
+    def _lower_bound(self, key: bytes, lo: int) -> int:
+        hi = self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._token(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def token_range(self, prefix: str) -> Tuple[int, int]:
+        # UTF-8 byte order is code point order, and 0xff never occurs in UTF-8
+        key = prefix.encode("utf-8")
+        lo = self._lower_bound(key, 0)
+        return lo, self._lower_bound(key + b"\xff", lo)
+
+    def postings(self, i: int) -> Sequence[int]:
+        starts = self._posting_starts
+        return self._postings[starts[i] : starts[i + 1]]
+
+
+def match(
+    index: "SearchIndex | PackedSearchIndex",
+    query: str,
+    kind: Optional[str] = None,
+    limit: Optional[int] = DEFAULT_LIMIT,
+) -> List[int]:
+    """
+    Codes of entries whose names contain every query word as a word prefix
+    (case-insensitive), in ascending code order, at most `limit` of them.
+    """
+    if kind is None:
+        lo_code, hi_code = 0, 1 << 32
+    elif kind in KINDS:
+        lo_code = KINDS[kind] << KIND_SHIFT
+        hi_code = lo_code + (1 << KIND_SHIFT)
+    else:
+        raise ValueError(f"unknown search kind {kind!r}")
+    words = sorted(set(tokenize(query)), key=len, reverse=True)
+    if not words or limit == 0:
+        return []
+    found: Optional[Set[int]] = None
+    for word in words:  # longest (most selective) first
+        hits: Set[int] = set()
+        lo, hi = index.token_range(word)
+        for i in range(lo, hi):
+            codes = index.postings(i)
+            a = bisect.bisect_left(codes, lo_code)
+            b = bisect.bisect_left(codes, hi_code, a)
+            hits.update(codes[a:b])
+        found = hits if found is None else found & hits
+        if not found:
+            return []
+    assert found is not None
+    return sorted(found)[:limit]
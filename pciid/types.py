@@ -1,6 +1,104 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Protocol, Optional, runtime_checkable
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Protocol,
+    Optional,
+    Tuple,
+    runtime_checkable,
+)
+
+# (vendor_id, device_id, subvendor_id, subdevice_id) for batch lookups; trailing
+# IDs may be None to stop resolution at the vendor or device level.
+BatchKey = Tuple[int, Optional[int], Optional[int], Optional[int]]
+
+# Decoded class-table entry: (base class name, subclass name, {prog_if: name}).
+# Backends key these by (base << 8 | subclass) for one-probe class lookups.
+ClassEntry = Tuple[Optional[str], Optional[str], Optional[Dict[int, str]]]
+
+# iter_classes() record: (base, subclass, prog_if, name). subclass and prog_if are
+# None on base class lines, prog_if is None on subclass lines.
+ClassRecord = Tuple[int, Optional[int], Optional[int], str]
+
+
+def class_records(
+    table: Dict[int, ClassEntry], bases: List[ClassEntry]
+) -> Iterator[ClassRecord]:
+    """A backend's decoded class table (see ClassEntry) as iter_classes() records."""
+    by_base: Dict[int, List[int]] = {}
+    for key in sorted(table):
+        by_base.setdefault(key >> 8, []).append(key)
+    for base in range(256):
+        bname = bases[base][0]
+        if bname is not None:
+            yield base, None, None, bname
+        for key in by_base.get(base, ()):
+            _, sname, progs = table[key]
+            yield base, key & 0xFF, None, sname or ""
+            for pi, piname in (progs or {}).items():
+                yield base, key & 0xFF, pi, piname
+
+
+class SearchHit(NamedTuple):
+    """One PciDb.search() result; IDs below the matched level are None."""
+
+    vendor: int
+    device: Optional[int]
+    subvendor: Optional[int]
+    subdevice: Optional[int]
+    name: str
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceNames:
+    """
+    Everything PciDb.resolve() found for one device. Names are None when the ID
+    (or the level above it) isn't listed; `subvendor` is the subsystem vendor's
+    own vendor name.
+    """
+
+    vendor_id: int
+    device_id: int
+    subvendor_id: Optional[int] = None
+    subdevice_id: Optional[int] = None
+    class24: Optional[int] = None
+    vendor: Optional[str] = None
+    device: Optional[str] = None
+    subvendor: Optional[str] = None
+    subsystem: Optional[str] = None
+    base_class: Optional[str] = None
+    subclass: Optional[str] = None
+    prog_if: Optional[str] = None
+
+    @property
+    def vendor_known(self) -> bool:
+        return self.vendor is not None
+
+    @property
+    def device_known(self) -> bool:
+        return self.device is not None
+
+    @property
+    def subsystem_known(self) -> bool:
+        return self.subsystem is not None
+
+    @property
+    def class_name(self) -> Optional[str]:
+        """Subclass name, falling back to the base class (lspci's default depth)."""
+        return self.subclass if self.subclass is not None else self.base_class
+
+    def describe(self) -> str:
+        """The describe_device_best_effort() line for this device."""
+        if self.device:
+            vn = self.vendor or f"0x{self.vendor_id:04x}"
+            return f"{vn} {self.device}"
+        vendor_part = self.vendor if self.vendor else f"0x{self.vendor_id:04x}"
+        class_part = self.class_name if self.class_name else "PCI device"
+        return f"Unknown {vendor_part} {class_part} (0x{self.device_id:04x})"
 
 
 @runtime_checkable
@@ -10,11 +108,43 @@ class PciDb(Protocol):
     def get_subsystem_name(
         self, vendor_id: int, device_id: int, subvendor_id: int, subdevice_id: int
     ) -> Optional[str]: ...
+    def get_vendor_names(self, vendor_ids: Iterable[int]) -> List[Optional[str]]: ...
+    def get_device_names(
+        self, pairs: Iterable[Tuple[int, int]]
+    ) -> List[Optional[str]]: ...
+    def get_subsystem_names(
+        self, quads: Iterable[Tuple[int, int, int, int]]
+    ) -> List[Optional[str]]: ...
+    def resolve_many(
+        self, quads: Iterable[BatchKey]
+    ) -> List[Tuple[Optional[str], Optional[str], Optional[str]]]: ...
+    def resolve(
+        self,
+        vendor_id: int,
+        device_id: int,
+        subvendor_id: Optional[int] = None,
+        subdevice_id: Optional[int] = None,
+        class24: Optional[int] = None,
+    ) -> DeviceNames: ...
     def get_class_name(
         self, base: int, subclass: Optional[int] = None, prog_if: Optional[int] = None
     ) -> Optional[str]: ...
-    def get_class_name_from_code(self, class_code_24bit: int) -> Optional[str]: ...
+    def get_class_name_from_code(
+        self, class_code_24bit: int, depth: int = 3
+    ) -> Optional[str]: ...
     def describe_device_best_effort(
         self, vendor_id: int, device_id: int, class_code_24bit: Optional[int]
     ) -> str: ...
+    def iter_vendors(self) -> Iterator[Tuple[int, str]]: ...
+    def iter_devices(self, vendor_id: int) -> Iterator[Tuple[int, str]]: ...
+    def iter_subsystems(
+        self, vendor_id: int, device_id: int
+    ) -> Iterator[Tuple[int, int, str]]: ...
+    def iter_classes(self) -> Iterator[ClassRecord]: ...
+    def iter_by_subvendor(
+        self, subvendor_id: int
+    ) -> Iterator[Tuple[int, int, int, int, str]]: ...
+    def search(
+        self, query: str, kind: Optional[str] = None, limit: Optional[int] = 100
+    ) -> List[SearchHit]: ...
     def close(self) -> None: ...
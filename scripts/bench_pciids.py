@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Micro-benchmarks for pci.ids.bin layout choices.
+
+Each subcommand builds the variants it compares from a text pci.ids into a
+temporary directory, then reports size and lookup cost side by side.
+
+  stride   file size vs lookup latency across string block strides
+  layout   blocks touched per full device line vs size, per string order
+  negative get_subsystem_name cost with/without the Bloom filter at a hit ratio
+  threads  lookup throughput from 1..N threads sharing one handle
+  cold     open + first lookups after evicting the file from the page cache
+  search   db.search() latency with/without the packed index vs a full name scan
+  textopen text DB open time and peak memory: dict parser, bytes fast path, lazy
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+import pciids_text_to_bin as conv
+from pciid.backends import textdb
+from pciid.backends.bindb import PciDbBinary
+from pciid.backends.textdb import PciDbText, PciDbTextLazy
+from pciid.search import tokenize
+from pciid.types import BatchKey
+
+DEFAULT_STRIDES = "8,16,32,64,128,256"
+
+
+def build_variant(input_path: str, out_dir: str, name: str, **opts: Any) -> str:
+    out = os.path.join(out_dir, name)
+    conv.build(
+        conv.ProgramArgs(input_path=input_path, output_path=out, no_compress=False, **opts)
+    )
+    return out
+
+
+def sample_devices(db: PciDbBinary, n: int, seed: int) -> List[Tuple[int, int]]:
+    """Pick n (vendor, device) pairs that exist in the DB."""
+    pairs = []
+    for vi in range(db._vendor_count):
+        ven_id, _, dev_start, dev_count = db._vendor_row_at(vi)
+        for di in range(dev_start, dev_start + dev_count):
+            pairs.append((ven_id, db._device_row_at(di)[0]))
+    rng = random.Random(seed)
+    return [rng.choice(pairs) for _ in range(n)]
+
+
+def sample_lines(db: PciDbBinary, n: int, seed: int) -> List[BatchKey]:
+    """Pick n full device lines: bare devices and device + subsystem entries."""
+    lines: List[BatchKey] = []
+    for vi in range(db._vendor_count):
+        ven_id, _, dev_start, dev_count = db._vendor_row_at(vi)
+        for di in range(dev_start, dev_start + dev_count):
+            dev_id, _, sub_start, sub_count = db._device_row_at(di)
+            lines.append((ven_id, dev_id, None, None))
+            for si in range(sub_start, sub_start + sub_count):
+                sv, sd, _ = db._subsys_row_at(si)
+                lines.append((ven_id, dev_id, sv, sd))
+    rng = random.Random(seed)
+    return [rng.choice(lines) for _ in range(n)]
+
+
+def time_per_call(fn: Callable[[], None], calls: int) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return (time.perf_counter() - t0) / calls * 1e6  # µs
+
+
+def lookup_all(db: PciDbBinary, pairs: Sequence[Tuple[int, int]]) -> None:
+    for v, d in pairs:
+        db.get_vendor_name(v)
+        db.get_device_name(v, d)
+
+
+def resolve_lines(db: PciDbBinary, lines: Sequence[BatchKey]) -> None:
+    # one line per call, so each call pays for exactly the blocks its line needs
+    for line in lines:
+        db.resolve_many([line])
+
+
+def bench_stride(args: argparse.Namespace) -> None:
+    strides = [int(s) for s in args.strides.split(",")]
+    print(
+        f"{'stride':>6} {'file KiB':>9} {'strings KiB':>11} {'blocks':>7} "
+        f"{'cold µs':>8} {'warm µs':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for stride in strides:
+            path = build_variant(
+                args.input, tmp, f"stride{stride}.bin", block_stride=stride
+            )
+            # cold: no block cache, so every lookup inflates + decodes its blocks
+            cold_db = PciDbBinary(path, cache_blocks=0)
+            pairs = sample_devices(cold_db, args.lookups, args.seed)
+            cold = time_per_call(
+                lambda db=cold_db, pairs=pairs: lookup_all(db, pairs), len(pairs)
+            )
+            # warm: unbounded cache, measured after one full pass
+            warm_db = PciDbBinary(path, cache_blocks=cold_db.block_count)
+            lookup_all(warm_db, pairs)
+            warm = time_per_call(
+                lambda db=warm_db, pairs=pairs: lookup_all(db, pairs), len(pairs)
+            )
+            print(
+                f"{stride:>6} {os.path.getsize(path) / 1024:>9.1f} "
+                f"{cold_db.str_blk_len / 1024:>11.1f} {cold_db.block_count:>7} "
+                f"{cold:>8.2f} {warm:>8.2f}"
+            )
+            cold_db.close()
+            warm_db.close()
+
+
+def bench_layout(args: argparse.Namespace) -> None:
+    print(
+        f"{'order':>7} {'file KiB':>9} {'strings KiB':>11} "
+        f"{'blocks/line':>11} {'cold µs':>8}"
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for order in conv.STRING_ORDERS:
+            path = build_variant(args.input, tmp, f"{order}.bin", string_order=order)
+            db = PciDbBinary(path, cache_blocks=0)
+            lines = sample_lines(db, args.lookups, args.seed)
+            # distinct string blocks each line needs (vendor, device, subsystem)
+            touched = 0
+            for sids in db._batch_sids(lines):
+                touched += len({sid // db.block_stride for sid in sids if sid >= 0})
+            cold = time_per_call(
+                lambda db=db, lines=lines: resolve_lines(db, lines), len(lines)
+            )
+            print(
+                f"{order:>7} {os.path.getsize(path) / 1024:>9.1f} "
+                f"{db.str_blk_len / 1024:>11.1f} {touched / len(lines):>11.2f} "
+                f"{cold:>8.2f}"
+            )
+            db.close()
+
+
+def subsystem_workload(
+    db: PciDbBinary, n: int, hit_ratio: float, seed: int
+) -> List[Tuple[int, int, int, int]]:
+    """Listed subsystems (hits) mixed with unlisted ones on known devices (misses)."""
+    rng = random.Random(seed)
+    hits = [q for q in sample_lines(db, n, seed) if q[2] is not None]
+    devices = sample_devices(db, n, seed)
+    out: List[Tuple[int, int, int, int]] = []
+    for _ in range(n):
+        if hits and rng.random() < hit_ratio:
+            v, d, sv, sd = rng.choice(hits)
+            assert sv is not None and sd is not None
+            out.append((v, d, sv, sd))
+        else:
+            v, d = rng.choice(devices)
+            out.append((v, d, rng.randrange(0x10000), rng.randrange(0x10000)))
+    return out
+
+
+def bench_negative(args: argparse.Namespace) -> None:
+    print(f"{'bloom':>9} {'file KiB':>9} {'hit %':>6} {'µs/lookup':>10} {'misses':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for bits in (0, args.bloom_bits):
+            path = build_variant(
+                args.input, tmp, f"bloom{bits}.bin", bloom_bits=bits, columnar=True
+            )
+            db = PciDbBinary(path)
+            quads = subsystem_workload(db, args.lookups, args.hit_ratio, args.seed)
+            misses = sum(db.get_subsystem_name(*q) is None for q in quads)  # warm-up
+            per = time_per_call(
+                lambda db=db, quads=quads: [db.get_subsystem_name(*q) for q in quads],
+                len(quads),
+            )
+            label = f"{bits} b/key" if bits else "off"
+            print(
+                f"{label:>9} {os.path.getsize(path) / 1024:>9.1f} "
+                f"{100 * (1 - misses / len(quads)):>6.1f} {per:>10.2f} {misses:>7}"
+            )
+            db.close()
+
+
+def bench_threads(args: argparse.Namespace) -> None:
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(
+        f"# {sys.implementation.name} {sys.version.split()[0]}, "
+        f"GIL {'on' if gil else 'off'}, {os.cpu_count()} CPUs"
+    )
+    if gil or (os.cpu_count() or 1) < 2:
+        print("# threads take turns here: this shows lock overhead, not scaling")
+    print(f"{'strings':>7} {'threads':>7} {'lookups/s':>11} {'speedup':>8}")
+    counts = [int(t) for t in args.threads.split(",")]
+    with tempfile.TemporaryDirectory() as tmp:
+        # blocks: lookups go through the locked block cache; plain: no lock at all
+        for label, opts in (("blocks", {}), ("plain", {"plain_strings": True})):
+            path = build_variant(args.input, tmp, f"{label}.bin", columnar=True, **opts)
+            db = PciDbBinary(path, cache_blocks=1 << 20)
+            pairs = sample_devices(db, args.lookups, args.seed)
+            lookup_all(db, pairs)  # warm the block cache once
+            base = 0.0
+            for n in counts:
+                # every thread runs the full workload against the one shared handle
+                start = threading.Barrier(n + 1)
+
+                def run(
+                    start: threading.Barrier = start,
+                    db: PciDbBinary = db,
+                    pairs: List[Tuple[int, int]] = pairs,
+                ) -> None:
+                    start.wait()
+                    lookup_all(db, pairs)
+
+                workers = [threading.Thread(target=run) for _ in range(n)]
+                for w in workers:
+                    w.start()
+                start.wait()
+                t0 = time.perf_counter()
+                for w in workers:
+                    w.join()
+                rate = n * len(pairs) / (time.perf_counter() - t0)
+                base = base or rate
+                print(f"{label:>7} {n:>7} {rate:>11.0f} {rate / base:>8.2f}")
+            db.close()
+
+
+def drop_page_cache(path: str) -> None:
+    """Evict a (clean, unmapped) file from the page cache."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+
+def bench_cold(args: argparse.Namespace) -> None:
+    if not hasattr(os, "posix_fadvise"):
+        raise SystemExit("cold benchmark needs posix_fadvise()")
+    # (label, access hint, prefetch sections, drop the page cache first)
+    variants: List[Tuple[str, Optional[str], Optional[List[str]], bool]] = [
+        ("warm", None, None, False),
+        ("default", None, None, True),
+        ("random", "random", None, True),
+        ("sequential", "sequential", None, True),
+        ("willneed", "willneed", None, True),
+        ("prefetch", "random", ["vendors", "devices", "subsystems"], True),
+    ]
+    print(f"# median of {args.rounds} rounds; page cache dropped before each but warm")
+    print(f"{'access':>10} {'open µs':>9} {'first µs':>9} {f'{args.first} lookups µs':>16}")
+    # the file lives next to the input: tmpfs ignores POSIX_FADV_DONTNEED
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(args.input))) as tmp:
+        path = build_variant(args.input, tmp, "cold.bin", columnar=True)
+        db = PciDbBinary(path)
+        pairs = sample_devices(db, args.first, args.seed)
+        db.close()
+        for label, access, sections, cold in variants:
+            opens, firsts, rests = [], [], []
+            for _ in range(args.rounds):
+                if cold:
+                    drop_page_cache(path)
+                t0 = time.perf_counter()
+                db = PciDbBinary(path, access=access)
+                if sections:
+                    db.prefetch(sections)
+                t1 = time.perf_counter()
+                lookup_all(db, pairs[:1])
+                t2 = time.perf_counter()
+                lookup_all(db, pairs[1:])
+                t3 = time.perf_counter()
+                db.close()
+                opens.append(t1 - t0)
+                firsts.append(t2 - t1)
+                rests.append(t3 - t1)
+            print(
+                f"{label:>10} {statistics.median(opens) * 1e6:>9.0f} "
+                f"{statistics.median(firsts) * 1e6:>9.0f} "
+                f"{statistics.median(rests) * 1e6:>16.0f}"
+            )
+
+
+def sample_queries(db: PciDbBinary, n: int, seed: int) -> List[str]:
+    """n queries of one or two word prefixes taken from device names."""
+    rng = random.Random(seed)
+    pairs = sample_devices(db, n, seed)
+    queries = []
+    for v, d in pairs:
+        words = tokenize(db.get_device_name(v, d) or "") or ["x"]
+        picked = rng.sample(words, min(len(words), rng.choice((1, 2))))
+        queries.append(" ".join(w[: max(3, len(w) - 1)] for w in picked))
+    return queries
+
+
+def scan_search(db: PciDbBinary, query: str) -> int:
+    """Baseline: decode every device name and test the words one by one."""
+    words = tokenize(query)
+    hits = 0
+    for di in range(db._device_count):
+        name_words = tokenize(db.get_string(db._device_row_at(di)[1]))
+        hits += all(any(t.startswith(w) for t in name_words) for w in words)
+    return hits
+
+
+def bench_search(args: argparse.Namespace) -> None:
+    print(f"{'index':>8} {'file KiB':>9} {'first ms':>9} {'ms/query':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, opts in (("packed", {"search_index": True}), ("lazy", {})):
+            path = build_variant(args.input, tmp, f"{label}.bin", columnar=True, **opts)
+            db = PciDbBinary(path, cache_blocks=1 << 20)
+            queries = sample_queries(db, args.queries, args.seed)
+            t0 = time.perf_counter()
+            db.search(queries[0], kind="device", limit=args.limit)  # lazy: builds
+            first = (time.perf_counter() - t0) * 1e3
+            per = time_per_call(
+                lambda db=db, queries=queries: [
+                    db.search(q, kind="device", limit=args.limit) for q in queries
+                ],
+                len(queries),
+            )
+            size = os.path.getsize(path) / 1024
+            print(f"{label:>8} {size:>9.1f} {first:>9.2f} {per / 1e3:>9.3f}")
+            if label == "lazy":
+                per = time_per_call(lambda db=db, q=queries[0]: scan_search(db, q), 1)
+                print(f"{'scan':>8} {size:>9.1f} {'':>9} {per / 1e3:>9.3f}")
+            db.close()
+
+
+def open_text_dicts(path: str) -> PciDbText:
+    """PciDbText built the old way: dict/list tree, then sorted into arrays."""
+    db = PciDbText.__new__(PciDbText)
+    sp = textdb._StringPool()
+    vendors, classes = textdb._parse_pci_ids(path)
+    db._load_vendor_tree(vendors, sp)
+    db._load_classes(classes, sp)
+    return db
+
+
+def bench_textopen(args: argparse.Namespace) -> None:
+    print(f"# {os.path.getsize(args.input) / 1024:.0f} KiB, median of {args.rounds} opens")
+    print(f"{'parser':>7} {'open ms':>8} {'peak MiB':>9}")
+    for label, opener in (
+        ("dicts", open_text_dicts),
+        ("bytes", PciDbText),
+        ("lazy", PciDbTextLazy),
+    ):
+        times = []
+        for _ in range(args.rounds):
+            t0 = time.perf_counter()
+            opener(args.input)
+            times.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        db = opener(args.input)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        del db
+        ms = statistics.median(times) * 1e3
+        print(f"{label:>7} {ms:>8.1f} {peak / 2**20:>9.1f}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Benchmark pci.ids.bin layout options")
+    ap.add_argument(
+        "-i", "--input", required=True, help="pci.ids text path to build variants from"
+    )
+    ap.add_argument(
+        "-n", "--lookups", type=int, default=20000, help="lookups per measurement"
+    )
+    ap.add_argument("--seed", type=int, default=0, help="workload RNG seed")
+    sub = ap.add_subparsers(dest="bench", required=True)
+
+    sp = sub.add_parser("stride", help="file size vs lookup latency per block stride")
+    sp.add_argument(
+        "--strides", default=DEFAULT_STRIDES, help="comma-separated block strides"
+    )
+    sp.set_defaults(func=bench_stride)
+
+    sp = sub.add_parser("layout", help="blocks touched per lookup vs size per order")
+    sp.set_defaults(func=bench_layout)
+
+    sp = sub.add_parser("negative", help="subsystem lookups with/without Bloom filter")
+    sp.add_argument(
+        "--hit-ratio", type=float, default=0.1, help="fraction of listed subsystems"
+    )
+    sp.add_argument("--bloom-bits", type=int, default=16, help="filter bits per entry")
+    sp.set_defaults(func=bench_negative)
+
+    sp = sub.add_parser("threads", help="lookup throughput across threads, one handle")
+    sp.add_argument(
+        "--threads", default="1,2,4,8", help="comma-separated thread counts"
+    )
+    sp.set_defaults(func=bench_threads)
+
+    sp = sub.add_parser("cold", help="cold-cache open/first lookups per access hint")
+    sp.add_argument("--first", type=int, default=200, help="lookups timed after open")
+    sp.add_argument("--rounds", type=int, default=9, help="repetitions per hint")
+    sp.set_defaults(func=bench_cold)
+
+    sp = sub.add_parser("search", help="name search with/without the packed index")
+    sp.add_argument("--queries", type=int, default=200, help="queries per variant")
+    sp.add_argument("--limit", type=int, default=100, help="search() hit limit")
+    sp.set_defaults(func=bench_search)
+
+    sp = sub.add_parser("textopen", help="text DB open time/peak memory per parser")
+    sp.add_argument("--rounds", type=int, default=5, help="timed opens per parser")
+    sp.set_defaults(func=bench_textopen)
+
+    args = ap.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
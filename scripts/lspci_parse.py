@@ -83,23 +83,6 @@ def parse_lspci_mm_line(line: str) -> Optional[Dict[str, Any]]:
     }
 
 
-def class_name(
-    pci: pciid.PciDb, class16: Optional[int], prog_if: Optional[int]
-) -> Optional[str]:
-    if class16 is None:
-        return None
-    base = (class16 >> 8) & 0xFF
-    sub = class16 & 0xFF
-    if prog_if is not None and False:
-        # DISABLED: results in output that's hard to read
-        return (
-            pci.get_class_name(base, sub, prog_if)
-            or pci.get_class_name(base, sub, None)
-            or pci.get_class_name(base, None, None)
-        )
-    return pci.get_class_name(base, sub, None) or pci.get_class_name(base, None, None)
-
-
 def make_modalias(row: Dict[str, Any]) -> str:
     """pci:v%08X d%08X sv%08X sd%08X bc%02X sc%02X i%02X (kernel format)"""
     ven = row.get("vendor") or 0
@@ -133,25 +116,22 @@ def describe_row(
         pi = prog_if if prog_if is not None else 0
         class_code_24 = (base << 16) | (sub << 8) | pi
 
-    # Names
-    vname = pci.get_vendor_name(ven) if ven is not None else None
-    dname = (
-        pci.get_device_name(ven, dev) if (ven is not None and dev is not None) else None
-    )
-    cname = class_name(pci, class16, prog_if)
+    # Names: one resolve() covers device, subsystem, subvendor and class
+    names = pci.resolve(ven or 0, dev or 0, subv, subd, class_code_24 or 0)
+    # Subclass depth only: prog-if names make the output hard to read
+    cname = names.class_name if class16 is not None else None
 
     # Device best-effort if unknown
-    if vname is None or dname is None:
-        best = pci.describe_device_best_effort(ven or 0, dev or 0, class_code_24 or 0)
-        dev_desc = best
+    if ven is None or dev is None or names.vendor is None or names.device is None:
+        dev_desc = names.describe()
     else:
-        dev_desc = f"{vname} {dname}"
+        dev_desc = f"{names.vendor} {names.device}"
 
     # Subsystem, if present
     subs_desc = None
     if subv is not None and subd is not None and ven is not None and dev is not None:
-        sname = pci.get_subsystem_name(ven, dev, subv, subd)
-        svname = pci.get_vendor_name(subv) or f"0x{subv:04x}"
+        sname = names.subsystem
+        svname = names.subvendor or f"0x{subv:04x}"
         if sname:
             subs_desc = f"{svname} {sname} [{subv:04x}:{subd:04x}]"
         else:
@@ -199,7 +179,8 @@ def main() -> None:
     )
     args = ap.parse_args()
 
-    pci = pciid.open_db(args.db)
+    # fleet dumps repeat the same few devices: memoize names and descriptions
+    pci = pciid.CachedDb(pciid.open_db(args.db))
     try:
         fh = (
             sys.stdin
@@ -7,70 +7,33 @@ Comments are not preserved; ordering matches the binary's sorted order.
 
 import sys
 import argparse
-import bisect
-from typing import TextIO, Tuple
+from typing import TextIO
 
-from pciid.backends.bindb import PciDbBinary, SubclassRow, ProgIfRow
+from pciid.backends.bindb import PciDbBinary
+from pciid.types import PciDb
 
 
-def dump_text(pci: PciDbBinary, out: TextIO) -> None:
+def dump_text(pci: PciDb, out: TextIO) -> None:
     w = out.write
 
     # --- Vendors / Devices / Subsystems ---
-    for vi in range(pci._vendor_count):
-        ven_id, ven_sid, dev_start, dev_count = pci._vendor_row_at(vi)
-        vname = pci.get_string(ven_sid)
+    for ven_id, vname in pci.iter_vendors():
         w(f"{ven_id:04x}  {vname}\n")
-        for di in range(dev_start, dev_start + dev_count):
-            dev_id, dev_sid, sub_start, sub_count = pci._device_row_at(di)
-            dname = pci.get_string(dev_sid)
+        for dev_id, dname in pci.iter_devices(ven_id):
             w(f"\t{dev_id:04x}  {dname}\n")
-            for si in range(sub_start, sub_start + sub_count):
-                sven, sdev, ssid = pci._subsys_row_at(si)
-                sname = pci.get_string(ssid)
+            for sven, sdev, sname in pci.iter_subsystems(ven_id, dev_id):
                 w(f"\t\t{sven:04x} {sdev:04x}  {sname}\n")
 
     w("\n")  # separator before classes
 
     # --- Classes / Subclasses / Prog-IF ---
-    # Print each base class that exists, then its subclasses and prog-if entries.
-    # subclass_keys are sorted by key=(base<<8)|sub; use range search per base.
-    subclass_keys = pci._subclass_keys
-
-    def get_subrow(idx: int) -> Tuple[int, int, int, int]:
-        return SubclassRow.unpack_from(
-            pci.mm, pci._subclass_off + idx * SubclassRow.size
-        )
-
-    for base in range(256):
-        # base class name (0 means absent)
-        sid = int.from_bytes(
-            pci.mm[
-                pci._class_base_off + base * 4 : pci._class_base_off + (base + 1) * 4
-            ],
-            "little",
-        )
-        if sid == 0:
-            continue
-        bname = pci.get_string(sid)
-        w(f"C {base:02x}  {bname}\n")
-
-        # subclasses for this base
-        lo = bisect.bisect_left(subclass_keys, (base << 8) | 0x00)
-        hi = bisect.bisect_left(subclass_keys, ((base + 1) << 8))
-        for i in range(lo, hi):
-            key, sname_id, pi_start, pi_count = get_subrow(i)
-            sub = key & 0xFF
-            sname = pci.get_string(sname_id)
-            w(f"\t{sub:02x}  {sname}\n")
-
-            # program interfaces for this (base, sub)
-            for j in range(pi_start, pi_start + pi_count):
-                pi, piname_id = ProgIfRow.unpack_from(
-                    pci.mm, pci._prog_if_off + j * ProgIfRow.size
-                )
-                piname = pci.get_string(piname_id)
-                w(f"\t\t{pi:02x}  {piname}\n")
+    for base, sub, pi, name in pci.iter_classes():
+        if sub is None:
+            w(f"C {base:02x}  {name}\n")
+        elif pi is None:
+            w(f"\t{sub:02x}  {name}\n")
+        else:
+            w(f"\t\t{pi:02x}  {name}\n")
 
 
 def main() -> None:
@@ -89,7 +52,11 @@ def main() -> None:
     )
     args = ap.parse_args()
 
-    pci = PciDbBinary(args.input)
+    # Not a streaming dump: rows come in ID order, but lex-ordered strings
+    # scatter each vendor's names over many blocks, so a full walk keeps
+    # returning to blocks. Keeping every decoded block (a few MiB for a full
+    # pci.ids) inflates each once instead of ~25 times.
+    pci = PciDbBinary(args.input, cache_blocks=1 << 20)
     try:
         out = (
             sys.stdout
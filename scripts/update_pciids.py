@@ -37,13 +37,11 @@ def main() -> None:
     # 1) copy text
     shutil.copy2(src, TEXT_OUT)
 
-    # 2) build binary using converter
-    #    Assumes scripts/pciids_text_to_bin.py exists and is importable/run-able.
-    conv = REPO_ROOT / "scripts" / "pciids_text_to_bin.py"
-    if not conv.is_file():
-        raise SystemExit("converter scripts/pciids_text_to_bin.py not found")
+    # 2) build binary using the in-package converter (pciid/convert.py)
     subprocess.run(
-        ["python", str(conv), "-i", str(TEXT_OUT), "-o", str(BIN_OUT)], check=True
+        ["python", "-m", "pciid.convert", "-i", str(TEXT_OUT), "-o", str(BIN_OUT)],
+        check=True,
+        cwd=REPO_ROOT,
     )
 
     # 3) write manifest
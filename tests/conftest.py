@@ -4,7 +4,6 @@ import os, stat
 from pathlib import Path
 from typing import Optional
 import importlib.util
-import types
 import pytest
 
 MINIMAL_PCI_IDS = """\
@@ -81,6 +80,15 @@ C 06  Bridge
 """
 
 
+@pytest.fixture(autouse=True)
+def cache_home(tmp_path_factory, monkeypatch) -> Path:
+    """Keep the compiled text cache out of the real ~/.cache."""
+    home = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(home))
+    monkeypatch.delenv("PCIID_NO_TEXT_CACHE", raising=False)
+    return home
+
+
 @pytest.fixture
 def pci_ids_text(tmp_path: Path) -> Path:
     p = tmp_path / "pci.ids"
@@ -104,7 +112,7 @@ def pci_ids_bin(tmp_path: Path, pci_ids_text: Path) -> Path:
     root = Path(__file__).resolve().parents[1]
     conv = _import_converter(root)
     out = tmp_path / "pci.ids.bin"
-    args = types.SimpleNamespace(
+    args = conv.ProgramArgs(
         input_path=str(pci_ids_text), output_path=str(out), no_compress=False
     )
     conv.build(args)
@@ -117,13 +125,45 @@ def pci_ids_bin_uncompressed(tmp_path: Path, pci_ids_text: Path) -> Path:
     root = Path(__file__).resolve().parents[1]
     conv = _import_converter(root)
     out = tmp_path / "pci.ids.bin"
-    args = types.SimpleNamespace(
+    args = conv.ProgramArgs(
         input_path=str(pci_ids_text), output_path=str(out), no_compress=True
     )
     conv.build(args)
     return out
 
 
+def _build_bin(tmp_path: Path, pci_ids_text: Path, name: str, **opts) -> Path:
+    conv = _import_converter(Path(__file__).resolve().parents[1])
+    out = tmp_path / name
+    args = conv.ProgramArgs(
+        input_path=str(pci_ids_text), output_path=str(out), no_compress=False, **opts
+    )
+    conv.build(args)
+    return out
+
+
+@pytest.fixture
+def build_bin(tmp_path: Path, pci_ids_text: Path):
+    """Factory: build_bin(name, **converter_opts) -> Path of a fresh binary DB."""
+
+    def _build(name: str, **opts) -> Path:
+        return _build_bin(tmp_path, pci_ids_text, name, **opts)
+
+    return _build
+
+
+@pytest.fixture
+def pci_ids_bin_columnar(tmp_path: Path, pci_ids_text: Path) -> Path:
+    return _build_bin(tmp_path, pci_ids_text, "pci.ids.columnar.bin", columnar=True)
+
+
+@pytest.fixture
+def pci_ids_bin_plain(tmp_path: Path, pci_ids_text: Path) -> Path:
+    return _build_bin(
+        tmp_path, pci_ids_text, "pci.ids.plain.bin", plain_strings=True, columnar=True
+    )
+
+
 def write_hex_file(p: Path, value: int) -> None:
     p.write_text(f"0x{value:04x}\n", encoding="ascii")
 
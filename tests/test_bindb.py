@@ -1,5 +1,8 @@
 # tests/test_bindb.py
 from __future__ import annotations
+import os
+import struct
+import pytest
 from pciid.api import PciDbText, PciDbBinary
 
 
@@ -101,3 +104,695 @@ def test_bin_vs_uncompressed_parity(pci_ids_bin, pci_ids_bin_uncompressed):
         0x030000, 2
     )
     db.close()
+
+
+def test_batch_lookups_match_single(pci_ids_text, pci_ids_bin):
+    dt = PciDbText(str(pci_ids_text))
+    db = PciDbBinary(str(pci_ids_bin))
+    quads = [
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+        (0x8086, 0x1237, 0x0000, 0x0000),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x1234, 0x1234, 0x1234, 0x1234),
+        (0x10DE, 0x0020, 0x1043, 0x0200),
+        (0x10DE, 0xFFFF, 0x1043, 0x0200),
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+    ]
+    pairs = [(v, d) for v, d, _, _ in quads]
+    vendors = [v for v, _, _, _ in quads]
+    for pci in (dt, db):
+        assert pci.get_vendor_names(vendors) == [pci.get_vendor_name(v) for v in vendors]
+        assert pci.get_device_names(pairs) == [pci.get_device_name(*p) for p in pairs]
+        assert pci.get_subsystem_names(quads) == [
+            pci.get_subsystem_name(*q) for q in quads
+        ]
+    assert db.resolve_many(quads) == dt.resolve_many(quads)
+    partial = [(0x10DE, None, None, None), (0x10DE, 0x1DB6, None, None)]
+    assert db.resolve_many(partial) == dt.resolve_many(partial)
+    assert db.resolve_many(partial)[1] == (
+        "NVIDIA Corporation",
+        "GV100GL [Tesla V100 PCIe 32GB]",
+        None,
+    )
+    assert db.resolve_many([]) == []
+    db.close()
+
+
+def test_v1_file_falls_back_to_bisect(pci_ids_bin, tmp_path):
+    # Downgrade a v2 file to v1 by clearing the version and vendor slot section.
+    raw = bytearray(pci_ids_bin.read_bytes())
+    struct.pack_into("<H", raw, 4, 1)
+    struct.pack_into("<II", raw, 8 + 18 * 4, 0, 0)
+    v1 = tmp_path / "v1.ids.bin"
+    v1.write_bytes(bytes(raw))
+
+    db2 = PciDbBinary(str(pci_ids_bin))
+    db1 = PciDbBinary(str(v1))
+    assert db2.version == 2 and db2._has_vendor_slots
+    assert db1.version == 1 and not db1._has_vendor_slots
+    for vid, did in [(0x8086, 0x1237), (0x10DE, 0x1DB6), (0xBEEF, 0xBABE), (0x1234, 0)]:
+        assert db1.get_vendor_name(vid) == db2.get_vendor_name(vid)
+        assert db1.get_device_name(vid, did) == db2.get_device_name(vid, did)
+    assert db2.get_vendor_name(-1) is None
+    assert db2.get_vendor_name(0x10000) is None
+    assert db1.vendor_ids == db2.vendor_ids == [0x10DE, 0x8086, 0xBEEF]
+    db1.close()
+    db2.close()
+
+
+def test_columnar_parity(pci_ids_bin, pci_ids_bin_columnar):
+    rows = PciDbBinary(str(pci_ids_bin))
+    cols = PciDbBinary(str(pci_ids_bin_columnar))
+    assert cols._columnar and not rows._columnar
+    assert list(cols.vendor_ids) == list(rows.vendor_ids)
+    assert cols._vendor_cols[0].format == "H"
+    for i in range(rows._vendor_count):
+        assert cols._vendor_row_at(i) == rows._vendor_row_at(i)
+    for i in range(rows._device_count):
+        assert cols._device_row_at(i) == rows._device_row_at(i)
+    for i in range(rows._subsys_count):
+        assert cols._subsys_row_at(i) == rows._subsys_row_at(i)
+    quads = [
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+        (0x10DE, 0x0020, 0x1092, 0x4811),
+        (0x10DE, 0x0020, 0x10B4, 0x273D),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x10DE, 0x1234, 0x1458, 0x1651),
+        (0x8086, 0x1237, 0x0000, 0x0000),
+    ]
+    assert cols.resolve_many(quads) == rows.resolve_many(quads)
+    for q in quads:
+        assert cols.get_subsystem_name(*q) == rows.get_subsystem_name(*q)
+    for code in (0x030000, 0x030001, 0x0C0330, 0x0C03BA, 0x020000, 0x1F0000):
+        assert cols.get_class_name_from_code(code) == rows.get_class_name_from_code(
+            code
+        )
+    rows.close()
+    cols.close()
+
+
+def test_block_cache_is_bounded_lru(pci_ids_bin, monkeypatch):
+    db = PciDbBinary(str(pci_ids_bin), cache_blocks=1)
+    assert db.block_count > 1
+    last = (db.block_count - 1) * db.block_stride
+    db.get_string(0)
+    db.get_string(1)
+    db.get_string(last)
+    info = db.cache_info()
+    assert (info.hits, info.misses, info.evictions) == (1, 2, 1)
+    assert info.blocks == 1 and info.max_blocks == 1
+    assert info.bytes > 0
+    assert db._load_block(db.block_count - 1)[0] == db.get_string(last)
+    db.cache_clear()
+    assert db.cache_info().blocks == 0 and db.cache_info().bytes == 0
+    db.close()
+
+    uncached = PciDbBinary(str(pci_ids_bin), cache_blocks=0)
+    assert uncached.get_string(0) == uncached.get_string(0)
+    assert uncached.cache_info().blocks == 0
+    assert uncached.cache_info().misses == 2
+    uncached.close()
+
+    monkeypatch.setenv("PCIID_CACHE_BLOCKS", "7")
+    assert PciDbBinary(str(pci_ids_bin)).cache_info().max_blocks == 7
+    monkeypatch.setenv("PCIID_CACHE_BLOCKS", "bogus")
+    assert PciDbBinary(str(pci_ids_bin)).cache_info().max_blocks == 512
+
+
+def test_plain_string_pool_parity(pci_ids_bin, pci_ids_bin_plain):
+    packed = PciDbBinary(str(pci_ids_bin))
+    plain = PciDbBinary(str(pci_ids_bin_plain))
+    assert plain._plain_strings and plain.block_count == 0
+    n = len(plain._string_offsets) - 1
+    assert [plain.get_string(i) for i in range(n)] == [
+        packed.get_string(i) for i in range(n)
+    ]
+    assert plain.get_strings([3, 1, 3]) == {1: packed.get_string(1), 3: packed.get_string(3)}
+    assert plain.get_subsystem_name(0x10DE, 0x1BA1, 0x1458, 0x1651) == (
+        "GeForce GTX 1070 Max-Q"
+    )
+    assert plain.get_class_name_from_code(0x0C0330) == "XHCI"
+    assert plain.cache_info().misses == 0
+    packed.close()
+    plain.close()
+
+
+def test_zdict_parity(pci_ids_bin, build_bin):
+    with_dict = PciDbBinary(str(build_bin("zdict.bin", zdict=True)))
+    without = PciDbBinary(str(pci_ids_bin))  # opt-in: default files stay v1-readable
+    assert with_dict._zdict is not None and with_dict.zdict_len > 0
+    assert without._zdict is None and without.zdict_len == 0
+    stride = with_dict.block_stride
+    last = (with_dict.block_count - 1) * stride + len(
+        with_dict._load_block(with_dict.block_count - 1)
+    )
+    assert [with_dict.get_string(i) for i in range(last)] == [
+        without.get_string(i) for i in range(last)
+    ]
+    with_dict.close()
+    without.close()
+
+
+def test_block_stride_is_read_from_file(pci_ids_bin, build_bin, tmp_path):
+    ref = PciDbBinary(str(pci_ids_bin))
+    n = (ref.block_count - 1) * ref.block_stride + len(ref._load_block(ref.block_count - 1))
+    expected = [ref.get_string(i) for i in range(n)]
+    for stride in (1, 8, 256):
+        db = PciDbBinary(str(build_bin(f"stride{stride}.bin", block_stride=stride)))
+        assert db.block_stride == stride
+        assert db.block_count == (n + stride - 1) // stride
+        assert [db.get_string(i) for i in range(n)] == expected
+        assert db.get_strings(range(n)) == dict(enumerate(expected))
+        db.close()
+
+    # Pre-stride directories (no trailing u32) imply the historical 32
+    raw = bytearray(pci_ids_bin.read_bytes())
+    struct.pack_into("<I", raw, 8 + 4, ref.str_dir_len - 4)
+    old = tmp_path / "old-dir.bin"
+    old.write_bytes(bytes(raw))
+    db = PciDbBinary(str(old))
+    assert db.block_stride == 32
+    assert db.get_string(n - 1) == expected[-1]
+    db.close()
+    ref.close()
+
+
+def test_vendor_string_order(pci_ids_bin, build_bin):
+    lex = PciDbBinary(str(pci_ids_bin))
+    by_vendor = PciDbBinary(str(build_bin("vendor.bin", string_order="vendor")))
+    quads = [
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x8086, 0x1237, None, None),
+        (0xBEEF, 0xBABE, None, None),
+    ]
+    assert by_vendor.resolve_many(quads) == lex.resolve_many(quads)
+    assert by_vendor.get_class_name_from_code(0x0C0330) == "XHCI"
+    # a vendor's name directly precedes its first device's name
+    _, v_sid, dev_start, _ = by_vendor._vendor_row_at(0)
+    assert by_vendor._device_row_at(dev_start)[1] == v_sid + 1
+    lex.close()
+    by_vendor.close()
+
+
+def test_profile_hot_blocks(pci_ids_bin, build_bin, tmp_path):
+    profile = tmp_path / "profile.txt"
+    profile.write_text(
+        "# hottest last on purpose\n"
+        "8086:1237 5\n"
+        "10de:1ba1:1458:1651 900\n"
+        "\n"
+        "dead:beef 3\n",
+        encoding="utf-8",
+    )
+    ref = PciDbBinary(str(pci_ids_bin))
+    db = PciDbBinary(str(build_bin("hot.bin", profile=str(profile), block_stride=4)))
+    assert [db.get_string(i) for i in range(5)] == [
+        "NVIDIA Corporation",
+        "GP104M [GeForce GTX 1070 Mobile]",
+        "GeForce GTX 1070 Max-Q",
+        "Intel Corporation",
+        "440FX - 82441FX PMC",
+    ]
+    # hot blocks are stored raw; the rest stay compressed
+    for block_idx, hot in [(0, True), (1, True), (2, False)]:
+        off = db.block_offsets[block_idx]
+        assert (db.mm[off : off + 4] == db._raw_block_sig) is hot
+    quads = [(0x10DE, 0x1BA1, 0x1458, 0x1651), (0x10DE, 0x0020, 0x1092, 0x8225)]
+    assert db.resolve_many(quads) == ref.resolve_many(quads)
+    db.close()
+    ref.close()
+
+    bad = tmp_path / "bad-profile.txt"
+    for text, line in (
+        ("8086 1\n", 1),
+        ("# hot\n8086:zz12 3\n", 2),
+        ("8086:1237 3\n10de:1ba1 many\n", 2),
+    ):
+        bad.write_text(text, encoding="utf-8")
+        with pytest.raises(ValueError, match=rf"bad-profile\.txt:{line}: "):
+            build_bin("bad.bin", profile=str(bad))
+
+
+def test_subsystem_bloom_filter(pci_ids_text, build_bin):
+    dt = PciDbText(str(pci_ids_text))
+    with_bloom = PciDbBinary(str(build_bin("bloom.bin", columnar=True, bloom_bits=16)))
+    without = PciDbBinary(str(build_bin("nobloom.bin", columnar=True)))  # off by default
+    assert with_bloom._bloom is not None and without._bloom is None
+    # no false negatives for any listed subsystem
+    for vi in range(with_bloom._vendor_count):
+        ven_id, _, dev_start, dev_count = with_bloom._vendor_row_at(vi)
+        for di in range(dev_start, dev_start + dev_count):
+            dev_id, _, sub_start, sub_count = with_bloom._device_row_at(di)
+            for si in range(sub_start, sub_start + sub_count):
+                sv, sd, _ = with_bloom._subsys_row_at(si)
+                assert with_bloom._subsys_maybe_present(ven_id, dev_id, sv, sd)
+    quads = [
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+        (0x10DE, 0x1BA1, 0x1043, 0x0020),
+        (0x10DE, 0x1BA1, 0xFFFF, 0xFFFF),
+        (0x8086, 0x1237, 0x0000, 0x0000),
+        (0xBEEF, 0xBABE, 0x1234, 0x5678),
+    ]
+    for q in quads:
+        expected = dt.get_subsystem_name(*q)
+        assert with_bloom.get_subsystem_name(*q) == expected
+        assert without.get_subsystem_name(*q) == expected
+    assert with_bloom.resolve_many(quads) == without.resolve_many(quads)
+    with_bloom.close()
+    without.close()
+
+
+def test_v1_vendor_bitmap(pci_ids_bin, tmp_path):
+    raw = bytearray(pci_ids_bin.read_bytes())
+    struct.pack_into("<H", raw, 4, 1)
+    struct.pack_into("<II", raw, 8 + 18 * 4, 0, 0)
+    v1 = tmp_path / "v1.ids.bin"
+    v1.write_bytes(bytes(raw))
+    db = PciDbBinary(str(v1))
+    assert db.get_vendor_name(0x1234) is None
+    assert db.get_vendor_name(0x10000) is None
+    assert db.get_vendor_name(0x8086) == "Intel Corporation"
+    assert bin(int.from_bytes(db._vendor_bitmap, "little")).count("1") == 3
+    db.close()
+
+
+def test_from_buffer_and_bytes(pci_ids_bin, pci_ids_bin_plain):
+    from multiprocessing import shared_memory
+
+    quads = [
+        (0x8086, 0x1237, None, None),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0xBEEF, 0xBABE, None, None),
+    ]
+    for path in (pci_ids_bin, pci_ids_bin_plain):
+        ref = PciDbBinary(str(path))
+        raw = path.read_bytes()
+        db = PciDbBinary.from_bytes(raw)
+        assert db.f is None
+        assert db.resolve_many(quads) == ref.resolve_many(quads)
+        assert db.get_class_name(0x06, 0x04) == ref.get_class_name(0x06, 0x04)
+        db.close()
+
+        buf = bytearray(raw)
+        db = PciDbBinary.from_buffer(memoryview(buf))
+        assert db.resolve_many(quads) == ref.resolve_many(quads)
+        db.close()
+        buf.extend(b"\0")  # no exports left after close()
+
+        shm = shared_memory.SharedMemory(create=True, size=len(raw))
+        try:
+            shm.buf[: len(raw)] = raw
+            db = PciDbBinary.from_buffer(shm.buf)
+            assert db.resolve_many(quads) == ref.resolve_many(quads)
+            db.close()
+        finally:
+            shm.close()
+            shm.unlink()
+        ref.close()
+
+    with pytest.raises(ValueError):
+        PciDbBinary.from_bytes(b"\0" * 128)
+
+
+def test_pickle_by_reference(pci_ids_bin):
+    import pickle
+
+    quads = [(0x8086, 0x1237, None, None), (0x10DE, 0x1BA1, 0x1458, 0x1651)]
+    db = PciDbBinary(str(pci_ids_bin), cache_blocks=7)
+    payload = pickle.dumps(db)
+    assert len(payload) < 1024  # the path, not the data
+    clone = pickle.loads(payload)
+    assert clone.path == db.path and clone.cache_info().max_blocks == 7
+    assert clone.resolve_many(quads) == db.resolve_many(quads)
+    clone.close()
+
+    mem = PciDbBinary.from_bytes(pci_ids_bin.read_bytes())
+    clone = pickle.loads(pickle.dumps(mem))
+    assert clone.path is None
+    assert clone.resolve_many(quads) == db.resolve_many(quads)
+    clone.close()
+    mem.close()
+    db.close()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs fork()")
+def test_block_cache_reset_after_fork(pci_ids_bin):
+    db = PciDbBinary(str(pci_ids_bin))
+    name = db.get_device_name(0x8086, 0x1237)
+    assert db.cache_info().blocks > 0
+    pid = os.fork()
+    if pid == 0:  # pragma: no cover - child
+        ok = (
+            db.cache_info().blocks == 0
+            and db.cache_info().hits == 0
+            and db.get_device_name(0x8086, 0x1237) == name
+        )
+        os._exit(0 if ok else 1)
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+    assert db.cache_info().blocks > 0
+    db.close()
+
+
+def test_concurrent_lookups_keep_cache_consistent(pci_ids_bin):
+    import threading
+
+    ref = PciDbBinary(str(pci_ids_bin))
+    keys = [
+        (0x8086, 0x1237, None, None),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x10DE, 0x0020, 0x1092, 0x8225),
+        (0xBEEF, 0xBABE, None, None),
+        (0x1234, 0x0001, None, None),
+    ]
+    expected = [ref.resolve_many([k])[0] for k in keys]
+    db = PciDbBinary(str(pci_ids_bin), cache_blocks=1)  # force eviction churn
+    errors = []
+
+    def worker(offset: int) -> None:
+        try:
+            for i in range(300):
+                j = (i + offset) % len(keys)
+                v, d, sv, sd = keys[j]
+                got = (
+                    db.get_vendor_name(v),
+                    db.get_device_name(v, d),
+                    None if sv is None else db.get_subsystem_name(v, d, sv, sd),
+                )
+                assert got == expected[j]
+        except BaseException as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    info = db.cache_info()
+    assert info.blocks <= 1 and info.bytes >= 0
+    assert info.evictions <= info.misses
+    db.close()
+    ref.close()
+
+
+def test_close_is_safe_against_inflight_reads(pci_ids_bin):
+    import threading
+
+    db = PciDbBinary(str(pci_ids_bin), cache_blocks=0)
+    started = threading.Barrier(5)
+    unexpected = []
+
+    def reader() -> None:
+        started.wait()
+        try:
+            while True:
+                assert db.get_device_name(0x10DE, 0x1BA1)
+        except ValueError as e:
+            if str(e) != "PciDbBinary is closed":  # pragma: no cover
+                unexpected.append(e)
+        except BaseException as e:  # pragma: no cover
+            unexpected.append(e)
+
+    threads = [threading.Thread(target=reader) for _ in range(4)]
+    for t in threads:
+        t.start()
+    started.wait()
+    db.close()
+    db.close()  # idempotent
+    for t in threads:
+        t.join()
+    assert not unexpected
+    assert db.mm.closed  # released once the last reader returned
+    with pytest.raises(ValueError):
+        db.get_vendor_name(0x8086)
+
+    # A lookup already past the close check finishes, string fetches included
+    ref = PciDbBinary(str(pci_ids_bin))
+    for step, call in (
+        ("_find_device", lambda db: db.get_device_name(0x10DE, 0x1BA1)),
+        ("_find_device", lambda db: db.get_subsystem_names([(0x10DE, 0x1BA1, 0x1458, 0x1651)])),
+        ("_find_device", lambda db: db.resolve(0x10DE, 0x1BA1, 0x1458, 0x1651, 0x030000)),
+        ("_search_hit", lambda db: db.search("erazor")),
+    ):
+        db = PciDbBinary(str(pci_ids_bin), cache_blocks=0)
+        inner = getattr(db, step)
+
+        def close_midway(*args, db=db, inner=inner):
+            db.close()
+            return inner(*args)
+
+        setattr(db, step, close_midway)
+        got = call(db)
+        assert got == call(ref) and got not in (None, [None])
+        assert db.mm.closed
+    ref.close()
+
+
+def test_access_hints_and_prefetch(pci_ids_bin):
+    import pickle
+
+    size = pci_ids_bin.stat().st_size
+    for access in (None, "normal", "random", "sequential", "willneed"):
+        db = PciDbBinary(str(pci_ids_bin), access=access)
+        assert db.access == access
+        assert db.get_device_name(0x8086, 0x1237) == "440FX - 82441FX PMC"
+        assert db.prefetch() == size
+        db.close()
+    with pytest.raises(ValueError):
+        PciDbBinary(str(pci_ids_bin), access="bogus")
+
+    db = PciDbBinary(str(pci_ids_bin), access="random")
+    assert pickle.loads(pickle.dumps(db)).access == "random"
+    assert 0 < db.prefetch(["vendors", "devices"]) < db.prefetch(["vendors", "strings"])
+    with pytest.raises(ValueError):
+        db.prefetch(["nope"])
+    db.close()
+    with pytest.raises(ValueError):
+        db.prefetch()
+
+    mem = PciDbBinary.from_bytes(pci_ids_bin.read_bytes())
+    assert mem.prefetch(["classes"]) > 0  # already resident: nothing to advise
+    mem.close()
+
+
+def test_warm_fills_block_cache(pci_ids_bin, pci_ids_bin_plain, build_bin, tmp_path):
+    db = PciDbBinary(str(pci_ids_bin))
+    progress = db.warm()
+    assert progress.wait(10) and progress.finished
+    assert progress.done == progress.total == db.block_count
+    assert progress.seconds >= 0 and "finished" in repr(progress)
+    assert db.cache_info().blocks == db.block_count
+    db.get_device_name(0x8086, 0x1237)
+    assert db.cache_info().misses == 0
+    with pytest.raises(ValueError):
+        db.warm("some")
+    db.close()
+    with pytest.raises(ValueError):
+        db.warm()
+
+    # hot: a profile-built file's leading uncompressed blocks; capped by capacity
+    profile = tmp_path / "profile.txt"
+    profile.write_text("10de:1ba1:1458:1651 9\n8086:1237 5\n", encoding="utf-8")
+    path = build_bin("hot.bin", profile=str(profile), block_stride=4)
+    db = PciDbBinary(str(path))
+    progress = db.warm("hot", background=False)
+    assert progress.finished and progress.total == 2
+    assert db.cache_info().blocks == 2 and 0 in db._block_cache
+    db.close()
+    db = PciDbBinary(str(path), cache_blocks=1)
+    assert db.warm("all", background=False).total == 1
+    db.close()
+
+    # without a profile, "hot" is the vendor-name blocks
+    db = PciDbBinary(str(pci_ids_bin))
+    hot = db._hot_block_indexes()
+    assert hot and all(
+        db._vendor_row_at(i)[1] // db.block_stride in hot for i in range(db._vendor_count)
+    )
+    db.close()
+
+    # nothing to inflate
+    for kwargs in ({}, {"cache_blocks": 0}):
+        src = pci_ids_bin_plain if not kwargs else pci_ids_bin
+        db = PciDbBinary(str(src), **kwargs)
+        progress = db.warm()
+        assert progress.finished and progress.total == 0
+        db.close()
+
+
+def test_describe_without_class_code(pci_ids_text, build_bin):
+    # "C 00" names class 0x00; no class code must not pick it up on either backend
+    with pci_ids_text.open("a", encoding="utf-8") as f:
+        f.write("C 00  Unclassified device\n\t00  Non-VGA unclassified device\n")
+    dt = PciDbText(str(pci_ids_text))
+    db = PciDbBinary(str(build_bin("class00.bin")))
+    for cc in (None, 0, 0x030000):
+        assert db.describe_device_best_effort(0x1234, 0x5678, cc) == (
+            dt.describe_device_best_effort(0x1234, 0x5678, cc)
+        )
+    assert dt.describe_device_best_effort(0x1234, 0x5678, None) == (
+        "Unknown 0x1234 PCI device (0x5678)"
+    )
+    assert "unclassified" in dt.describe_device_best_effort(0x1234, 0x5678, 0)
+
+
+def test_resolve_matches_single_lookups(pci_ids_text, pci_ids_bin, pci_ids_bin_plain):
+    from pciid import DeviceNames
+
+    cases = [
+        (0x8086, 0x1237, None, None, 0x060000),
+        (0x10DE, 0x1BA1, 0x1458, 0x1651, 0x030000),
+        (0x10DE, 0x1BA1, 0x10DE, 0xFFFF, 0x030001),
+        (0x10DE, 0x0020, 0x1092, 0x8225, None),
+        (0x10DE, 0x1234, None, None, 0x060400),
+        (0xBEEF, 0xBABE, 0x8086, 0x0001, 0xFF0000),
+        (0x1234, 0x0001, None, None, 0x0C0330),
+    ]
+    dbs = [
+        PciDbText(str(pci_ids_text)),
+        PciDbBinary(str(pci_ids_bin)),
+        PciDbBinary(str(pci_ids_bin_plain)),
+    ]
+    for db in dbs:
+        for v, d, sv, sd, cc in cases:
+            r = db.resolve(v, d, sv, sd, cc)
+            assert isinstance(r, DeviceNames)
+            assert (r.vendor_id, r.device_id, r.subvendor_id, r.subdevice_id) == (v, d, sv, sd)
+            assert r.vendor == db.get_vendor_name(v)
+            assert r.device == db.get_device_name(v, d)
+            assert r.vendor_known == (r.vendor is not None)
+            assert r.device_known == (r.device is not None)
+            if sv is not None:
+                assert r.subvendor == db.get_vendor_name(sv)
+                assert r.subsystem == db.get_subsystem_name(v, d, sv, sd)
+            else:
+                assert r.subvendor is None and not r.subsystem_known
+            if cc is not None:
+                b, s = (cc >> 16) & 0xFF, (cc >> 8) & 0xFF
+                assert r.class_name == db.get_class_name(b, s)
+                assert r.base_class == db.get_class_name(b)
+                most = r.prog_if or r.subclass or r.base_class
+                assert most == db.get_class_name_from_code(cc)
+                assert r.describe() == db.describe_device_best_effort(v, d, cc)
+            else:
+                assert r.class_name is None
+        assert not hasattr(r, "__dict__")
+    assert [db.resolve(*c[:4]) for db in dbs[1:] for c in cases] == [
+        dbs[0].resolve(*c[:4]) for _ in dbs[1:] for c in cases
+    ]
+    for db in dbs:
+        db.close()
+
+
+def test_search_section_matches_in_memory_index(pci_ids_text, build_bin):
+    from pciid.search import PackedSearchIndex, SearchIndex
+
+    dt = PciDbText(str(pci_ids_text))
+    packed = PciDbBinary(str(build_bin("search.bin", search_index=True)))
+    packed_col = PciDbBinary(str(build_bin("searchc.bin", search_index=True, columnar=True)))
+    lazy = PciDbBinary(str(build_bin("nosearch.bin")))
+    assert isinstance(packed._search_index(packed._checked_lease()), PackedSearchIndex)
+    assert isinstance(lazy._search_index(lazy._checked_lease()), SearchIndex)
+    queries = ["nvidia", "erazor", "v", "Viper V550", "tesla 32", "riva", "gtx", "zzz", ""]
+    for q in queries:
+        for kind in (None, "vendor", "device", "subsystem"):
+            want = dt.search(q, kind=kind, limit=None)
+            for db in (packed, packed_col, lazy):
+                assert db.search(q, kind=kind, limit=None) == want, (q, kind)
+    assert dt.search("erazor ii") and dt.search("erazor ii") == packed.search("erazor ii")
+    hit = packed.search("tnt", kind="device")[0]
+    assert (hit.vendor, hit.device, hit.subvendor) == (0x10DE, 0x0020, None)
+    assert packed.get_device_name(hit.vendor, hit.device) == hit.name
+    packed.close()
+    with pytest.raises(ValueError):
+        packed.search("tnt")
+
+
+def test_iterators_match_text(
+    pci_ids_text, pci_ids_bin, pci_ids_bin_columnar, pci_ids_bin_plain, monkeypatch
+):
+    import pciid.backends.bindb as bindb
+
+    monkeypatch.setattr(bindb, "ITER_CHUNK", 3)  # several chunks per table
+
+    def walk(db):
+        tree = []
+        for vid, vname in db.iter_vendors():
+            devs = []
+            for did, dname in db.iter_devices(vid):
+                devs.append((did, dname, list(db.iter_subsystems(vid, did))))
+            tree.append((vid, vname, devs))
+        return tree, list(db.iter_classes())
+
+    dt = PciDbText(str(pci_ids_text))
+    tree, classes = walk(dt)
+    nvidia = dict((vid, devs) for vid, _, devs in tree)[0x10DE]
+    assert nvidia[0][:2] == (0x0020, "NV4 [Riva TNT]") and len(nvidia[0][2]) == 23
+    assert (0x0C, 0x03, 0x30, "XHCI") in classes
+    assert classes.index((0x06, None, None, "Bridge")) + 1 == classes.index(
+        (0x06, 0x04, None, "PCI bridge")
+    )
+    for path in (pci_ids_bin, pci_ids_bin_columnar, pci_ids_bin_plain):
+        db = PciDbBinary(str(path))
+        assert walk(db) == (tree, classes)
+        assert list(db.iter_devices(0x1234)) == []
+        assert list(db.iter_subsystems(0x10DE, 0x0001)) == []
+        assert list(db.iter_subsystems(0x1234, 0x0001)) == []
+        started = db.iter_vendors()
+        next(started)
+        db.close()
+        # in flight: the iterator holds its lease, so it finishes like a lookup
+        assert len(list(started)) == len(tree) - 1
+        for fn in (db.iter_vendors, db.iter_classes, lambda db=db: db.iter_devices(0x10DE)):
+            with pytest.raises(ValueError):
+                fn()
+
+
+def test_iter_by_subvendor(pci_ids_text, pci_ids_bin, build_bin):
+    dt = PciDbText(str(pci_ids_text))
+    everything = [
+        (v, d, sv, sd, name)
+        for v, _ in dt.iter_vendors()
+        for d, _ in dt.iter_devices(v)
+        for sv, sd, name in dt.iter_subsystems(v, d)
+    ]
+    lazy = PciDbBinary(str(pci_ids_bin))  # no section by default: built on first call
+    assert lazy._subvendor_rows is None
+    dbs = [
+        dt,
+        PciDbBinary(str(build_bin("sv.bin", subvendor_index=True))),
+        PciDbBinary(str(build_bin("sv-columnar.bin", subvendor_index=True, columnar=True))),
+        lazy,
+    ]
+    assert dbs[1]._subvendor_rows is not None and dbs[2]._subvendor_rows is not None
+    for sv in (0x1092, 0x1048, 0x10DE, 0x1458, 0x8086, 0xFFFF):
+        want = [e for e in everything if e[2] == sv]
+        for db in dbs:
+            assert list(db.iter_by_subvendor(sv)) == want, (db, hex(sv))
+    assert len(list(dt.iter_by_subvendor(0x1092))) == 12
+    assert list(dbs[1].iter_by_subvendor(0x1458)) == [
+        (0x10DE, 0x1BA1, 0x1458, 0x1651, "GeForce GTX 1070 Max-Q")
+    ]
+    dbs[1].close()
+    with pytest.raises(ValueError):
+        dbs[1].iter_by_subvendor(0x1092)
+
+
+@pytest.mark.filterwarnings("error::ResourceWarning")
+def test_iter_by_subvendor_abandoned_after_close(build_bin):
+    import gc
+
+    for path in (
+        build_bin("sv.bin", subvendor_index=True),
+        build_bin("sv-columnar.bin", subvendor_index=True, columnar=True),
+    ):
+        db = PciDbBinary(str(path))
+        it = db.iter_by_subvendor(0x1092)
+        next(it)
+        db.close()
+        del it  # suspended, never finished: the mapping must still be released
+        gc.collect()
+        assert db.mm.closed and db.f.closed
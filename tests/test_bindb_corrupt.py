@@ -24,3 +24,16 @@ def test_corrupt_bindb_missing_file(tmp_path):
 
     with pytest.raises(FileNotFoundError) as ei:
         PciDbBinary(str(tmp_path / "nonexistent"))
+
+
+def test_corrupt_bindb_unknown_flags(tmp_path):
+    HEADER_FMT = "<IHH" + "I" * 26
+    hdr = struct.pack(HEADER_FMT, 0x42494350, 2, 0x8000, *([0] * 26))
+    p = tmp_path / "flags.ids.bin"
+    p.write_bytes(hdr + b"\x00" * 16)
+
+    from pciid.api import PciDbBinary
+
+    with pytest.raises(ValueError) as ei:
+        PciDbBinary(str(p))
+    assert "unsupported flags" in str(ei.value)
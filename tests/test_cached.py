@@ -0,0 +1,57 @@
+# tests/test_cached.py
+from __future__ import annotations
+import pickle
+from pciid import CachedDb, PciDb
+from pciid.api import PciDbBinary, PciDbText
+
+
+def test_cached_db_matches_backend(pci_ids_text, pci_ids_bin):
+    for raw in (PciDbText(str(pci_ids_text)), PciDbBinary(str(pci_ids_bin))):
+        db = CachedDb(raw, maxsize=64)
+        assert isinstance(db, PciDb)
+        quads = [
+            (0x10DE, 0x1BA1, 0x1458, 0x1651),
+            (0x10DE, 0x0020, 0x1092, 0x8225),
+            (0x8086, 0x1237, 0x0000, 0x0000),
+        ]
+        for _ in range(3):
+            assert db.get_vendor_name(0x8086) == raw.get_vendor_name(0x8086)
+            assert db.get_device_name(0x10DE, 0x1DB6) == raw.get_device_name(0x10DE, 0x1DB6)
+            assert [db.get_subsystem_name(*q) for q in quads] == [
+                raw.get_subsystem_name(*q) for q in quads
+            ]
+            assert db.get_subsystem_names(quads) == raw.get_subsystem_names(quads)
+            assert db.get_vendor_names([0x8086, 0xDEAD]) == raw.get_vendor_names([0x8086, 0xDEAD])
+            assert db.get_device_names([(0x8086, 0x1237)]) == raw.get_device_names(
+                [(0x8086, 0x1237)]
+            )
+            keys = [(0x8086, None, None, None), *quads]
+            assert db.resolve_many(keys) == raw.resolve_many(keys)
+            assert db.resolve(*quads[0], 0x030000) == raw.resolve(*quads[0], 0x030000)
+            assert db.get_class_name(0x06, 0x04) == raw.get_class_name(0x06, 0x04)
+            assert db.get_class_name_from_code(0x030000, depth=2) == (
+                raw.get_class_name_from_code(0x030000, depth=2)
+            )
+            assert db.describe_device_best_effort(0x10DE, 0x1234, 0x030000) == (
+                raw.describe_device_best_effort(0x10DE, 0x1234, 0x030000)
+            )
+        assert db.search("viper", "subsystem", 2) == raw.search("viper", "subsystem", 2)
+        info = db.cache_info()
+        assert info.hits > info.misses > 0 and info.maxsize == 64
+        assert db.resolve(*quads[0]) is db.resolve(*quads[0])  # memoized record
+        db.cache_clear()
+        assert db.cache_info().currsize == 0
+        db.close()
+
+
+def test_cached_db_is_bounded_and_picklable(pci_ids_bin):
+    db = CachedDb(PciDbBinary(str(pci_ids_bin)), maxsize=2)
+    for vid in range(0x8080, 0x8090):
+        db.get_vendor_name(vid)
+    assert db.cache_info().currsize == 2
+    clone = pickle.loads(pickle.dumps(db))
+    assert clone.maxsize == 2 and clone.cache_info().currsize == 0
+    assert clone.get_vendor_name(0x8086) == db.get_vendor_name(0x8086)
+    assert "maxsize=2" in repr(clone)
+    clone.close()
+    db.close()
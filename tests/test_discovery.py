@@ -10,7 +10,7 @@ def test_open_db_env_text(monkeypatch, pci_ids_text, tmp_path):
     monkeypatch.setenv("PCIID_TEXT", str(pci_ids_text))
     monkeypatch.delenv("PCIID_BIN", raising=False)
     db = open_db()
-    assert isinstance(db, PciDbText)
+    assert isinstance(db, PciDbBinary)  # text compiled into the cache
     assert db.get_vendor_name(0x8086) == "Intel Corporation"
 
 
@@ -63,7 +63,7 @@ def test_open_db_explicit_text(monkeypatch, pci_ids_text):
     monkeypatch.delenv("PCIID_BIN", raising=False)
     monkeypatch.delenv("PCIID_TEXT", raising=False)
     db = open_db(path=pci_ids_text)
-    assert isinstance(db, PciDbText)
+    assert isinstance(db, PciDbBinary)  # text compiled into the cache
     assert db.get_device_name(0x10DE, 0x1DB6)
     db.close()
 
@@ -104,7 +104,7 @@ def test_open_db_no_bundled(monkeypatch):
     monkeypatch.delenv("PCIID_TEXT", raising=False)
     monkeypatch.setenv("PCIID_NO_BUNDLED", "1")
     db = open_db()
-    assert isinstance(db, PciDbText)
+    assert isinstance(db, PciDbBinary)  # system text, compiled into the cache
     assert db.get_device_name(0x10DE, 0x1DB6)
     db.close()
 
@@ -155,9 +155,10 @@ def test_open_db_bundled_text(monkeypatch, tmp_path: Path):
     monkeypatch.setattr(discovery, "bundled_bin_available", lambda: True)
     monkeypatch.setattr(discovery, "bundled_text_available", lambda: True)
 
-    # 3) Make resources.as_file yield our temp paths:
-    #    first call -> bad_bin (so bundled-bin opener raises),
-    #    second call -> good_text (so bundled-text opener succeeds)
+    # 3) Bundled bin is read into memory: point it at bad_bin (so the bundled-bin
+    #    opener raises); resources.as_file yields good_text for the text opener.
+    monkeypatch.setattr(discovery, "bin_resource", lambda: bad_bin)
+
     class _CM:
         def __init__(self, p: Path):
             self.p = p
@@ -168,11 +169,8 @@ def test_open_db_bundled_text(monkeypatch, tmp_path: Path):
         def __exit__(self, *exc):
             return False
 
-    calls = {"n": 0}
-
     def fake_as_file(_res):
-        calls["n"] += 1
-        return _CM(bad_bin if calls["n"] == 1 else good_text)
+        return _CM(good_text)
 
     monkeypatch.setattr(discovery.resources, "as_file", fake_as_file)
 
@@ -0,0 +1,172 @@
+# tests/test_textcache.py
+from __future__ import annotations
+import os
+import threading
+import pytest
+
+from pciid.api import PciDbBinary, PciDbText, open_db
+from pciid.backends import textcache
+
+
+def _entries(directory):
+    return sorted(p.name for p in directory.iterdir()) if directory.exists() else []
+
+
+def test_compiles_once_then_maps(cache_home, pci_ids_text, monkeypatch):
+    from pciid import convert
+
+    builds = []
+    build = convert.build
+    monkeypatch.setattr(convert, "build", lambda args: builds.append(args) or build(args))
+
+    directory = cache_home / "pciid"
+    assert textcache.cache_dir() == directory
+    db = open_db(str(pci_ids_text))
+    assert isinstance(db, PciDbBinary) and len(builds) == 1
+    key = textcache.cache_key(str(pci_ids_text))
+    assert _entries(directory) == [f"{key}.bin"]
+
+    again = open_db(str(pci_ids_text))
+    assert len(builds) == 1 and again.path == db.path
+    text = PciDbText(str(pci_ids_text))
+    assert list(again.iter_vendors()) == list(text.iter_vendors())
+    assert again.resolve(0x10DE, 0x1BA1, 0x1458, 0x1651, 0x030000) == (
+        text.resolve(0x10DE, 0x1BA1, 0x1458, 0x1651, 0x030000)
+    )
+
+    # a same-size edit only shows in the mtime, which is all the key reads
+    st = os.stat(pci_ids_text)
+    data = pci_ids_text.read_bytes()
+    pci_ids_text.write_bytes(data.replace(b"Intel Corporation", b"Intel CorporatioN"))
+    os.utime(pci_ids_text, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+    assert textcache.cache_key(str(pci_ids_text)) != key
+    assert open_db(str(pci_ids_text)).get_vendor_name(0x8086) == "Intel CorporatioN"
+    assert len(builds) == 2 and len(_entries(directory)) == 2
+
+    # a file renamed over the path is new even with the old size and mtime
+    st = os.stat(pci_ids_text)
+    key = textcache.cache_key(str(pci_ids_text))
+    copy = pci_ids_text.with_name("pci.ids.new")
+    copy.write_bytes(pci_ids_text.read_bytes())
+    os.utime(copy, ns=(st.st_atime_ns, st.st_mtime_ns))
+    os.replace(copy, pci_ids_text)
+    assert textcache.cache_key(str(pci_ids_text)) != key
+    assert open_db(str(pci_ids_text)).get_vendor_name(0x8086) == "Intel CorporatioN"
+    assert len(builds) == 3
+
+    # a torn entry is compiled again
+    entry = directory / f"{textcache.cache_key(str(pci_ids_text))}.bin"
+    entry.write_bytes(entry.read_bytes()[:64])
+    assert open_db(str(pci_ids_text)).get_vendor_name(0x8086) == "Intel CorporatioN"
+    assert len(builds) == 4
+    whole = entry.read_bytes()
+    entry.write_bytes(whole[:-100])  # the header parses, the tail is missing
+    assert open_db(str(pci_ids_text)).get_vendor_name(0x8086) == "Intel CorporatioN"
+    assert len(builds) == 5 and entry.read_bytes() == whole
+
+
+def test_falls_back_to_text(cache_home, pci_ids_text, monkeypatch):
+    monkeypatch.setenv("PCIID_NO_TEXT_CACHE", "1")
+    assert isinstance(open_db(str(pci_ids_text)), PciDbText)
+    assert not (cache_home / "pciid").exists()
+
+    monkeypatch.delenv("PCIID_NO_TEXT_CACHE")
+    blocker = cache_home / "file"
+    blocker.write_text("not a directory")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(blocker))  # cache dir can't be created
+    db = open_db(str(pci_ids_text))
+    assert isinstance(db, PciDbText) and db.get_vendor_name(0x8086) == "Intel Corporation"
+
+
+def test_concurrent_first_opens(cache_home, pci_ids_text):
+    names, errors = [], []
+
+    def opener():
+        try:
+            names.append(textcache.open_compiled(str(pci_ids_text)).get_vendor_name(0x10DE))
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+
+    threads = [threading.Thread(target=opener) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors and names == ["NVIDIA Corporation"] * 4
+    assert [n for n in _entries(cache_home / "pciid") if not n.endswith(".bin")] == []
+
+
+def test_prune_drops_oldest(tmp_path):
+    now = 1_700_000_000
+    for i, name in enumerate(["a.bin", "b.bin", "c.bin", "d.bin"]):
+        p = tmp_path / name
+        p.write_bytes(b"x" * 100)
+        os.utime(p, (now + i, now + i))
+    (tmp_path / "fresh.tmp").write_bytes(b"x" * 10)  # a compile in progress
+    stale = tmp_path / "old.tmp"
+    stale.write_bytes(b"x" * 10)
+    os.utime(stale, (now, now))
+
+    freed = textcache.prune(tmp_path, max_bytes=250, keep="a.bin")
+    assert freed == 2 * 100 + 10
+    assert _entries(tmp_path) == ["a.bin", "d.bin", "fresh.tmp"]
+    assert textcache.prune(tmp_path / "missing") == 0
+
+
+def test_open_compiled_rejects_bad_text(tmp_path):
+    p = tmp_path / "pci.ids"
+    p.write_bytes(b"\x00\x01 not a pci.ids\n")
+    with pytest.raises((ValueError, OSError)):
+        textcache.open_compiled(str(p), tmp_path / "cache")
+    assert [n for n in _entries(tmp_path / "cache") if n.endswith(".tmp")] == []
+
+
+def test_cached_and_parsed_text_agree(cache_home, pci_ids_text, monkeypatch):
+    with pci_ids_text.open("a", encoding="utf-8") as f:
+        f.write("C 00  Unclassified device\n\t00  Non-VGA unclassified device\n")
+    cached = open_db(str(pci_ids_text))
+    monkeypatch.setenv("PCIID_NO_TEXT_CACHE", "1")
+    parsed = open_db(str(pci_ids_text))
+    assert isinstance(cached, PciDbBinary) and isinstance(parsed, PciDbText)
+
+    def contents(db):
+        return [
+            (v, vn, d, dn, list(db.iter_subsystems(v, d)))
+            for v, vn in db.iter_vendors()
+            for d, dn in db.iter_devices(v)
+        ], list(db.iter_classes())
+
+    assert contents(cached) == contents(parsed)
+    for vid, did, sv, sd in [
+        (0x10DE, 0x1BA1, 0x1458, 0x1651),
+        (0x10DE, 0x1234, 0x1234, 0x1234),
+        (0x8086, 0xBEEF, None, None),
+        (0x1234, 0x5678, None, None),
+    ]:
+        for class24 in (None, 0, 0x030000, 0x0C0330):
+            assert cached.resolve(vid, did, sv, sd, class24) == (
+                parsed.resolve(vid, did, sv, sd, class24)
+            )
+            assert cached.describe_device_best_effort(vid, did, class24) == (
+                parsed.describe_device_best_effort(vid, did, class24)
+            )
+    # no class code is not class 0x00
+    assert parsed.describe_device_best_effort(0x1234, 0x5678, None) == (
+        "Unknown 0x1234 PCI device (0x5678)"
+    )
+    assert cached.search("viper", limit=None) == parsed.search("viper", limit=None)
+
+
+def test_falls_back_when_the_converter_fails(cache_home, pci_ids_text):
+    # PciDbText masks over-wide IDs; the converter trips over them (struct.error,
+    # AssertionError), and open_db() must still hand back the text backend
+    text = pci_ids_text.read_text(encoding="utf-8")
+    for bad in (
+        text.replace("\t1237  440FX", "\t11237  440FX", 1),
+        text.replace("C 02  Network", "C 102  Network", 1),
+    ):
+        assert bad != text
+        pci_ids_text.write_text(bad, encoding="utf-8")
+        db = open_db(str(pci_ids_text))
+        assert isinstance(db, PciDbText) and db.get_vendor_name(0x8086) == "Intel Corporation"
+    assert [n for n in _entries(cache_home / "pciid") if n.endswith(".tmp")] == []
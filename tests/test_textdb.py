@@ -62,3 +62,155 @@ def test_textdb_unknowns(pci_ids_text):
     # Best-effort description should fall back to "Unknown <vendor|hex> <class|PCI device>"
     s = db.describe_device_best_effort(0x1234, 0x5678, None)
     assert "Unknown" in s and "0x5678" in s
+
+
+def test_textdb_pickle_roundtrip(pci_ids_text):
+    import pickle
+
+    db = PciDbText(str(pci_ids_text))
+    state = db.__getstate__()
+    assert "_sp" not in state and isinstance(state["_strings"], str)
+    clone = pickle.loads(pickle.dumps(db))
+    for vid, did in [(0x8086, 0x1237), (0x10DE, 0x1DB6), (0xBEEF, 0xBABE)]:
+        assert clone.get_vendor_name(vid) == db.get_vendor_name(vid)
+        assert clone.get_device_name(vid, did) == db.get_device_name(vid, did)
+    assert clone.get_subsystem_name(0x10DE, 0x1BA1, 0x1458, 0x1651) == (
+        db.get_subsystem_name(0x10DE, 0x1BA1, 0x1458, 0x1651)
+    )
+    assert clone.get_class_name(0x06, 0x04) == db.get_class_name(0x06, 0x04)
+    assert clone._sp._id_of == db._sp._id_of
+
+
+def test_textdb_class_table(pci_ids_text):
+    db = PciDbText(str(pci_ids_text))
+    table, bases = db._class_table
+    assert len(bases) == 256 and len(table) == len(db.subclass_keys)
+    bname, sname, progs = table[0x0C03]
+    assert sname == db.get_class_name(0x0C, 0x03) and bname == db.get_class_name(0x0C)
+    for code in (0x0C0330, 0x0C03FE, 0x0CFF00, 0x060400, 0xFE0000, 0x1FFFFFF):
+        names = [db.get_class_name_from_code(code, depth) for depth in range(4)]
+        assert names[0] == names[1] == db.get_class_name((code >> 16) & 0xFF)
+        assert names[2] == db.get_class_name((code >> 16) & 0xFF, (code >> 8) & 0xFF)
+        assert names[3] == db.get_class_name(
+            (code >> 16) & 0xFF, (code >> 8) & 0xFF, code & 0xFF
+        )
+
+
+def test_textdb_search(pci_ids_text):
+    import pytest
+    from pciid.types import SearchHit
+
+    db = PciDbText(str(pci_ids_text))
+    assert db.search("nvidia") == [SearchHit(0x10DE, None, None, None, "NVIDIA Corporation")]
+    # every word must match a word prefix, case-insensitively
+    assert [h.device for h in db.search("GEFORCE gtx")] == [0x1BA1, 0x1BA1]
+    assert db.search("geforce gtx", kind="subsystem") == [
+        SearchHit(0x10DE, 0x1BA1, 0x1458, 0x1651, "GeForce GTX 1070 Max-Q")
+    ]
+    viper = db.search("vip", kind="subsystem", limit=None)
+    assert len(viper) == 12 and all(h.name.startswith("Viper") for h in viper)
+    assert viper == sorted(viper, key=lambda h: (h.subvendor, h.subdevice))
+    assert len(db.search("viper", limit=3)) == 3
+    assert db.search("viper tesla") == [] and db.search("  ") == []
+    with pytest.raises(ValueError):
+        db.search("viper", kind="class")
+
+
+def test_textdb_sorted_fast_path_matches_dict_parser(pci_ids_text, tmp_path, monkeypatch):
+    from pciid.backends import textdb
+
+    slow = PciDbText(str(pci_ids_text))  # the fixture is unsorted: dict parser
+    lines = []
+    for vid, vname in slow.iter_vendors():
+        lines.append(f"{vid:04x}  {vname}")
+        for did, dname in slow.iter_devices(vid):
+            lines.append(f"\t{did:04x}  {dname}  ")  # trailing blanks are stripped
+            for sv, sd, sname in slow.iter_subsystems(vid, did):
+                lines.append(f"\t\t{sv:04x} {sd:04x}  {sname}")
+    lines.append("# classes")
+    for base, sub, pi, name in slow.iter_classes():
+        if sub is None:
+            lines.append(f"C {base:02x}  {name}")
+        elif pi is None:
+            lines.append(f"\t{sub:02x}  {name}")
+        else:
+            lines.append(f"\t\t{pi:02x}  {name}")
+    text = "# pci.ids, re-serialized\n" + "\n".join(lines) + "\n"
+
+    calls = []
+    parse = textdb._parse_pci_ids
+    monkeypatch.setattr(textdb, "_parse_pci_ids", lambda p: calls.append(p) or parse(p))
+
+    def contents(db):
+        tree = [
+            (v, vn, d, dn, list(db.iter_subsystems(v, d)))
+            for v, vn in db.iter_vendors()
+            for d, dn in db.iter_devices(v)
+        ]
+        return tree, list(db.iter_classes())
+
+    for name, newline, dict_path in (
+        ("lf.ids", "\n", False),
+        ("crlf.ids", "\r\n", True),
+        ("cr.ids", "\r", True),  # one b"\n"-split "line", starting with "#"
+    ):
+        p = tmp_path / name
+        p.write_bytes(text.replace("\n", newline).encode("utf-8"))
+        db = PciDbText(str(p))
+        assert bool(calls) == dict_path
+        assert contents(db) == contents(slow)
+        assert db.search("viper") == slow.search("viper")
+
+
+def test_textdb_lazy_matches_eager(pci_ids_text):
+    import pickle
+    import pytest
+    from pciid.api import PciDbTextLazy
+
+    eager = PciDbText(str(pci_ids_text))
+    db = PciDbTextLazy(str(pci_ids_text))
+    assert db._devices == {}  # open parses no device blocks
+    assert db.get_device_name(0x10DE, 0x1BA1) == eager.get_device_name(0x10DE, 0x1BA1)
+    assert db.get_vendor_name(0x8086) == "Intel Corporation"
+    assert list(db._devices) == [0x10DE]  # vendor names come from the scan
+
+    args = [(0x10DE, 0x1BA1, 0x1458, 0x1651, 0x030000), (0x10DE, 0x0020, 0x1092, 0x8225, None)]
+    args += [(0x8086, 0x1237, 0x8086, 0x1234, 0x0C0330), (0xBEEF, 0xBABE, 0x10DE, 0, 0xFE0000)]
+    for a in args:
+        assert db.resolve(*a) == eager.resolve(*a)
+        assert db.resolve_many([a[:4], a[:2] + (None, None)]) == eager.resolve_many(
+            [a[:4], a[:2] + (None, None)]
+        )
+        assert db.describe_device_best_effort(a[0], a[1], a[4]) == (
+            eager.describe_device_best_effort(a[0], a[1], a[4])
+        )
+    assert db.get_subsystem_name(0x10DE, 0x1234, 0x1234, 0x1234) is None
+    assert list(db.iter_devices(0x1234)) == [] and list(db.iter_subsystems(0x10DE, 0x1234)) == []
+
+    def contents(d):
+        return [
+            (v, vn, dv, dn, list(d.iter_subsystems(v, dv)))
+            for v, vn in d.iter_vendors()
+            for dv, dn in d.iter_devices(v)
+        ], list(d.iter_classes())
+
+    assert contents(db) == contents(eager)
+    for code in (0x0C0330, 0x060400, 0x0CFF00, 0x1FFFFFF):
+        assert db.get_class_name_from_code(code) == eager.get_class_name_from_code(code)
+
+    # whole-table queries go through one full parse
+    assert db.search("viper") == eager.search("viper")
+    assert list(db.iter_by_subvendor(0x1092)) == list(eager.iter_by_subvendor(0x1092))
+
+    clone = pickle.loads(pickle.dumps(db))
+    assert clone._devices == {} and contents(clone) == contents(eager)
+    crlf = pci_ids_text.read_bytes().replace(b"\n", b"\r\n")
+    assert contents(PciDbTextLazy.from_bytes(crlf)) == contents(eager)
+    cr = b"# header\r" + pci_ids_text.read_bytes().replace(b"\n", b"\r")
+    assert contents(PciDbTextLazy.from_bytes(cr)) == contents(eager)
+
+    with pytest.raises(ValueError):
+        PciDbTextLazy.from_bytes(b"# vendors but no classes\n8086  Intel\n")
+    bad = PciDbTextLazy.from_bytes(b"8086  Intel\n\tzzzz  Bad\nC 02  Network\n")
+    with pytest.raises(ValueError):
+        bad.get_device_name(0x8086, 0x1234)